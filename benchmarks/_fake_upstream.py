@@ -0,0 +1,48 @@
+"""벤치마크용 가짜 업스트림: 로그인(POST)은 고정 토큰을, 조회(GET)는 경로 끝의 코드로 만든 레코드를 돌려줍니다."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def product_body(code: str) -> Dict[str, Any]:
+    """목록/상세 도구가 모두 읽을 수 있도록 레코드를 items 와 최상위에 함께 둡니다."""
+    item = {"productCode": code, "pillName": f"제품 {code}", "vendor": "bench"}
+    return {"items": [item], "totalCount": 1, **item}
+
+
+def start_fake_upstream(
+    latency: float = 0.0,
+    body: Optional[Callable[[str], Dict[str, Any]]] = None,
+) -> Tuple[ThreadingHTTPServer, int]:
+    """데몬 스레드로 가짜 업스트림을 띄우고 (server, port) 를 반환합니다. GET 은 latency 초 뒤에 응답합니다."""
+    make_body = body or product_body
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def _send(self, payload: Dict[str, Any]) -> None:
+            raw = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def do_POST(self) -> None:
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            self._send({"data": {"accessToken": "bench-token"}})
+
+        def do_GET(self) -> None:
+            if latency:
+                time.sleep(latency)
+            self._send(make_body(self.path.rsplit("/", 1)[-1].split("?", 1)[0]))
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.server_address[1]
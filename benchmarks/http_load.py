@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Streamable HTTP 멀티 워커 부하 테스트.
+
+내장 가짜 업스트림(지연 시간 조절 가능)을 띄우고, 워커 수별로 `python -m src.mcp_server --transport streamable-http`
+를 실행해 `druginfo_get_product_by_code` 도구 호출 처리량(req/s)과 지연 시간을 측정합니다.
+
+    python benchmarks/http_load.py --workers 1 2 4 --duration 10 --clients 4 --threads 16
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List
+
+import requests
+
+from _fake_upstream import start_fake_upstream
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _product_detail(code: str) -> Dict[str, Any]:
+    return {"productCode": code, "pillName": f"제품 {code}", "vendor": "bench", "ingredients": list(range(20))}
+
+
+def _wait_ready(url: str, timeout: float = 30.0) -> None:
+    started = time.monotonic()
+    while time.monotonic() - started < timeout:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f"서버가 {timeout}초 안에 시작되지 않았습니다: {url}")
+
+
+def _call_payload(i: int, codes: int) -> Dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": i,
+        "method": "tools/call",
+        "params": {"name": "druginfo_get_product_by_code", "arguments": {"code": f"P{i % codes:05d}"}},
+    }
+
+
+def _client(url: str, threads: int, duration: float, codes: int, seed: int, out: "multiprocessing.Queue[Any]") -> None:
+    headers = {"content-type": "application/json", "accept": "application/json, text/event-stream"}
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def _run(tid: int) -> None:
+        session = requests.Session()
+        i = seed * 100000 + tid * 1000
+        local: List[float] = []
+        failed = 0
+        while time.monotonic() < stop_at:
+            i += 1
+            started = time.monotonic()
+            try:
+                resp = session.post(url, headers=headers, json=_call_payload(i, codes), timeout=30)
+                if resp.status_code != 200 or "error" in resp.json():
+                    failed += 1
+            except requests.RequestException:
+                failed += 1
+            local.append(time.monotonic() - started)
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    workers = [threading.Thread(target=_run, args=(t,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    out.put((latencies, errors[0]))
+
+
+def run_level(workers: int, args: argparse.Namespace, upstream_port: int, store_dir: str) -> Dict[str, Any]:
+    port = _free_port()
+    env = dict(os.environ)
+    env.update(
+        {
+            "EDB_BASE_URL": f"http://127.0.0.1:{upstream_port}",
+            "EDB_LOGIN_URL": f"http://127.0.0.1:{upstream_port}/v1/auth/login",
+            "EDB_USER_ID": "bench",
+            "EDB_PASSWORD": "bench",
+            "EDB_SHARED_STORE": os.path.join(store_dir, f"shared-{workers}.sqlite3"),
+            "EDB_CACHE_TTL": str(args.cache_ttl),
+            "PYTHONPATH": ROOT,
+        }
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "src.mcp_server", "--transport", "streamable-http", "--port", str(port), "--workers", str(workers)],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}/mcp"
+    try:
+        _wait_ready(f"http://127.0.0.1:{port}/")
+        # 캐시 예열: 모든 코드를 한 번씩 조회해 공유 캐시에 올립니다.
+        for i in range(args.codes):
+            requests.post(url, headers={"content-type": "application/json", "accept": "application/json, text/event-stream"}, json=_call_payload(i, args.codes), timeout=30)
+        queue: "multiprocessing.Queue[Any]" = multiprocessing.Queue()
+        clients = [
+            multiprocessing.Process(target=_client, args=(url, args.threads, args.duration, args.codes, c, queue))
+            for c in range(args.clients)
+        ]
+        for c in clients:
+            c.start()
+        latencies: List[float] = []
+        errors = 0
+        for _ in clients:
+            lat, err = queue.get()
+            latencies.extend(lat)
+            errors += err
+        for c in clients:
+            c.join()
+    finally:
+        proc.terminate()
+        proc.wait(timeout=15)
+    latencies.sort()
+    count = len(latencies)
+    return {
+        "workers": workers,
+        "requests": count,
+        "errors": errors,
+        "rps": round(count / args.duration, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1) if count else None,
+        "p95_ms": round(latencies[int(count * 0.95) - 1] * 1000, 1) if count else None,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="pharminfo MCP streamable-http load test")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="워커 수 목록 (default: 1 2 4)")
+    parser.add_argument("--duration", type=float, default=10.0, help="워커 수별 측정 시간(초)")
+    parser.add_argument("--clients", type=int, default=4, help="부하 생성 프로세스 수")
+    parser.add_argument("--threads", type=int, default=16, help="부하 생성 프로세스당 스레드 수")
+    parser.add_argument("--codes", type=int, default=200, help="조회할 서로 다른 제품 코드 수")
+    parser.add_argument("--upstream-latency", type=float, default=0.05, help="가짜 업스트림 지연 시간(초)")
+    parser.add_argument("--cache-ttl", type=float, default=300.0, help="EDB_CACHE_TTL (0 이면 매 호출 업스트림 조회)")
+    args = parser.parse_args()
+
+    upstream, upstream_port = start_fake_upstream(args.upstream_latency, _product_detail)
+    results = []
+    with tempfile.TemporaryDirectory() as store_dir:
+        for workers in args.workers:
+            result = run_level(workers, args, upstream_port, store_dir)
+            results.append(result)
+            print(json.dumps(result, ensure_ascii=False), flush=True)
+    upstream.shutdown()
+    base = results[0]["rps"] or 1.0
+    print(f"{'workers':>8} {'req/s':>10} {'speedup':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    for r in results:
+        print(f"{r['workers']:>8} {r['rps']:>10} {r['rps'] / base:>8.2f} {r['p50_ms']:>8} {r['p95_ms']:>8} {r['errors']:>7}")
+    print(f"(cpu count: {os.cpu_count()})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""미러 NDJSON 과 팩 파일(mmap)의 프로세스별 메모리 비교.
+
+합성 product 미러를 만들고, 같은 미러를 여는 서버 프로세스 N 개를 흉내 내어 각 프로세스가
+get_engine("product") 로 엔진을 만든 뒤 /proc/self/smaps_rollup 의 Rss/Pss/Private 을 보고합니다.
+Pss 는 공유 페이지를 나눠 계산하므로, 팩 파일 페이지는 프로세스 수가 늘수록 한 프로세스 몫이 줄어듭니다. (Linux 전용)
+
+    python benchmarks/pack_share.py --records 100000 --procs 4
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CHILD = """
+import json, sys, time
+from src.druginfo.query import get_engine
+started = time.perf_counter()
+engine = get_engine("product")
+engine.query(pillName="7", PageSize=20)
+load_ms = (time.perf_counter() - started) * 1000
+for i in range(len(engine)):
+    engine.record(i)
+print(json.dumps({"load_ms": load_ms}), flush=True)
+sys.stdin.readline()
+"""
+
+
+def _write_mirror(path: str, count: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            record = {
+                "productCode": f"P{i:07d}",
+                "pillName": f"약품 {i} 정 {i % 97}mg",
+                "vendor": f"제약사 {i % 311}",
+                "crop": i % 2 == 0,
+                "base64": i % 3 == 0,
+                "watermark": i % 5 == 0,
+                "confirm": i % 7 != 0,
+                "teoulLengthShort": i % 11 == 0,
+                "teoulLengthLong": i % 13 == 0,
+                "count": i % 17,
+                "ingredientCode": f"I{i % 4999:05d}",
+                # 필터에 쓰지 않는 표시용 필드 (팩에서는 응답할 때만 읽습니다)
+                "ingredients": [{"ingredientCode": f"I{(i + k) % 4999:05d}", "amount": f"{k * 5 + 1}mg"} for k in range(i % 4 + 1)],
+                "images": {side: f"https://img.example.com/p/{i:07d}/{side}.png" for side in ("front", "back", "side")},
+                "dosage": "1일 3회, 1회 1정 식후 30분에 복용합니다. " * (i % 3 + 1),
+                "caution": "이 약에 과민증이 있는 환자는 복용하지 마십시오. " * (i % 5 + 1),
+                "description": "정제 설명 " * (i % 9 + 1),
+            }
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _measure(mirror_dir: str, procs: int) -> List[Dict[str, float]]:
+    env = dict(os.environ, EDB_MIRROR_DIR=mirror_dir, PYTHONPATH=ROOT)
+    children = [
+        subprocess.Popen(
+            [sys.executable, "-c", _CHILD], cwd=ROOT, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+        )
+        for _ in range(procs)
+    ]
+    # 모두 적재를 마친 뒤 재야 공유 페이지가 Pss 에 반영됩니다.
+    loaded = []
+    for child in children:
+        assert child.stdout is not None
+        loaded.append(json.loads(child.stdout.readline()))
+    time.sleep(0.2)
+    results = []
+    for child, stats in zip(children, loaded):
+        assert child.stdin is not None
+        with open(f"/proc/{child.pid}/smaps_rollup") as f:
+            for line in f:
+                name, _, rest = line.partition(":")
+                if name in ("Rss", "Pss", "Private_Clean", "Private_Dirty", "Shared_Clean"):
+                    stats[name] = int(rest.split()[0])
+        results.append(stats)
+        child.stdin.close()
+        child.wait()
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="per-process memory: NDJSON mirror vs mmap pack")
+    parser.add_argument("--records", type=int, default=100_000, help="합성 레코드 수 (default: 100000)")
+    parser.add_argument("--procs", type=int, default=4, help="동시 프로세스 수 (default: 4)")
+    args = parser.parse_args()
+
+    try:
+        from src.druginfo.catalog import get_dataset
+        from src.druginfo.pack import write_catalog_pack
+        from src.druginfo.query import iter_ndjson
+    except ModuleNotFoundError:
+        sys.path.append(ROOT)
+        from src.druginfo.catalog import get_dataset
+        from src.druginfo.pack import write_catalog_pack
+        from src.druginfo.query import iter_ndjson
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ndjson_dir = os.path.join(tmp, "ndjson")
+        pack_dir = os.path.join(tmp, "pack")
+        os.makedirs(ndjson_dir)
+        os.makedirs(pack_dir)
+        source = os.path.join(ndjson_dir, "product.ndjson")
+        _write_mirror(source, args.records)
+        # druginfo_cli pack 과 같은 형식(exact_key 색인, keyIndex=exact)으로 만듭니다.
+        write_catalog_pack(os.path.join(pack_dir, "product.pack"), iter_ndjson(source), get_dataset("product"))
+        print(f"records: {args.records}, procs: {args.procs}, ndjson: {os.path.getsize(source) // 1024} KiB, "
+              f"pack: {os.path.getsize(os.path.join(pack_dir, 'product.pack')) // 1024} KiB")
+        print(f"{'mirror':<8} {'load ms':>8} {'Rss':>10} {'Pss':>10} {'Private':>10} {'Shared':>10}  (KiB, 프로세스당 중앙값)")
+        for label, mirror_dir in (("ndjson", ndjson_dir), ("pack", pack_dir)):
+            results = sorted(_measure(mirror_dir, args.procs), key=lambda s: s["Pss"])
+            mid = results[len(results) // 2]
+            private = mid["Private_Clean"] + mid["Private_Dirty"]
+            print(f"{label:<8} {mid['load_ms']:>8.1f} {mid['Rss']:>10.0f} {mid['Pss']:>10.0f} {private:>10.0f} {mid['Shared_Clean']:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
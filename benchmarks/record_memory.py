@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""카탈로그 레코드 메모리 측정: json.loads 로 만든 dict 목록 vs RecordTable.
+
+    python benchmarks/record_memory.py                       # 합성 product/main_ingredient 레코드
+    python benchmarks/record_memory.py --ndjson mirror/product.ndjson
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+try:
+    from src.druginfo.query import QueryEngine
+    from src.druginfo.records import RecordTable
+except ModuleNotFoundError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from src.druginfo.query import QueryEngine
+    from src.druginfo.records import RecordTable
+
+
+def synthetic_lines(dataset: str, count: int, seed: int = 7) -> Iterator[str]:
+    """업스트림 응답과 비슷한 모양의 NDJSON 줄을 만듭니다. (제조사/분류 등은 반복되는 값)"""
+    rnd = random.Random(seed)
+    vendors = [f"제약회사{i:03d}" for i in range(300)]
+    kinds = ["전문", "일반", "한약", "의약외품"]
+    for i in range(count):
+        if dataset == "product":
+            record: Dict[str, Any] = {
+                "productCode": f"P{i:08d}",
+                "pillName": f"제품명 {i} 정 {rnd.randint(1, 500)}mg",
+                "vendor": rnd.choice(vendors),
+                "ediCode": f"{rnd.randint(0, 999999999):09d}",
+                "drugKind": rnd.choice(kinds),
+                "count": rnd.randint(0, 5000),
+                "crop": rnd.random() < 0.5,
+                "base64": rnd.random() < 0.3,
+                "watermark": rnd.random() < 0.2,
+                "confirm": rnd.random() < 0.8,
+                "teoulLengthShort": rnd.random() < 0.1,
+                "teoulLengthLong": rnd.random() < 0.1,
+                "ingredientCodes": [f"I{rnd.randint(0, 3000):05d}" for _ in range(rnd.randint(1, 3))],
+                "updatedAt": f"2024-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}T00:00:00",
+            }
+        else:
+            record = {
+                "ingredientCode": f"I{i:06d}",
+                "ingredientNameKor": f"성분 {i}",
+                "ingredientNameEng": f"ingredient-{i}",
+                "drugKind": rnd.choice(kinds),
+                "a4": rnd.random() < 0.5,
+                "a5": rnd.random() < 0.5,
+                "drugkind": rnd.random() < 0.5,
+                "effect": rnd.random() < 0.5,
+                "showMapped": rnd.random() < 0.7,
+                "productCount": rnd.randint(0, 300),
+            }
+        yield json.dumps(record, ensure_ascii=False)
+
+
+def measure(build: Callable[[], Any]) -> Tuple[Any, int, float]:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    value = build()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, current, elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare dict records vs RecordTable memory")
+    parser.add_argument("--ndjson", help="측정할 NDJSON 파일 (미지정 시 합성 데이터)")
+    parser.add_argument("--dataset", choices=("product", "main_ingredient"), default="product")
+    parser.add_argument("--count", type=int, default=100000, help="합성 레코드 수 (default: 100000)")
+    args = parser.parse_args()
+
+    if args.ndjson:
+        lines: List[str] = []
+        with open(args.ndjson, "r", encoding="utf-8") as f:
+            lines = [line for line in f if line.strip()]
+    else:
+        lines = list(synthetic_lines(args.dataset, args.count))
+    n = len(lines)
+
+    dicts, dict_bytes, dict_secs = measure(lambda: [json.loads(line) for line in lines])
+    del dicts
+    table, table_bytes, table_secs = measure(lambda: RecordTable.from_records(json.loads(line) for line in lines))
+
+    started = time.perf_counter()
+    for i in range(0, n, max(1, n // 1000)):
+        table.row(i)
+    row_us = (time.perf_counter() - started) / len(range(0, n, max(1, n // 1000))) * 1e6
+
+    print(f"records: {n}")
+    print(f"{'representation':<16} {'bytes':>14} {'bytes/record':>13} {'build s':>8}")
+    print(f"{'dict list':<16} {dict_bytes:>14,} {dict_bytes / n:>13.1f} {dict_secs:>8.2f}")
+    print(f"{'RecordTable':<16} {table_bytes:>14,} {table_bytes / n:>13.1f} {table_secs:>8.2f}")
+    print(f"ratio: {table_bytes / dict_bytes:.2f}x, row() materialize: {row_us:.1f} us/record")
+
+    if args.dataset in ("product", "main_ingredient") and not args.ndjson:
+        engine = QueryEngine(args.dataset, table)
+        started = time.perf_counter()
+        result = engine.query(PageSize=20, Page=1, SortBy="-count" if args.dataset == "product" else None)
+        print(f"query page: {(time.perf_counter() - started) * 1000:.1f} ms, totalCount={result['totalCount']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""stdio 서버 시작 시간 측정: 프로세스 실행부터 첫 도구 응답까지.
+
+내장 가짜 업스트림을 띄우고 `python -m src.mcp_server` 를 여러 번 새로 실행해, MCP 클라이언트와 같은 순서
+(initialize -> tools/list -> tools/call)로 요청하며 단계별 누적 시간(ms)을 잽니다.
+
+    python benchmarks/startup.py --runs 10
+    python benchmarks/startup.py --tool druginfo_list_product --args '{"PageSize": 5}'
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import IO, Any, Dict, List
+
+from _fake_upstream import start_fake_upstream
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PHASES = ("interpreter", "initialize", "tools/list", "tools/call")
+
+
+def _request(stdin: IO[str], stdout: IO[str], rid: int, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    stdin.write(json.dumps({"jsonrpc": "2.0", "id": rid, "method": method, "params": params}) + "\n")
+    stdin.flush()
+    while True:
+        line = stdout.readline()
+        if not line:
+            raise RuntimeError(f"서버가 {method} 응답 전에 종료되었습니다")
+        message = json.loads(line)
+        if message.get("id") == rid:
+            if "error" in message:
+                raise RuntimeError(f"{method} 실패: {message['error']}")
+            return message["result"]
+
+
+def _interpreter_ms() -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return (time.perf_counter() - started) * 1000
+
+
+def run_once(env: Dict[str, str], tool: str, arguments: Dict[str, Any]) -> Dict[str, float]:
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "src.mcp_server"],
+        cwd=ROOT,
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        encoding="utf-8",
+    )
+    assert proc.stdin is not None and proc.stdout is not None
+    marks: Dict[str, float] = {}
+    try:
+        _request(
+            proc.stdin,
+            proc.stdout,
+            1,
+            "initialize",
+            {"protocolVersion": "2025-06-18", "capabilities": {}, "clientInfo": {"name": "startup-bench", "version": "0"}},
+        )
+        marks["initialize"] = time.perf_counter() - started
+        proc.stdin.write(json.dumps({"jsonrpc": "2.0", "method": "notifications/initialized"}) + "\n")
+        proc.stdin.flush()
+        _request(proc.stdin, proc.stdout, 2, "tools/list", {})
+        marks["tools/list"] = time.perf_counter() - started
+        result = _request(proc.stdin, proc.stdout, 3, "tools/call", {"name": tool, "arguments": arguments})
+        marks["tools/call"] = time.perf_counter() - started
+        if result.get("isError"):
+            raise RuntimeError(f"{tool} 실패: {result.get('content')}")
+    finally:
+        proc.stdin.close()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    return {k: v * 1000 for k, v in marks.items()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="pharminfo MCP stdio time-to-first-tool-response")
+    parser.add_argument("--runs", type=int, default=10, help="서버 실행 횟수 (default: 10)")
+    parser.add_argument("--tool", default="druginfo_get_product_by_code", help="첫 호출 도구")
+    parser.add_argument("--args", default='{"code": "P00001"}', help="도구 인자 JSON")
+    args = parser.parse_args()
+
+    upstream, port = start_fake_upstream()
+    env = dict(os.environ)
+    env.update(
+        {
+            "EDB_BASE_URL": f"http://127.0.0.1:{port}",
+            "EDB_LOGIN_URL": f"http://127.0.0.1:{port}/v1/auth/login",
+            "EDB_USER_ID": "bench",
+            "EDB_PASSWORD": "bench",
+            "PYTHONPATH": ROOT,
+        }
+    )
+    env.pop("EDB_SHARED_STORE", None)
+    arguments = json.loads(args.args)
+
+    samples: Dict[str, List[float]] = {phase: [] for phase in PHASES}
+    run_once(env, args.tool, arguments)  # 디스크 캐시/.pyc 예열
+    for _ in range(max(1, args.runs)):
+        samples["interpreter"].append(_interpreter_ms())
+        for phase, ms in run_once(env, args.tool, arguments).items():
+            samples[phase].append(ms)
+    upstream.shutdown()
+
+    print(f"runs: {args.runs}, tool: {args.tool}  (ms since process start; interpreter = `python -c pass`)")
+    print(f"{'phase':<12} {'median':>8} {'min':>8} {'max':>8}")
+    for phase in PHASES:
+        values = samples[phase]
+        print(f"{phase:<12} {statistics.median(values):>8.1f} {min(values):>8.1f} {max(values):>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,10 @@
 import json
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-import requests
+from src.deadline import Deadline, DeadlineExceededError
+
+if TYPE_CHECKING:
+    import requests
 
 
 def extract_token(data: Any) -> Optional[str]:
@@ -33,7 +36,7 @@ def extract_token(data: Any) -> Optional[str]:
     return None
 
 
-def _is_duplicate_login_error(resp: requests.Response) -> bool:
+def _is_duplicate_login_error(resp: "requests.Response") -> bool:
     try:
         data = resp.json()
     except Exception:
@@ -49,16 +52,24 @@ def login_and_get_token(
     password: str,
     is_force_login: bool = False,
     timeout: int = 15,
+    deadline: Optional[Deadline] = None,
 ) -> str:
     if not login_url:
         raise RuntimeError("환경변수 EDB_LOGIN_URL 이 설정되지 않았습니다. .env(.local)에 설정하세요.")
     headers = {"accept": "application/json", "Content-Type": "application/json"}
     payload = {"userId": user_id, "password": password, "isForceLogin": bool(is_force_login)}
+    d = deadline or Deadline(timeout)
+    import requests
 
-    def _do_login(force_flag: bool) -> requests.Response:
+    def _do_login(force_flag: bool) -> "requests.Response":
         p = dict(payload)
         p["isForceLogin"] = bool(force_flag)
-        r = requests.post(login_url, headers=headers, json=p, timeout=timeout)
+        try:
+            r = requests.post(login_url, headers=headers, json=p, timeout=d.check("login"))
+        except requests.Timeout as e:
+            if d.expired():
+                raise DeadlineExceededError(f"요청 제한 시간 {d.timeout:g}초를 초과했습니다 (login)") from e
+            raise
         return r
 
     resp = _do_login(is_force_login)
@@ -0,0 +1,110 @@
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, NamedTuple, Optional, Sequence, Tuple
+
+
+DEFAULT_ACCOUNT = "default"
+
+
+class Credential(NamedTuple):
+    account: str
+    token: str
+    issued_at: float
+
+
+class CredentialStore:
+    """계정별 토큰 저장소.
+
+    쓰기는 잠금 안에서 새 dict 를 만들어 통째로 바꾸고(copy-on-write), 읽기는 잠금 없이 현재 dict 를 봅니다.
+    요청마다 호출되는 get() 은 dict 조회 한 번입니다.
+    """
+
+    def __init__(self) -> None:
+        self._tokens: Dict[str, Credential] = {}
+        self._lock = threading.Lock()
+
+    def get(self, account: str = DEFAULT_ACCOUNT) -> Optional[str]:
+        cred = self._tokens.get(account)
+        return cred.token if cred is not None else None
+
+    def set(self, account: str, token: str) -> Credential:
+        cred = Credential(account, token, time.time())
+        with self._lock:
+            tokens = dict(self._tokens)
+            tokens[account] = cred
+            self._tokens = tokens
+        return cred
+
+
+CREDENTIALS = CredentialStore()
+
+_current_account: "contextvars.ContextVar[Optional[str]]" = contextvars.ContextVar("edb_account", default=None)
+
+
+def current_account() -> str:
+    return _current_account.get() or DEFAULT_ACCOUNT
+
+
+@contextmanager
+def use_account(account: Optional[str]) -> Iterator[str]:
+    """with 블록 안의 druginfo 요청이 account 의 토큰을 쓰도록 합니다. (None 이면 현재 계정 유지)"""
+    if not account:
+        yield current_account()
+        return
+    reset = _current_account.set(account)
+    try:
+        yield account
+    finally:
+        _current_account.reset(reset)
+
+
+def current_token() -> Optional[str]:
+    """현재 계정의 토큰. 기본 계정은 저장된 토큰이 없으면 EDB_TOKEN 환경변수를 사용합니다."""
+    account = current_account()
+    tok = CREDENTIALS.get(account)
+    if tok is None and account == DEFAULT_ACCOUNT:
+        tok = os.getenv("EDB_TOKEN") or None
+    return tok
+
+
+def account_logins() -> Dict[str, Tuple[str, str]]:
+    """로그인 가능한 계정 목록: 기본 계정(EDB_USER_ID/EDB_PASSWORD)과 EDB_ACCOUNTS(JSON)."""
+    logins: Dict[str, Tuple[str, str]] = {}
+    uid = os.getenv("EDB_USER_ID")
+    pwd = os.getenv("EDB_PASSWORD")
+    if uid and pwd:
+        logins[DEFAULT_ACCOUNT] = (uid, pwd)
+    raw = os.getenv("EDB_ACCOUNTS")
+    if raw:
+        try:
+            extra = json.loads(raw)
+        except ValueError:
+            raise RuntimeError('EDB_ACCOUNTS 는 {"이름": {"userId": "...", "password": "..."}} 형식의 JSON 이어야 합니다')
+        for name, entry in (extra or {}).items():
+            if isinstance(entry, dict) and entry.get("userId") and entry.get("password"):
+                logins[str(name)] = (str(entry["userId"]), str(entry["password"]))
+    return logins
+
+
+class TokenPool:
+    """여러 계정에 요청을 돌아가며 배정해 계정별 업스트림 제한(throttle)에 걸리지 않도록 합니다."""
+
+    def __init__(self, accounts: Sequence[str]) -> None:
+        if not accounts:
+            raise ValueError("TokenPool 에는 계정이 하나 이상 필요합니다")
+        self.accounts = list(dict.fromkeys(accounts))
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    def next_account(self) -> str:
+        with self._lock:
+            n = next(self._counter)
+        return self.accounts[n % len(self.accounts)]
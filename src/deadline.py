@@ -0,0 +1,35 @@
+import time
+from typing import Optional
+
+
+class DeadlineExceededError(TimeoutError):
+    pass
+
+
+class Deadline:
+    """호출 단위 마감 시각. 각 단계(요청/로그인/재시도 대기)는 남은 시간만 사용합니다."""
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = float(timeout)
+        self.expires_at = time.monotonic() + self.timeout
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def check(self, what: Optional[str] = None) -> float:
+        """남은 시간을 반환하고, 이미 지났다면 DeadlineExceededError 를 발생시킵니다."""
+        left = self.remaining()
+        if left <= 0.0:
+            suffix = f" ({what})" if what else ""
+            raise DeadlineExceededError(f"요청 제한 시간 {self.timeout:g}초를 초과했습니다{suffix}")
+        return left
+
+    def sleep(self, seconds: float, what: Optional[str] = None) -> None:
+        """재시도 대기. 대기 후 남는 시간이 없으면 기다리지 않고 바로 실패합니다."""
+        if seconds >= self.remaining():
+            self.check(what)
+            raise DeadlineExceededError(f"요청 제한 시간 {self.timeout:g}초 안에 재시도할 수 없습니다" + (f" ({what})" if what else ""))
+        time.sleep(seconds)
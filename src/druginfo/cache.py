@@ -0,0 +1,261 @@
+import contextvars
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.deadline import Deadline, DeadlineExceededError
+from src.settings import env_float, env_int
+from src.shared_store import get_shared_store
+
+from .client import UnauthorizedError
+from .records import CompactResponse, unpack
+
+
+CACHE_META_KEY = "_cache"
+_ENTRY_VERSION = 2
+
+
+def cache_key(fn: Callable[..., Any], kwargs: Dict[str, Any]) -> str:
+    args = {k: v for k, v in kwargs.items() if v is not None and k not in ("timeout", "deadline")}
+    return "druginfo:" + fn.__name__ + ":" + json.dumps(args, ensure_ascii=False, sort_keys=True, default=str)
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+class ResponseCache:
+    """druginfo 응답 캐시. EDB_SHARED_STORE 가 있으면 워커 간 공유 SQLite 에, 없으면 프로세스 메모리에 보관합니다.
+
+    저장된 응답의 나이(age)에 따라
+    - ttl 이내: 그대로 반환 (fresh)
+    - stale_ttl 이내: 즉시 반환하고 백그라운드에서 한 번만 다시 조회 (stale)
+    - stale_if_error 이내: 다시 조회해 반환하고 (revalidated), 업스트림이 실패하면 저장된 응답을 반환 (stale)
+    같은 키를 동시에 조회하면 업스트림 요청은 하나만 보냅니다. 반환하는 응답에는 _cache 메타데이터가 붙습니다.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        max_entries: int = 1024,
+        stale_ttl: float = 3600.0,
+        stale_if_error: float = 86400.0,
+        refresh_timeout: int = 15,
+    ) -> None:
+        self.ttl = float(ttl)
+        self.stale_ttl = max(self.ttl, float(stale_ttl))
+        self.stale_if_error = max(self.stale_ttl, float(stale_if_error))
+        self.max_entries = max(1, int(max_entries))
+        self.refresh_timeout = int(refresh_timeout)
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._refreshing: Dict[str, float] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.hits = 0
+        self.misses = 0
+        self._status: Dict[str, int] = {}
+        # 선조회(prefetch) 요청의 상태별 횟수. 사용자 요청의 hit/miss 와 따로 셉니다.
+        self._prefetch_status: Dict[str, int] = {}
+        self._writes = 0
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        return cls(
+            ttl=env_float("EDB_CACHE_TTL", 300.0),
+            max_entries=env_int("EDB_CACHE_MAX_ENTRIES", 1024),
+            stale_ttl=env_float("EDB_CACHE_STALE_TTL", 3600.0),
+            stale_if_error=env_float("EDB_CACHE_STALE_IF_ERROR", 86400.0),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _lookup(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """(응답, 저장 시각). 보관 기한(stale_if_error)이 지난 항목은 없는 것으로 봅니다."""
+        store = get_shared_store()
+        if store is not None:
+            raw = store.get(key)
+            if raw is None:
+                return None
+            try:
+                entry = json.loads(raw)
+            except ValueError:
+                return None
+            # 이전 형식(응답 본문만 저장)의 항목은 무시합니다.
+            if not isinstance(entry, dict) or entry.get("v") != _ENTRY_VERSION:
+                return None
+            return entry["value"], float(entry["at"])
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None and time.time() - cached[0] > self.stale_if_error:
+                self._memory.pop(key, None)
+                cached = None
+            if cached is None:
+                return None
+            self._memory.move_to_end(key)
+        return unpack(cached[1]), cached[0]
+
+    def contains(self, key: str) -> bool:
+        """적중 통계를 바꾸지 않고 ttl 이내 항목이 있는지만 확인합니다."""
+        found = self._lookup(key)
+        return found is not None and time.time() - found[1] <= self.ttl
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        now = time.time()
+        store = get_shared_store()
+        if store is not None:
+            entry = {"v": _ENTRY_VERSION, "at": now, "value": value}
+            store.set(key, json.dumps(entry, ensure_ascii=False), self.stale_if_error)
+            self._writes += 1
+            if self._writes % 256 == 0:
+                store.purge()
+            return
+        with self._lock:
+            # 목록 응답은 열 저장으로 압축해 두고, 꺼낼 때마다 새 dict 로 만듭니다.
+            self._memory[key] = (now, CompactResponse.pack(value))
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _count(self, status: str, prefetch: bool = False) -> None:
+        with self._lock:
+            if prefetch:
+                self._prefetch_status[status] = self._prefetch_status.get(status, 0) + 1
+                return
+            self._status[status] = self._status.get(status, 0) + 1
+            if status in ("fresh", "stale"):
+                self.hits += 1
+            elif status in ("miss", "revalidated"):
+                self.misses += 1
+
+    @staticmethod
+    def _with_meta(value: Dict[str, Any], status: str, age: float, **extra: Any) -> Dict[str, Any]:
+        # 캐시가 보관 중인 dict 를 바꾸지 않도록 복사본에 붙입니다.
+        meta: Dict[str, Any] = {"status": status, "age": round(max(0.0, age), 3)}
+        meta.update(extra)
+        result = dict(value)
+        result[CACHE_META_KEY] = meta
+        return result
+
+    def _fetch_once(self, key: str, fn: Callable[..., Dict[str, Any]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """같은 키의 동시 조회는 먼저 온 호출만 업스트림에 보내고, 나머지는 그 결과를 함께 받습니다."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            deadline = kwargs.get("deadline")
+            wait = deadline.remaining() if isinstance(deadline, Deadline) else None
+            if not flight.done.wait(wait):
+                raise DeadlineExceededError(f"요청 제한 시간을 초과했습니다 ({fn.__name__})")
+            if flight.error is not None:
+                raise flight.error
+            assert flight.value is not None
+            return flight.value
+        try:
+            value = fn(**kwargs)
+            self.set(key, value)
+            flight.value = value
+            return value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _schedule_refresh(self, key: str, fn: Callable[..., Dict[str, Any]], kwargs: Dict[str, Any]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            started = self._refreshing.get(key)
+            if started is not None and now - started < self.refresh_timeout:
+                return
+            self._refreshing[key] = now
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="edb-revalidate")
+            executor = self._executor
+        kwargs = {k: v for k, v in kwargs.items() if k != "deadline"}
+        # 호출한 요청의 계정(토큰)으로 다시 조회합니다.
+        executor.submit(contextvars.copy_context().run, self._refresh, key, fn, kwargs)
+
+    def _refresh(self, key: str, fn: Callable[..., Dict[str, Any]], kwargs: Dict[str, Any]) -> None:
+        store = get_shared_store()
+        lease = "revalidate:" + key
+        try:
+            # 워커 간에도 한 번만 다시 조회하도록 공유 임대를 잡습니다.
+            if store is not None and not store.acquire(lease, ttl=self.refresh_timeout):
+                return
+            try:
+                self._fetch_once(key, fn, dict(kwargs, deadline=Deadline(self.refresh_timeout)))
+                self._count("refreshed")
+            finally:
+                if store is not None:
+                    store.release(lease)
+        except Exception:
+            self._count("refresh_failed")
+        finally:
+            with self._lock:
+                self._refreshing.pop(key, None)
+
+    def call(self, fn: Callable[..., Dict[str, Any]], prefetch: bool = False, **kwargs: Any) -> Dict[str, Any]:
+        """저장된 응답의 나이에 따라 fresh/stale/revalidated/miss 로 응답합니다. (캐시가 꺼져 있으면 fn 결과 그대로)
+
+        prefetch=True 인 호출(선조회)은 hit/miss 통계에 넣지 않고 prefetch 상태별 횟수로만 셉니다.
+        """
+        if not self.enabled:
+            return fn(**kwargs)
+        key = cache_key(fn, kwargs)
+        found = self._lookup(key)
+        if found is None:
+            self._count("miss", prefetch)
+            return self._with_meta(self._fetch_once(key, fn, kwargs), "miss", 0.0)
+        value, stored_at = found
+        age = time.time() - stored_at
+        if age <= self.ttl:
+            self._count("fresh", prefetch)
+            return self._with_meta(value, "fresh", age)
+        if age <= self.stale_ttl:
+            self._schedule_refresh(key, fn, kwargs)
+            self._count("stale", prefetch)
+            return self._with_meta(value, "stale", age, revalidating=True)
+        try:
+            fetched = self._fetch_once(key, fn, kwargs)
+        except UnauthorizedError:
+            raise
+        except Exception as e:
+            # 업스트림 장애(타임아웃 포함) 시 보관 기한 안의 응답으로 대신합니다.
+            self._count("stale_if_error", prefetch)
+            return self._with_meta(value, "stale", age, error=str(e))
+        self._count("revalidated", prefetch)
+        return self._with_meta(fetched, "revalidated", 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "backend": "sqlite" if get_shared_store() is not None else "memory",
+                "ttl": self.ttl,
+                "staleTtl": self.stale_ttl,
+                "staleIfError": self.stale_if_error,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / total, 4) if total else 0.0,
+                "status": dict(self._status),
+                "prefetch": dict(self._prefetch_status),
+                "revalidating": len(self._refreshing),
+            }
+
+
+RESPONSE_CACHE = ResponseCache.from_env()
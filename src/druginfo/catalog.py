@@ -0,0 +1,94 @@
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from .endpoints import ENDPOINTS, Endpoint, Param
+
+from .client import (
+    DrugInfoError,
+    get_main_ingredient_by_code,
+    get_product_by_code,
+    list_main_ingredient,
+    list_product,
+    list_product_edicode,
+)
+
+
+class CatalogDataset(NamedTuple):
+    name: str
+    fetch: Callable[..., Dict[str, Any]]
+    key_fields: Tuple[str, ...]
+    detail: Optional[Callable[..., Dict[str, Any]]] = None
+
+    @property
+    def endpoint(self) -> Endpoint:
+        """목록 조회에 쓰는 엔드포인트 표 항목."""
+        return ENDPOINTS[self.fetch.__name__]
+
+    def params(self) -> Dict[str, Param]:
+        return {p.name: p for p in self.endpoint.params}
+
+
+CATALOG_DATASETS: Dict[str, CatalogDataset] = {
+    "product": CatalogDataset("product", list_product, ("productCode",), get_product_by_code),
+    "main_ingredient": CatalogDataset("main_ingredient", list_main_ingredient, ("ingredientCode",), get_main_ingredient_by_code),
+    "product_edicode": CatalogDataset("product_edicode", list_product_edicode, ("productCode", "ediCode")),
+}
+
+
+def get_dataset(name: str) -> CatalogDataset:
+    try:
+        return CATALOG_DATASETS[name]
+    except KeyError:
+        raise DrugInfoError(f"알 수 없는 데이터셋: {name} (지원: {', '.join(CATALOG_DATASETS)})")
+
+
+# 페이지 단위 조회가 직접 채우는 업스트림 쿼리 키
+PAGING_KEYS = ("Page", "PageSize")
+
+
+def check_list_params(dataset: CatalogDataset, params: Dict[str, Any]) -> None:
+    """일괄 조회의 추가 조건에 페이지 인자(Page/PageSize 와 그 별칭)가 있으면 DrugInfoError 를 냅니다."""
+    known = dataset.params()
+    paging = sorted(k for k in params if k in PAGING_KEYS or (k in known and known[k].query_key in PAGING_KEYS))
+    if paging:
+        raise DrugInfoError(f"페이지 인자는 조회 조건으로 줄 수 없습니다: {', '.join(paging)} (--page-size 를 사용하세요)")
+
+
+def _field(record: Dict[str, Any], name: str) -> Optional[Any]:
+    if name in record:
+        return record[name]
+    lowered = name.lower()
+    for k, v in record.items():
+        if isinstance(k, str) and k.lower() == lowered:
+            return v
+    return None
+
+
+def record_key(dataset: CatalogDataset, record: Dict[str, Any]) -> Optional[str]:
+    """레코드의 식별 키. key_fields 값을 '|'로 이어 붙이며 필드명은 대소문자를 구분하지 않습니다."""
+    parts = []
+    for name in dataset.key_fields:
+        value = _field(record, name)
+        if value is None or value == "":
+            break
+        parts.append(str(value))
+    else:
+        return "|".join(parts)
+    for name in ("id", "code"):
+        value = _field(record, name)
+        if value is not None and value != "":
+            return str(value)
+    return None
+
+
+def exact_key(dataset: CatalogDataset, record: Dict[str, Any]) -> Optional[str]:
+    """key_fields 를 정확한 필드명으로만 찾아 '|'로 이어 붙인 키. 하나라도 없으면 None (id/code 대체 없음)
+
+    팩의 키 색인은 로컬 조회 엔진의 정확 일치 필터로도 쓰이므로 엔진과 같은 규칙을 따릅니다.
+    """
+    parts = []
+    for name in dataset.key_fields:
+        value = record.get(name)
+        if value is None or value == "":
+            return None
+        parts.append(str(value))
+    return "|".join(parts)
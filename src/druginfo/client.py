@@ -1,7 +1,15 @@
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+import inspect
 import os
+import threading
 
-import requests
+from src.credentials import current_token
+from src.deadline import Deadline, DeadlineExceededError
+
+from .endpoints import ENDPOINTS, Endpoint
+
+if TYPE_CHECKING:
+    import requests
 
 
 class DrugInfoError(RuntimeError):
@@ -27,13 +35,15 @@ def _base_url() -> str:
 
 def _headers() -> Dict[str, str]:
     headers: Dict[str, str] = {"accept": "application/json"}
-    tok = os.getenv("EDB_TOKEN")
+    tok = current_token()
     if tok:
         headers["Authorization"] = f"Bearer {tok}"
     return headers
 
 
-def _handle_response(resp: requests.Response) -> Dict[str, Any]:
+def _handle_response(resp: "requests.Response") -> Dict[str, Any]:
+    import requests
+
     if resp.status_code == 401:
         raise UnauthorizedError("인증 실패(401)")
     try:
@@ -53,249 +63,68 @@ def _handle_response(resp: requests.Response) -> Dict[str, Any]:
     return {"data": data}
 
 
-def list_main_ingredient(
-    a4: Optional[bool] = None,
-    a4Off: Optional[bool] = None,
-    a5: Optional[bool] = None,
-    a5Off: Optional[bool] = None,
-    drugkind: Optional[bool] = None,
-    drugkindOff: Optional[bool] = None,
-    effect: Optional[bool] = None,
-    effectOff: Optional[bool] = None,
-    showMapped: Optional[bool] = None,
-    IngredientCode: Optional[str] = None,
-    ingredientNameKor: Optional[str] = None,
-    drugKind: Optional[str] = None,
-    PageSize: Optional[int] = None,
-    Page: Optional[int] = None,
-    SortBy: Optional[str] = None,
-    # legacy aliases
-    q: Optional[str] = None,
-    page: Optional[int] = None,
-    size: Optional[int] = None,
-    timeout: int = 15,
-) -> Dict[str, Any]:
-    base = _base_url()
-    url = f"{base}/v1/druginfo/main-ingredient"
-    params: Dict[str, Any] = {}
-    def _set(name: str, value: Any) -> None:
-        if value is None:
-            return
-        if isinstance(value, bool):
-            params[name] = "true" if value else "false"
-        else:
-            params[name] = value
-    for k, v in (
-        ("a4", a4), ("a4Off", a4Off), ("a5", a5), ("a5Off", a5Off),
-        ("drugkind", drugkind), ("drugkindOff", drugkindOff), ("effect", effect), ("effectOff", effectOff),
-        ("showMapped", showMapped), ("IngredientCode", IngredientCode), ("ingredientNameKor", ingredientNameKor),
-        ("drugKind", drugKind), ("PageSize", PageSize), ("Page", Page), ("SortBy", SortBy),
-    ):
-        _set(k, v)
-    if q is not None and "ingredientNameKor" not in params:
-        params["ingredientNameKor"] = q
-    if page is not None and "Page" not in params:
-        params["Page"] = int(page)
-    if size is not None and "PageSize" not in params:
-        params["PageSize"] = int(size)
-    resp = requests.get(url, headers=_headers(), params=params, timeout=timeout)
-    return _handle_response(resp)
-
-
-def get_main_ingredient_by_code(code: str, timeout: int = 15) -> Dict[str, Any]:
-    if not code:
-        raise DrugInfoError("code 가 필요합니다")
-    base = _base_url()
-    url = f"{base}/v1/druginfo/main-ingredient/{code}"
-    resp = requests.get(url, headers=_headers(), timeout=timeout)
-    return _handle_response(resp)
-
+_last_response = threading.local()
 
-def list_product(
-    crop: Optional[bool] = None,
-    cropOff: Optional[bool] = None,
-    base64: Optional[bool] = None,
-    base64Off: Optional[bool] = None,
-    watermark: Optional[bool] = None,
-    watermarkOff: Optional[bool] = None,
-    confirm: Optional[bool] = None,
-    confirmOff: Optional[bool] = None,
-    teoulLengthShort: Optional[bool] = None,
-    teoulLengthShortOff: Optional[bool] = None,
-    teoulLengthLong: Optional[bool] = None,
-    teoulLengthLongOff: Optional[bool] = None,
-    minCount: Optional[int] = None,
-    ProductCode: Optional[str] = None,
-    pillName: Optional[str] = None,
-    vendor: Optional[str] = None,
-    PageSize: Optional[int] = None,
-    Page: Optional[int] = None,
-    SortBy: Optional[str] = None,
-    # legacy aliases
-    q: Optional[str] = None,
-    page: Optional[int] = None,
-    size: Optional[int] = None,
-    timeout: int = 15,
-) -> Dict[str, Any]:
-    base = _base_url()
-    url = f"{base}/v1/druginfo/product"
-    params: Dict[str, Any] = {}
-    def _set(name: str, value: Any) -> None:
-        if value is None:
-            return
-        if isinstance(value, bool):
-            params[name] = "true" if value else "false"
-        else:
-            params[name] = value
-    for k, v in (
-        ("crop", crop), ("cropOff", cropOff), ("base64", base64), ("base64Off", base64Off),
-        ("watermark", watermark), ("watermarkOff", watermarkOff), ("confirm", confirm), ("confirmOff", confirmOff),
-        ("teoulLengthShort", teoulLengthShort), ("teoulLengthShortOff", teoulLengthShortOff), ("teoulLengthLong", teoulLengthLong), ("teoulLengthLongOff", teoulLengthLongOff),
-        ("minCount", minCount), ("ProductCode", ProductCode), ("pillName", pillName), ("vendor", vendor),
-        ("PageSize", PageSize), ("Page", Page), ("SortBy", SortBy),
-    ):
-        _set(k, v)
-    if q is not None and "pillName" not in params:
-        params["pillName"] = q
-    if page is not None and "Page" not in params:
-        params["Page"] = int(page)
-    if size is not None and "PageSize" not in params:
-        params["PageSize"] = int(size)
-    resp = requests.get(url, headers=_headers(), params=params, timeout=timeout)
-    return _handle_response(resp)
 
+def last_response_bytes() -> int:
+    """현재 스레드에서 마지막으로 받은 응답 본문 크기(바이트)."""
+    return int(getattr(_last_response, "size", 0))
 
-def get_product_by_code(code: str, timeout: int = 15) -> Dict[str, Any]:
-    if not code:
-        raise DrugInfoError("code 가 필요합니다")
-    base = _base_url()
-    url = f"{base}/v1/druginfo/product/{code}"
-    resp = requests.get(url, headers=_headers(), timeout=timeout)
-    return _handle_response(resp)
 
-
-# --- Additional endpoints ---
-
-def list_main_ingredient_drug_effect(
-    edit: Optional[str] = None,
-    pageSize: Optional[int] = None,
-    page: Optional[int] = None,
-    sortBy: Optional[str] = None,
+def _get(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
     timeout: int = 15,
+    deadline: Optional[Deadline] = None,
 ) -> Dict[str, Any]:
-    base = _base_url()
-    url = f"{base}/v1/druginfo/main-ingredient/drug-effect"
-    params: Dict[str, Any] = {}
-    if edit is not None:
-        params["edit"] = edit
-    if pageSize is not None:
-        params["PageSize"] = int(pageSize)
-    if page is not None:
-        params["Page"] = int(page)
-    if sortBy is not None:
-        params["SortBy"] = sortBy
-    resp = requests.get(url, headers=_headers(), params=params, timeout=timeout)
-    return _handle_response(resp)
-
+    # requests 는 첫 요청 때 불러옵니다. (서버 시작 시간 단축)
+    import requests
 
-def list_main_ingredient_drug_kind(edit: Optional[str] = None, pageSize: Optional[int] = None, page: Optional[int] = None, sortBy: Optional[str] = None, timeout: int = 15) -> Dict[str, Any]:
-    base = _base_url()
-    url = f"{base}/v1/druginfo/main-ingredient/drug-kind"
-    params: Dict[str, Any] = {}
-    if edit is not None:
-        params["edit"] = edit
-    if pageSize is not None:
-        params["PageSize"] = int(pageSize)
-    if page is not None:
-        params["Page"] = int(page)
-    if sortBy is not None:
-        params["SortBy"] = sortBy
-    resp = requests.get(url, headers=_headers(), params=params, timeout=timeout)
-    return _handle_response(resp)
-
-
-def list_main_ingredient_guide_a4(edit: Optional[str] = None, pageSize: Optional[int] = None, page: Optional[int] = None, sortBy: Optional[str] = None, timeout: int = 15) -> Dict[str, Any]:
-    base = _base_url()
-    url = f"{base}/v1/druginfo/main-ingredient/guide-a4"
-    params: Dict[str, Any] = {}
-    if edit is not None:
-        params["edit"] = edit
-    if pageSize is not None:
-        params["PageSize"] = int(pageSize)
-    if page is not None:
-        params["Page"] = int(page)
-    if sortBy is not None:
-        params["SortBy"] = sortBy
-    resp = requests.get(url, headers=_headers(), params=params, timeout=timeout)
-    return _handle_response(resp)
-
-
-def list_main_ingredient_guide_a5(edit: Optional[str] = None, pageSize: Optional[int] = None, page: Optional[int] = None, sortBy: Optional[str] = None, timeout: int = 15) -> Dict[str, Any]:
-    base = _base_url()
-    url = f"{base}/v1/druginfo/main-ingredient/guide-A5"
-    params: Dict[str, Any] = {}
-    if edit is not None:
-        params["edit"] = edit
-    if pageSize is not None:
-        params["PageSize"] = int(pageSize)
-    if page is not None:
-        params["Page"] = int(page)
-    if sortBy is not None:
-        params["SortBy"] = sortBy
-    resp = requests.get(url, headers=_headers(), params=params, timeout=timeout)
-    return _handle_response(resp)
-
-
-def list_main_ingredient_picto(IsDeleted: Optional[str] = None, Title: Optional[str] = None, PageSize: Optional[int] = None, Page: Optional[int] = None, SortBy: Optional[str] = None, timeout: int = 15) -> Dict[str, Any]:
-    base = _base_url()
-    url = f"{base}/v1/druginfo/main-ingredient/picto"
-    params: Dict[str, Any] = {}
-    if IsDeleted is not None:
-        params["IsDeleted"] = IsDeleted
-    if Title is not None:
-        params["Title"] = Title
-    if PageSize is not None:
-        params["PageSize"] = int(PageSize)
-    if Page is not None:
-        params["Page"] = int(Page)
-    if SortBy is not None:
-        params["SortBy"] = SortBy
-    resp = requests.get(url, headers=_headers(), params=params, timeout=timeout)
-    return _handle_response(resp)
-
-
-def get_main_ingredient_picto_by_code(code: str, timeout: int = 15) -> Dict[str, Any]:
-    if not code:
-        raise DrugInfoError("code 가 필요합니다")
-    base = _base_url()
-    url = f"{base}/v1/druginfo/main-ingredient/picto/{code}"
-    resp = requests.get(url, headers=_headers(), timeout=timeout)
+    d = deadline or Deadline(timeout)
+    try:
+        resp = requests.get(url, headers=_headers(), params=params, timeout=d.check(url))
+    except requests.Timeout as e:
+        if d.expired():
+            raise DeadlineExceededError(f"요청 제한 시간 {d.timeout:g}초를 초과했습니다 ({url})") from e
+        raise
+    _last_response.size = len(resp.content)
     return _handle_response(resp)
 
 
-def get_main_ingredient_drug_effect_by_id(effect_id: int, timeout: int = 15) -> Dict[str, Any]:
-    base = _base_url()
-    url = f"{base}/v1/druginfo/main-ingredient/drug-effect/{int(effect_id)}"
-    resp = requests.get(url, headers=_headers(), timeout=timeout)
-    return _handle_response(resp)
-
+def _client_function(endpoint: Endpoint) -> Callable[..., Dict[str, Any]]:
+    """엔드포인트 표의 항목으로 클라이언트 함수를 만듭니다. 시그니처(__signature__)는 표의 인자 순서를 따릅니다."""
+    signature = inspect.Signature(endpoint.parameters() + _CALL_PARAMETERS, return_annotation=Dict[str, Any])
 
-def list_product_edicode(ProductCode: Optional[str] = None, EdiCode: Optional[str] = None, PageSize: Optional[int] = None, Page: Optional[int] = None, SortBy: Optional[str] = None, timeout: int = 15) -> Dict[str, Any]:
-    base = _base_url()
-    url = f"{base}/v1/druginfo/product/edicode"
-    params: Dict[str, Any] = {}
-    if ProductCode is not None:
-        params["ProductCode"] = ProductCode
-    if EdiCode is not None:
-        params["EdiCode"] = EdiCode
-    if PageSize is not None:
-        params["PageSize"] = int(PageSize)
-    if Page is not None:
-        params["Page"] = int(Page)
-    if SortBy is not None:
-        params["SortBy"] = SortBy
-    resp = requests.get(url, headers=_headers(), params=params, timeout=timeout)
-    return _handle_response(resp)
+    def call(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+        values = signature.bind(*args, **kwargs).arguments
+        try:
+            path, params = endpoint.request(values)
+        except ValueError as e:
+            raise DrugInfoError(str(e))
+        return _get(_base_url() + path, params=params, timeout=values.get("timeout", 15), deadline=values.get("deadline"))
+
+    call.__name__ = call.__qualname__ = endpoint.name
+    call.__signature__ = signature  # type: ignore[attr-defined]
+    return call
+
+
+_CALL_PARAMETERS = [
+    inspect.Parameter("timeout", inspect.Parameter.POSITIONAL_OR_KEYWORD, default=15, annotation=int),
+    inspect.Parameter("deadline", inspect.Parameter.POSITIONAL_OR_KEYWORD, default=None, annotation=Optional[Deadline]),
+]
+
+list_main_ingredient = _client_function(ENDPOINTS["list_main_ingredient"])
+get_main_ingredient_by_code = _client_function(ENDPOINTS["get_main_ingredient_by_code"])
+list_product = _client_function(ENDPOINTS["list_product"])
+get_product_by_code = _client_function(ENDPOINTS["get_product_by_code"])
+list_main_ingredient_drug_effect = _client_function(ENDPOINTS["list_main_ingredient_drug_effect"])
+get_main_ingredient_drug_effect_by_id = _client_function(ENDPOINTS["get_main_ingredient_drug_effect_by_id"])
+list_main_ingredient_drug_kind = _client_function(ENDPOINTS["list_main_ingredient_drug_kind"])
+list_main_ingredient_guide_a4 = _client_function(ENDPOINTS["list_main_ingredient_guide_a4"])
+list_main_ingredient_guide_a5 = _client_function(ENDPOINTS["list_main_ingredient_guide_a5"])
+list_main_ingredient_picto = _client_function(ENDPOINTS["list_main_ingredient_picto"])
+get_main_ingredient_picto_by_code = _client_function(ENDPOINTS["get_main_ingredient_picto_by_code"])
+list_product_edicode = _client_function(ENDPOINTS["list_product_edicode"])
 
 
 # --- (removed) Helpers for non-GET requests ---
@@ -0,0 +1,157 @@
+import inspect
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+class Param(NamedTuple):
+    name: str
+    type: type
+    # 업스트림 쿼리(또는 경로 자리표시자) 이름. 기본은 name
+    key: Optional[str] = None
+    # 경로의 {key} 를 채우는 필수 인자
+    path: bool = False
+    # 예전 이름(legacy alias): 같은 key 가 이미 채워져 있지 않을 때만 사용
+    fallback: bool = False
+    # MCP 도구 인자 이름. 기본은 name
+    tool: Optional[str] = None
+
+    @property
+    def query_key(self) -> str:
+        return self.key or self.name
+
+    @property
+    def tool_name(self) -> str:
+        return self.tool or self.name
+
+    def parameter(self, tool: bool = False) -> inspect.Parameter:
+        name = self.tool_name if tool else self.name
+        if self.path:
+            return inspect.Parameter(name, inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=self.type)
+        return inspect.Parameter(
+            name, inspect.Parameter.POSITIONAL_OR_KEYWORD, default=None, annotation=Optional[self.type]
+        )
+
+
+class Endpoint(NamedTuple):
+    name: str
+    path: str
+    params: Tuple[Param, ...] = ()
+
+    @property
+    def tool_name(self) -> str:
+        return "druginfo_" + self.name
+
+    @property
+    def listing(self) -> bool:
+        """경로 인자가 없는 목록 엔드포인트. (MCP 도구에 cursor 가 붙습니다)"""
+        return not any(p.path for p in self.params)
+
+    def parameters(self, tool: bool = False) -> List[inspect.Parameter]:
+        return [p.parameter(tool) for p in self.params]
+
+    def lookup(self, key: str) -> Optional[Param]:
+        """인자 이름, 도구 인자 이름, 업스트림 쿼리 이름 순으로 표의 인자를 찾습니다. (쿼리 이름은 별칭이 아닌 것만)"""
+        for match in (
+            lambda p: p.name == key,
+            lambda p: p.tool_name == key,
+            lambda p: p.query_key == key and not p.fallback,
+        ):
+            for param in self.params:
+                if match(param):
+                    return param
+        return None
+
+    def request(self, values: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """인자 이름(Param.name)별 값으로 (경로, 업스트림 쿼리)를 만듭니다. 경로 인자가 비어 있으면 ValueError.
+
+        None 인 값은 보내지 않고, 별칭(fallback)은 같은 쿼리 키가 채워져 있지 않을 때만 씁니다.
+        """
+        path = self.path
+        query: Dict[str, Any] = {}
+        for param in self.params:
+            value = values.get(param.name)
+            if param.path:
+                if value is None or value == "":
+                    raise ValueError(f"{param.name} 가 필요합니다")
+                path = path.replace("{" + param.query_key + "}", str(param.type(value)))
+            elif value is not None and not (param.fallback and param.query_key in query):
+                query[param.query_key] = query_value(param, value)
+        return path, query
+
+
+def _flags(*names: str) -> Tuple[Param, ...]:
+    return tuple(Param(n, bool) for n in names)
+
+
+def _legacy(search_key: str) -> Tuple[Param, ...]:
+    return (
+        Param("q", str, search_key, fallback=True),
+        Param("page", int, "Page", fallback=True),
+        Param("size", int, "PageSize", fallback=True),
+    )
+
+
+_PAGING = (Param("PageSize", int), Param("Page", int), Param("SortBy", str))
+_EDIT_PAGING = (
+    Param("edit", str),
+    Param("pageSize", int, "PageSize"),
+    Param("page", int, "Page"),
+    Param("sortBy", str, "SortBy"),
+)
+_CODE = (Param("code", str, path=True),)
+
+
+# druginfo GET 엔드포인트. 클라이언트 함수(client.py)와 MCP 도구(druginfo_tools.py)를 이 표에서 만듭니다.
+ENDPOINTS: Dict[str, Endpoint] = {
+    e.name: e
+    for e in (
+        Endpoint(
+            "list_main_ingredient",
+            "/v1/druginfo/main-ingredient",
+            _flags("a4", "a4Off", "a5", "a5Off", "drugkind", "drugkindOff", "effect", "effectOff", "showMapped")
+            + (Param("IngredientCode", str), Param("ingredientNameKor", str), Param("drugKind", str))
+            + _PAGING
+            + _legacy("ingredientNameKor"),
+        ),
+        Endpoint("get_main_ingredient_by_code", "/v1/druginfo/main-ingredient/{code}", _CODE),
+        Endpoint(
+            "list_product",
+            "/v1/druginfo/product",
+            _flags(
+                "crop", "cropOff", "base64", "base64Off", "watermark", "watermarkOff", "confirm", "confirmOff",
+                "teoulLengthShort", "teoulLengthShortOff", "teoulLengthLong", "teoulLengthLongOff",
+            )
+            + (Param("minCount", int), Param("ProductCode", str), Param("pillName", str), Param("vendor", str))
+            + _PAGING
+            + _legacy("pillName"),
+        ),
+        Endpoint("get_product_by_code", "/v1/druginfo/product/{code}", _CODE),
+        Endpoint("list_main_ingredient_drug_effect", "/v1/druginfo/main-ingredient/drug-effect", _EDIT_PAGING),
+        Endpoint(
+            "get_main_ingredient_drug_effect_by_id",
+            "/v1/druginfo/main-ingredient/drug-effect/{id}",
+            (Param("effect_id", int, "id", path=True, tool="effectId"),),
+        ),
+        Endpoint("list_main_ingredient_drug_kind", "/v1/druginfo/main-ingredient/drug-kind", _EDIT_PAGING),
+        Endpoint("list_main_ingredient_guide_a4", "/v1/druginfo/main-ingredient/guide-a4", _EDIT_PAGING),
+        Endpoint("list_main_ingredient_guide_a5", "/v1/druginfo/main-ingredient/guide-A5", _EDIT_PAGING),
+        Endpoint(
+            "list_main_ingredient_picto",
+            "/v1/druginfo/main-ingredient/picto",
+            (Param("IsDeleted", str), Param("Title", str)) + _PAGING,
+        ),
+        Endpoint("get_main_ingredient_picto_by_code", "/v1/druginfo/main-ingredient/picto/{code}", _CODE),
+        Endpoint(
+            "list_product_edicode",
+            "/v1/druginfo/product/edicode",
+            (Param("ProductCode", str), Param("EdiCode", str)) + _PAGING,
+        ),
+    )
+}
+
+
+def query_value(param: Param, value: Any) -> Any:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if param.type is int:
+        return int(value)
+    return value
@@ -0,0 +1,313 @@
+import json
+import math
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from src.credentials import TokenPool, use_account
+from src.deadline import Deadline, DeadlineExceededError
+
+from .catalog import check_list_params, get_dataset
+from .client import DrugInfoError, UnauthorizedError
+from .pages import extract_items, extract_total
+
+
+EXPORT_FORMATS = ("ndjson", "parquet")
+
+
+class AdaptiveConcurrency:
+    """AIMD 방식의 동시성 한도. 성공 시 한도를 천천히 늘리고, 실패 시 절반으로 줄입니다."""
+
+    def __init__(self, initial: int = 2, maximum: int = 8) -> None:
+        self.maximum = max(1, int(maximum))
+        self._limit = float(min(max(1, int(initial)), self.maximum))
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self._limit = min(float(self.maximum), self._limit + 1.0 / max(1.0, self._limit))
+
+    def on_failure(self) -> None:
+        with self._lock:
+            self._limit = max(1.0, self._limit / 2.0)
+
+
+class _NdjsonWriter:
+    def __init__(self, path: str, offset: int) -> None:
+        mode = "r+b" if offset and os.path.exists(path) else "wb"
+        self._f = open(path, mode)
+        self._f.seek(offset if mode == "r+b" else 0)
+        self._f.truncate()
+
+    def write_page(self, page: int, items: List[Dict[str, Any]]) -> None:
+        for item in items:
+            self._f.write(json.dumps(item, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+            self._f.write(b"\n")
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def offset(self) -> int:
+        return self._f.tell()
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class _ParquetWriter:
+    """페이지마다 part-NNNNNN.parquet 파일을 하나씩 기록합니다. (pyarrow 필요)"""
+
+    def __init__(self, path: str) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ModuleNotFoundError:
+            raise DrugInfoError("parquet 내보내기에는 pyarrow 가 필요합니다. (pip install pyarrow)")
+        self._pa = pa
+        self._pq = pq
+        self._dir = path
+        os.makedirs(path, exist_ok=True)
+
+    def write_page(self, page: int, items: List[Dict[str, Any]]) -> None:
+        if not items:
+            return
+        final = os.path.join(self._dir, f"part-{page:06d}.parquet")
+        tmp = final + ".tmp"
+        self._pq.write_table(self._pa.Table.from_pylist(items), tmp)
+        os.replace(tmp, final)
+
+    def offset(self) -> int:
+        return 0
+
+    def close(self) -> None:
+        pass
+
+
+def _load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        raise DrugInfoError(f"체크포인트 파일을 읽을 수 없습니다: {path}")
+
+
+def checkpoint_page_size(out_path: str, checkpoint_path: Optional[str] = None) -> Optional[int]:
+    """이어받을 체크포인트가 있으면 그 페이지 크기를 반환합니다. (이어받기는 같은 크기여야 합니다)"""
+    state = _load_checkpoint(checkpoint_path or (out_path.rstrip("/\\") + ".checkpoint.json"))
+    size = (state or {}).get("pageSize")
+    return size if isinstance(size, int) and size > 0 else None
+
+
+def _save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def iter_pages(
+    dataset: str,
+    page_size: int = 500,
+    params: Optional[Dict[str, Any]] = None,
+    start_page: int = 1,
+    total_pages: Optional[int] = None,
+    max_concurrency: int = 8,
+    retries: int = 3,
+    timeout: int = 15,
+    on_unauthorized: Optional[Callable[[Deadline], Any]] = None,
+    limiter: Optional[AdaptiveConcurrency] = None,
+    accounts: Optional[TokenPool] = None,
+) -> Iterator[Tuple[int, List[Dict[str, Any]], Optional[int]]]:
+    """목록 페이지를 병렬로 조회하되 (page, items, totalPages) 를 페이지 순서대로 내보냅니다.
+
+    순서를 맞추기 위해 대기하는 페이지는 동시성 한도의 2배 창(window) 이내로 제한됩니다.
+    accounts 를 주면 페이지마다 계정을 돌아가며 사용하고, on_unauthorized 도 그 계정 문맥에서 호출됩니다.
+    """
+    ds = get_dataset(dataset)
+    page_size = max(1, int(page_size))
+    params = dict(params or {})
+    check_list_params(ds, params)
+    limiter = limiter or AdaptiveConcurrency(initial=2, maximum=max_concurrency)
+    auth_lock = threading.Lock()
+
+    def _fetch(page: int) -> Dict[str, Any]:
+        with use_account(accounts.next_account() if accounts is not None else None):
+            return _fetch_page(page)
+
+    def _fetch_page(page: int) -> Dict[str, Any]:
+        # 페이지 하나(재로그인, 재시도, 대기 포함)가 timeout 예산 하나를 나눠 씁니다.
+        deadline = Deadline(timeout)
+        attempt = 0
+        relogged = False
+        while True:
+            try:
+                return ds.fetch(PageSize=page_size, Page=page, deadline=deadline, **params)
+            except UnauthorizedError:
+                if relogged or on_unauthorized is None:
+                    raise
+                relogged = True
+                with auth_lock:
+                    on_unauthorized(deadline)
+            except DeadlineExceededError:
+                raise
+            except Exception:
+                attempt += 1
+                if attempt > retries:
+                    raise
+                deadline.sleep(min(8.0, 0.5 * (2 ** (attempt - 1))), f"page {page}")
+
+    next_page = max(1, int(start_page))
+    last_page: Optional[int] = total_pages
+    window = limiter.maximum * 2
+    completed: Dict[int, List[Dict[str, Any]]] = {}
+    in_flight: Dict[Future, int] = {}
+    failed: Set[int] = set()
+    failures: Dict[int, int] = {}
+    scheduled = next_page
+    with ThreadPoolExecutor(max_workers=limiter.maximum) as pool:
+        while True:
+            while len(in_flight) < limiter.limit:
+                if failed:
+                    page = min(failed)
+                    failed.discard(page)
+                elif scheduled < next_page + window and (last_page is None or scheduled <= last_page):
+                    page = scheduled
+                    scheduled += 1
+                else:
+                    break
+                in_flight[pool.submit(_fetch, page)] = page
+            if not in_flight:
+                break
+            done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for fut in done:
+                page = in_flight.pop(fut)
+                try:
+                    data = fut.result()
+                except UnauthorizedError:
+                    raise
+                except Exception:
+                    # 재시도까지 실패한 페이지는 동시성을 낮춰 한 번 더 시도하고, 그래도 실패하면 중단합니다.
+                    limiter.on_failure()
+                    failures[page] = failures.get(page, 0) + 1
+                    if failures[page] > 1:
+                        raise
+                    failed.add(page)
+                    continue
+                limiter.on_success()
+                items = extract_items(data)
+                if total_pages is None:
+                    total = extract_total(data)
+                    if total is not None:
+                        total_pages = max(1, math.ceil(total / page_size))
+                        last_page = total_pages if last_page is None else min(last_page, total_pages)
+                if len(items) < page_size:
+                    # 전체 건수를 알면 그것을 믿습니다. 마지막이 아닌 페이지가 짧으면 업스트림이 PageSize 를 줄인 것입니다.
+                    if total_pages is not None and page < total_pages:
+                        raise DrugInfoError(
+                            f"{page} 페이지가 {len(items)}건만 반환되었습니다 (요청 PageSize {page_size}, 전체 {total_pages} 페이지). "
+                            f"업스트림의 최대 PageSize 가 {len(items)} 이하일 수 있으니 --page-size 를 줄이세요."
+                        )
+                    last_page = page if last_page is None else min(last_page, page)
+                completed[page] = items
+            while next_page in completed and (last_page is None or next_page <= last_page):
+                yield next_page, completed.pop(next_page), total_pages
+                next_page += 1
+            for page in [p for p in completed if last_page is not None and p > last_page]:
+                completed.pop(page)
+            failed = {p for p in failed if last_page is None or p <= last_page}
+            if last_page is not None and next_page > last_page and not in_flight:
+                break
+
+    if last_page is None or next_page <= last_page:
+        raise DrugInfoError(f"목록 조회가 {next_page} 페이지에서 중단되었습니다.")
+
+
+def export_dataset(
+    dataset: str,
+    out_path: str,
+    fmt: str = "ndjson",
+    page_size: int = 500,
+    max_concurrency: int = 8,
+    checkpoint_path: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+    retries: int = 3,
+    timeout: int = 15,
+    on_unauthorized: Optional[Callable[[Deadline], Any]] = None,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    accounts: Optional[TokenPool] = None,
+) -> Dict[str, Any]:
+    """카탈로그 데이터셋 전체를 페이지 단위로 병렬 조회하여 NDJSON 또는 parquet 으로 스트리밍 기록합니다.
+
+    완료된 페이지는 순서대로 기록되며, 매 페이지마다 체크포인트를 갱신하므로
+    중단된 내보내기는 마지막으로 완료된 페이지 다음부터 이어서 진행됩니다.
+    """
+    ds = get_dataset(dataset)
+    if fmt not in EXPORT_FORMATS:
+        raise DrugInfoError(f"지원하지 않는 형식: {fmt} (지원: {', '.join(EXPORT_FORMATS)})")
+    page_size = max(1, int(page_size))
+    params = dict(params or {})
+    # 출력 파일을 열기 전에 확인합니다. (iter_pages 는 첫 페이지를 받을 때에야 확인합니다)
+    check_list_params(ds, params)
+    checkpoint_path = checkpoint_path or (out_path.rstrip("/\\") + ".checkpoint.json")
+
+    state = _load_checkpoint(checkpoint_path)
+    if state is not None:
+        if (state.get("dataset"), state.get("format"), state.get("pageSize"), state.get("params")) != (dataset, fmt, page_size, params):
+            raise DrugInfoError("체크포인트의 내보내기 설정이 현재 요청과 다릅니다. 체크포인트를 삭제하거나 설정을 맞추세요.")
+        if state.get("done"):
+            return state
+    else:
+        state = {
+            "dataset": dataset,
+            "format": fmt,
+            "pageSize": page_size,
+            "params": params,
+            "nextPage": 1,
+            "offset": 0,
+            "records": 0,
+            "totalPages": None,
+            "done": False,
+        }
+
+    limiter = AdaptiveConcurrency(initial=2, maximum=max_concurrency)
+    writer = _NdjsonWriter(out_path, int(state["offset"])) if fmt == "ndjson" else _ParquetWriter(out_path)
+    try:
+        for page, items, total_pages in iter_pages(
+            dataset,
+            page_size=page_size,
+            params=params,
+            start_page=int(state["nextPage"]),
+            total_pages=state.get("totalPages"),
+            retries=retries,
+            timeout=timeout,
+            on_unauthorized=on_unauthorized,
+            limiter=limiter,
+            accounts=accounts,
+        ):
+            writer.write_page(page, items)
+            state["records"] = int(state["records"]) + len(items)
+            state["nextPage"] = page + 1
+            state["offset"] = writer.offset()
+            state["totalPages"] = total_pages
+            _save_checkpoint(checkpoint_path, state)
+            if progress is not None:
+                progress(dict(state, concurrency=limiter.limit))
+    finally:
+        writer.close()
+
+    state["totalPages"] = state.get("totalPages") or int(state["nextPage"]) - 1
+    expected = (int(state["totalPages"]) - 1) * page_size
+    if int(state["records"]) < expected:
+        raise DrugInfoError(
+            f"내보낸 레코드 수({state['records']})가 {state['totalPages']} 페이지 x PageSize {page_size} 에 못 미칩니다. "
+            "체크포인트를 완료로 표시하지 않았습니다."
+        )
+    state["done"] = True
+    _save_checkpoint(checkpoint_path, state)
+    return state
@@ -0,0 +1,277 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .catalog import CatalogDataset, exact_key
+from .client import DrugInfoError
+
+
+MAGIC = b"EDBPACK\x00"
+FORMAT_VERSION = 1
+# magic, format version, flags, meta 길이, 레코드 수, 키 수, data/index/keys/key_offsets/key_rows/meta 위치
+_HEADER = struct.Struct("<8sHHIQQQQQQQQ")
+_HEADER_SIZE = 128
+
+
+def _align(f: Any, size: int = 8) -> int:
+    pos = f.tell()
+    pad = -pos % size
+    if pad:
+        f.write(b"\0" * pad)
+    return pos + pad
+
+
+def _write_array(f: Any, values: array) -> int:
+    offset = _align(f)
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    values.tofile(f)
+    return offset
+
+
+def _fsync_dir(path: str) -> None:
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_pack(
+    path: str,
+    records: Iterable[Dict[str, Any]],
+    dataset: str,
+    key: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None,
+    meta: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """레코드를 읽기 전용 팩 파일로 씁니다. 임시 파일에 다 쓴 뒤 os.replace 로 한 번에 바꿉니다.
+
+    형식: 헤더(128바이트) | 레코드 JSON(UTF-8) 연속 | 레코드 오프셋(u64, 레코드 수+1)
+          | 키 문자열 연속(정렬) | 키 오프셋(u64, 키 수+1) | 키별 행 번호(u32) | 메타데이터 JSON
+    key 를 주면 키 -> 행 번호 정렬 색인을 함께 만듭니다. 키는 소문자로 저장하고, 같은 키의 행은 모두 색인합니다.
+    """
+    tmp = f"{path}.tmp-{os.getpid()}"
+    offsets = array("Q", [0])
+    keys: List[Tuple[bytes, int]] = []
+    count = 0
+    with open(tmp, "wb") as f:
+        f.write(b"\0" * _HEADER_SIZE)
+        data_offset = _HEADER_SIZE
+        for record in records:
+            raw = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            f.write(raw)
+            offsets.append(offsets[-1] + len(raw))
+            if key is not None:
+                k = key(record)
+                if k is not None:
+                    keys.append((k.lower().encode("utf-8"), count))
+            count += 1
+        index_offset = _write_array(f, offsets)
+        keys.sort()
+        keys_offset = f.tell()
+        key_offsets = array("Q", [0])
+        for k, _row in keys:
+            f.write(k)
+            key_offsets.append(key_offsets[-1] + len(k))
+        key_offsets_offset = _write_array(f, key_offsets)
+        key_rows_offset = _write_array(f, array("I", (row for _k, row in keys)))
+        info = dict(meta or {})
+        info.update(
+            {
+                "format": FORMAT_VERSION,
+                "dataset": dataset,
+                "count": count,
+                "keys": len(keys),
+                "generation": time.time_ns(),
+                "createdAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            }
+        )
+        raw_meta = json.dumps(info, ensure_ascii=False).encode("utf-8")
+        meta_offset = f.tell()
+        f.write(raw_meta)
+        f.seek(0)
+        f.write(
+            _HEADER.pack(
+                MAGIC, FORMAT_VERSION, 0, len(raw_meta), count, len(keys), data_offset,
+                index_offset, keys_offset, key_offsets_offset, key_rows_offset, meta_offset,
+            )
+        )
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(path)
+    return info
+
+
+def write_catalog_pack(
+    path: str,
+    records: Iterable[Dict[str, Any]],
+    dataset: CatalogDataset,
+    meta: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """카탈로그 데이터셋의 팩을 씁니다. 키 색인은 exact_key 로 만들고 keyIndex=exact 로 표시하므로
+    로컬 조회 엔진이 키 필드의 정확 일치 필터를 이 색인으로 처리합니다."""
+    info = dict(meta or {})
+    info.update({"keyFields": list(dataset.key_fields), "keyIndex": "exact"})
+    return write_pack(path, records, dataset.name, key=lambda record: exact_key(dataset, record), meta=info)
+
+
+class MappedPack:
+    """mmap 으로 연 팩 파일. 오프셋 색인은 파일 페이지를 그대로 보고(memoryview), 레코드는 요청한 것만 디코딩합니다.
+
+    같은 파일을 연 프로세스들은 OS 페이지 캐시를 공유하므로 프로세스 수만큼 카탈로그가 복사되지 않습니다.
+    파일은 바뀌지 않으며, 새 팩은 다른 inode 로 교체되므로 열어 둔 팩은 닫을 때까지 그대로 읽힙니다.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if st.st_size < _HEADER_SIZE:
+                raise DrugInfoError(f"팩 파일이 아닙니다: {path}")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.identity = (st.st_dev, st.st_ino)
+        (
+            magic, version, _flags, meta_len, self._count, key_count, data_offset,
+            index_offset, keys_offset, key_offsets_offset, key_rows_offset, meta_offset,
+        ) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise DrugInfoError(f"팩 파일이 아닙니다: {path}")
+        if version != FORMAT_VERSION:
+            self._mm.close()
+            raise DrugInfoError(f"지원하지 않는 팩 형식 버전입니다: {version} (지원: {FORMAT_VERSION})")
+        if meta_offset + meta_len > st.st_size:
+            self._mm.close()
+            raise DrugInfoError(f"팩 파일이 잘렸습니다: {path}")
+        self._data_offset = data_offset
+        self._view = memoryview(self._mm)
+        self._offsets = self._array(index_offset, "Q", self._count + 1)
+        self._key_blob = keys_offset
+        self._key_offsets = self._array(key_offsets_offset, "Q", key_count + 1)
+        self._key_rows = self._array(key_rows_offset, "I", key_count)
+        self.meta: Dict[str, Any] = json.loads(self._mm[meta_offset : meta_offset + meta_len].decode("utf-8"))
+
+    def _array(self, offset: int, typecode: str, length: int) -> Any:
+        size = array(typecode).itemsize
+        view = self._view[offset : offset + size * length]
+        if sys.byteorder == "little":
+            return view.cast(typecode)
+        values = array(typecode, bytes(view))
+        values.byteswap()
+        return values
+
+    @property
+    def dataset(self) -> str:
+        return str(self.meta.get("dataset", ""))
+
+    @property
+    def generation(self) -> int:
+        return int(self.meta.get("generation", 0))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def raw(self, row: int) -> bytes:
+        if row < 0:
+            row += self._count
+        if not 0 <= row < self._count:
+            raise IndexError(row)
+        base = self._data_offset
+        return self._mm[base + self._offsets[row] : base + self._offsets[row + 1]]
+
+    def row(self, row: int) -> Dict[str, Any]:
+        return json.loads(self.raw(row))
+
+    def get(self, row: int, field: str, default: Any = None) -> Any:
+        return self.row(row).get(field, default)
+
+    def rows(self, start: int = 0, end: Optional[int] = None) -> List[Dict[str, Any]]:
+        start, end, _ = slice(start, end).indices(self._count)
+        return [self.row(i) for i in range(start, end)]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self._count):
+            yield self.row(i)
+
+    @property
+    def key_fields(self) -> Tuple[str, ...]:
+        return tuple(self.meta.get("keyFields") or ())
+
+    def _key(self, i: int) -> bytes:
+        offsets = self._key_offsets
+        return self._mm[self._key_blob + offsets[i] : self._key_blob + offsets[i + 1]]
+
+    def find_all(self, key: str) -> List[int]:
+        """키 색인에서 이진 탐색으로 키(대소문자 무시)가 같은 행 번호를 모두 찾습니다."""
+        target = key.lower().encode("utf-8")
+        lo, hi = 0, len(self._key_rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        rows = []
+        while lo < len(self._key_rows) and self._key(lo) == target:
+            rows.append(int(self._key_rows[lo]))
+            lo += 1
+        return rows
+
+    def find(self, key: str) -> Optional[int]:
+        rows = self.find_all(key)
+        return rows[0] if rows else None
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        row = self.find(key)
+        return self.row(row) if row is not None else None
+
+    def close(self) -> None:
+        for name in ("_offsets", "_key_offsets", "_key_rows"):
+            value = getattr(self, name)
+            if isinstance(value, memoryview):
+                value.release()
+        self._view.release()
+        self._mm.close()
+
+
+_PACKS: Dict[str, MappedPack] = {}
+_PACKS_LOCK = threading.Lock()
+
+
+def _identity(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_dev, st.st_ino
+
+
+def open_pack(path: str) -> MappedPack:
+    """경로의 팩을 엽니다. 이미 연 팩은 재사용하고, 파일이 새 팩으로 교체(inode 변경)되었으면 다시 엽니다.
+
+    이전 팩은 닫지 않고 참조만 놓으므로, 그 팩을 쓰던 조회는 끝까지 이전 내용으로 응답합니다.
+    """
+    key = os.path.abspath(path)
+    try:
+        identity = _identity(key)
+    except OSError:
+        raise DrugInfoError(f"팩 파일이 없습니다: {path}")
+    pack = _PACKS.get(key)
+    if pack is not None and pack.identity == identity:
+        return pack
+    with _PACKS_LOCK:
+        pack = _PACKS.get(key)
+        if pack is None or pack.identity != identity:
+            pack = MappedPack(key)
+            _PACKS[key] = pack
+        return pack
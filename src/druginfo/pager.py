@@ -0,0 +1,214 @@
+import json
+import math
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.deadline import Deadline
+from src.settings import cache_path
+
+from .catalog import check_list_params, get_dataset
+from .client import UnauthorizedError, last_response_bytes
+from .pages import extract_items, extract_total
+
+
+# 각 단계가 이전 단계의 2배이므로, 큰 단계의 배수인 offset 은 작은 단계의 배수이기도 합니다.
+PAGE_SIZE_LADDER = (25, 50, 100, 200, 400, 800, 1600, 3200)
+DEFAULT_PAGE_SIZE = 200
+
+
+def pager_state_path() -> str:
+    path = os.getenv("EDB_PAGER_STATE")
+    if path:
+        return path
+    return cache_path("pager.json")
+
+
+def _load_state(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def state_key(dataset: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """상태 파일의 항목 이름. 조회 조건이 있으면 조건별로 따로 기록합니다."""
+    if not params:
+        return dataset
+    return dataset + "?" + json.dumps(params, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+def tuned_page_size(
+    dataset: str,
+    default: int = DEFAULT_PAGE_SIZE,
+    state_path: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+) -> int:
+    """이전 실행에서 조정된 페이지 크기를 반환합니다. 같은 조건의 기록이 없으면 조건 없는 기록, 그것도 없으면 default."""
+    state = _load_state(state_path or pager_state_path())
+    entry = state.get(state_key(dataset, params)) or state.get(dataset) or {}
+    size = entry.get("pageSize")
+    return int(size) if isinstance(size, int) and size > 0 else int(default)
+
+
+class AdaptivePager:
+    """페이지별 지연 시간과 바이트를 측정해 지연 상한 안에서 초당 레코드 수가 가장 높은 페이지 크기로 수렴합니다.
+
+    페이지 크기는 PAGE_SIZE_LADDER 안에서만 바뀌고, 현재 offset 이 새 크기의 배수일 때만 키우므로
+    Page 번호(offset // size + 1)가 항상 정확합니다. 조정된 값은 데이터셋과 조회 조건별로 상태 파일에 저장됩니다.
+    """
+
+    def __init__(
+        self,
+        dataset: str,
+        params: Optional[Dict[str, Any]] = None,
+        latency_ceiling: float = 5.0,
+        min_size: int = PAGE_SIZE_LADDER[0],
+        max_size: int = PAGE_SIZE_LADDER[-1],
+        state_path: Optional[str] = None,
+        alpha: float = 0.5,
+    ) -> None:
+        self.dataset = get_dataset(dataset)
+        self.params = dict(params or {})
+        check_list_params(self.dataset, self.params)
+        self.latency_ceiling = float(latency_ceiling)
+        self.ladder = [s for s in PAGE_SIZE_LADDER if min_size <= s <= max_size] or [DEFAULT_PAGE_SIZE]
+        self.state_path = state_path or pager_state_path()
+        self.alpha = float(alpha)
+        remembered = tuned_page_size(dataset, DEFAULT_PAGE_SIZE, self.state_path, self.params)
+        self._index = min(range(len(self.ladder)), key=lambda i: abs(self.ladder[i] - remembered))
+        self._rps: Dict[int, float] = {}
+        self._latency: Dict[int, float] = {}
+        self._bytes: Dict[int, float] = {}
+
+    @property
+    def page_size(self) -> int:
+        return self.ladder[self._index]
+
+    def _observe(self, size: int, records: int, seconds: float, nbytes: int) -> None:
+        rps = records / max(seconds, 1e-6)
+        for table, value in ((self._rps, rps), (self._latency, seconds), (self._bytes, float(nbytes))):
+            prev = table.get(size)
+            table[size] = value if prev is None else (1 - self.alpha) * prev + self.alpha * value
+        # 지연 상한을 넘는 크기는 처리량과 무관하게 후보에서 제외합니다.
+        if self._latency[size] > self.latency_ceiling:
+            self._rps[size] = 0.0
+
+    def _next_index(self, offset: int) -> int:
+        i = self._index
+        cur = self.ladder[i]
+        if self._latency.get(cur, 0.0) > self.latency_ceiling and i > 0:
+            # 사다리에 업스트림 상한(예: 1000)이 섞이면 바로 아래 크기가 offset 을 나누지 않을 수 있으므로
+            # offset 을 나누는 더 작은 크기 중 가장 큰 것으로 내립니다.
+            for j in range(i - 1, -1, -1):
+                if offset % self.ladder[j] == 0:
+                    return j
+            return i
+        if i + 1 < len(self.ladder):
+            up = self.ladder[i + 1]
+            # 지연이 크기에 대략 비례한다고 보고, 두 배로 키워도 상한 안일 때만 시도합니다.
+            fits = self._latency.get(cur, 0.0) * 2 <= self.latency_ceiling
+            better = up not in self._rps or self._rps[up] > self._rps.get(cur, 0.0)
+            if fits and better and offset % up == 0:
+                return i + 1
+        if i > 0:
+            down = self.ladder[i - 1]
+            if down in self._rps and self._rps[down] > self._rps.get(cur, 0.0) and offset % down == 0:
+                return i - 1
+        return i
+
+    def _clamp(self, cap: int, offset: int) -> None:
+        """업스트림이 cap 건까지만 주는 것으로 보고 사다리를 cap 이하로 줄인 뒤, offset 을 나누는 가장 큰 크기를 고릅니다."""
+        ladder = sorted({s for s in self.ladder if s <= cap} | {cap})
+        fits = [i for i, s in enumerate(ladder) if offset % s == 0]
+        if not fits:
+            ladder = sorted(set(ladder) | {math.gcd(offset, cap)})
+            fits = [i for i, s in enumerate(ladder) if offset % s == 0]
+        self.ladder = ladder
+        self._index = fits[-1]
+
+    def best_page_size(self) -> int:
+        if not self._rps:
+            return self.page_size
+        return max(self._rps, key=lambda s: self._rps[s])
+
+    def save(self) -> None:
+        """측정한 사다리 크기 중 가장 빠른 것을 저장합니다. 업스트림에 맞춰 줄인 크기(짧은 결과 등)는 저장하지 않습니다."""
+        measured = [s for s in self._rps if s in PAGE_SIZE_LADDER]
+        if not measured:
+            return
+        best = max(measured, key=lambda s: self._rps[s])
+        state = _load_state(self.state_path)
+        state[state_key(self.dataset.name, self.params)] = {
+            "pageSize": best,
+            "recordsPerSecond": round(self._rps.get(best, 0.0), 2),
+            "latency": round(self._latency.get(best, 0.0), 4),
+            "bytesPerPage": int(self._bytes.get(best, 0.0)),
+            "updatedAt": int(time.time()),
+        }
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.state_path)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            str(size): {
+                "recordsPerSecond": round(self._rps[size], 2),
+                "latency": round(self._latency.get(size, 0.0), 4),
+                "bytesPerPage": int(self._bytes.get(size, 0.0)),
+            }
+            for size in sorted(self._rps)
+        }
+
+    def walk(
+        self,
+        timeout: int = 15,
+        max_pages: int = 0,
+        on_unauthorized: Optional[Callable[[Deadline], Any]] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """데이터셋을 처음부터 순서대로 조회하며 페이지마다 레코드 배열을 내보냅니다. 끝나면 조정 값을 저장합니다."""
+        params = self.params
+        offset = 0
+        pages = 0
+        total: Optional[int] = None
+        # 실제로 꽉 찬 페이지가 돌아온 가장 큰 크기. 이 크기 이하의 짧은 페이지만 마지막 페이지로 믿습니다.
+        max_full = 0
+        while True:
+            size = self.page_size
+            deadline = Deadline(timeout)
+            started = time.monotonic()
+            try:
+                data = self.dataset.fetch(PageSize=size, Page=offset // size + 1, deadline=deadline, **params)
+            except UnauthorizedError:
+                if on_unauthorized is None:
+                    raise
+                on_unauthorized(deadline)
+                data = self.dataset.fetch(PageSize=size, Page=offset // size + 1, deadline=deadline, **params)
+            elapsed = time.monotonic() - started
+            items = extract_items(data)
+            if total is None:
+                total = extract_total(data)
+            if len(items) == size:
+                max_full = max(max_full, size)
+                self._observe(size, len(items), elapsed, last_response_bytes())
+            elif items and size > max_full and (total is None or offset + len(items) < total):
+                # 업스트림이 PageSize 를 줄였을 수 있습니다. 그 경우 응답은 (Page-1)*cap 부터이므로
+                # offset 0 이 아니면 버리고, 줄인 크기로 같은 offset 을 다시 조회합니다.
+                self._clamp(len(items), offset if offset else len(items))
+                if offset:
+                    continue
+            yield items
+            offset += len(items)
+            pages += 1
+            if not items or (max_pages and pages >= max_pages):
+                break
+            if total is not None and offset >= total:
+                break
+            if total is None and len(items) < size and size <= max_full:
+                break
+            self._index = self._next_index(offset)
+        self.save()
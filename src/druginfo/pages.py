@@ -0,0 +1,78 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+
+_ITEM_KEYS = ("items", "list", "rows", "content", "records", "data", "result")
+_TOTAL_KEYS = ("totalCount", "total_count", "totalRecords", "total")
+# 일부 엔드포인트는 count 를 현재 페이지의 건수로 씁니다. 페이지 건수보다 클 때만 전체 건수로 봅니다.
+_PAGE_COUNT_KEY = "count"
+
+
+def _as_int(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+def extract_items(data: Any) -> List[Dict[str, Any]]:
+    """목록 응답에서 레코드 배열을 찾아 반환합니다. (없으면 빈 배열)"""
+    if isinstance(data, list):
+        return [x for x in data if isinstance(x, dict)]
+    if isinstance(data, dict):
+        for key in _ITEM_KEYS:
+            if key in data:
+                value = data[key]
+                if isinstance(value, list):
+                    return [x for x in value if isinstance(x, dict)]
+                if isinstance(value, dict):
+                    found = extract_items(value)
+                    if found:
+                        return found
+    return []
+
+
+def items_path(data: Any) -> Optional[Tuple[str, ...]]:
+    """extract_items 가 레코드 배열을 찾은 위치(키 경로)를 반환합니다. 응답 자체가 배열이면 빈 튜플."""
+    if isinstance(data, list):
+        return ()
+    if isinstance(data, dict):
+        for key in _ITEM_KEYS:
+            if key in data:
+                value = data[key]
+                if isinstance(value, list):
+                    return (key,)
+                if isinstance(value, dict):
+                    found = items_path(value)
+                    if found is not None:
+                        return (key,) + found
+    return None
+
+
+def replace_items(data: Any, path: Tuple[str, ...], items: List[Dict[str, Any]]) -> Any:
+    """path 위치의 레코드 배열만 items 로 바꾼 얕은 복사본을 반환합니다."""
+    if not path:
+        return items
+    copied = dict(data)
+    copied[path[0]] = replace_items(data[path[0]], path[1:], items)
+    return copied
+
+
+def extract_total(data: Any) -> Optional[int]:
+    """목록 응답에서 전체 건수를 찾아 반환합니다. (없으면 None)"""
+    if isinstance(data, dict):
+        for key in _TOTAL_KEYS:
+            value = _as_int(data.get(key))
+            if value is not None:
+                return value
+        count = _as_int(data.get(_PAGE_COUNT_KEY))
+        if count is not None and count > len(extract_items(data)):
+            return count
+        for key in ("data", "result", "payload", "response"):
+            if isinstance(data.get(key), dict):
+                found = extract_total(data[key])
+                if found is not None:
+                    return found
+    return None
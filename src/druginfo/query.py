@@ -0,0 +1,295 @@
+import json
+import os
+import threading
+from array import array
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .client import DrugInfoError
+from .pack import MappedPack, open_pack
+from .records import RecordTable
+
+
+class QuerySpec(NamedTuple):
+    # 불리언 필터: 파라미터명 -> 레코드 필드명. X=true 는 필드가 참인 레코드, XOff=true 는 거짓인 레코드만 남깁니다.
+    flags: Dict[str, str]
+    # 정확히 일치(대소문자 무시)하는 코드/분류 필터: 파라미터명 -> 필드명
+    exact: Dict[str, str]
+    # 부분 일치(대소문자 무시) 문자열 필터: 파라미터명 -> 필드명
+    contains: Dict[str, str]
+    # 최소값 필터: 파라미터명 -> 필드명
+    minimum: Dict[str, str]
+    # 레거시 q 파라미터가 대응하는 파라미터
+    q_param: str
+    # 플래그 중 XOff 짝이 없는 것
+    on_only: Tuple[str, ...] = ()
+
+
+QUERY_SPECS: Dict[str, QuerySpec] = {
+    "main_ingredient": QuerySpec(
+        flags={"a4": "a4", "a5": "a5", "drugkind": "drugkind", "effect": "effect", "showMapped": "showMapped"},
+        exact={"IngredientCode": "ingredientCode", "drugKind": "drugKind"},
+        contains={"ingredientNameKor": "ingredientNameKor"},
+        minimum={},
+        q_param="ingredientNameKor",
+        on_only=("showMapped",),
+    ),
+    "product": QuerySpec(
+        flags={
+            "crop": "crop",
+            "base64": "base64",
+            "watermark": "watermark",
+            "confirm": "confirm",
+            "teoulLengthShort": "teoulLengthShort",
+            "teoulLengthLong": "teoulLengthLong",
+        },
+        exact={"ProductCode": "productCode"},
+        contains={"pillName": "pillName", "vendor": "vendor"},
+        minimum={"minCount": "count"},
+        q_param="pillName",
+    ),
+}
+
+DEFAULT_PAGE_SIZE = 20
+
+
+def _truthy(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() not in ("", "false", "0", "n", "no")
+    return bool(value)
+
+
+def _sort_value(value: Any) -> Tuple[int, Any]:
+    if value is None or value == "":
+        return (2, "")
+    if isinstance(value, (int, float)):
+        return (0, float(value))
+    return (1, str(value))
+
+
+def iter_bits(mask: int, size: int) -> Iterator[int]:
+    """비트마스크에서 켜진 위치를 오름차순으로 돌려줍니다."""
+    data = mask.to_bytes((size + 7) // 8 or 1, "little")
+    for bi, byte in enumerate(data):
+        if byte:
+            base = bi * 8
+            for j in range(8):
+                if (byte >> j) & 1:
+                    yield base + j
+
+
+def _bits_from(positions: Iterable[int], size: int) -> int:
+    buf = bytearray((size + 7) // 8 or 1)
+    for i in positions:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bytes(buf), "little")
+
+
+def _parse_sort(sort_by: Optional[str]) -> Optional[Tuple[str, bool]]:
+    if not sort_by:
+        return None
+    text = sort_by.strip()
+    if text.startswith("-"):
+        return text[1:].strip(), True
+    parts = text.split()
+    if len(parts) == 2 and parts[1].lower() in ("asc", "desc"):
+        return parts[0], parts[1].lower() == "desc"
+    return text, False
+
+
+class QueryEngine:
+    """미러링된 카탈로그 레코드에 대한 로컬 조회 엔진.
+
+    불리언 플래그와 정확 일치 필드는 비트맵(int) 인덱스로, SortBy 키는 지연 생성되는 정렬 인덱스로 처리합니다.
+    records 가 MappedPack 이면 필터에 쓰는 필드만 메모리에 열로 두고, 응답 레코드는 팩에서 읽습니다.
+    """
+
+    def __init__(self, dataset: str, records: Union[RecordTable, MappedPack, Iterable[Dict[str, Any]]]) -> None:
+        if dataset not in QUERY_SPECS:
+            raise DrugInfoError(f"로컬 조회를 지원하지 않는 데이터셋: {dataset}")
+        self.dataset = dataset
+        self.spec = QUERY_SPECS[dataset]
+        self._records: Union[RecordTable, MappedPack]
+        self._projection: Optional[FrozenSet[str]] = None
+        # 팩의 키 색인으로 처리하는 정확 일치 필드 (팩의 키가 그 필드 하나일 때)
+        self._key_field: Optional[str] = None
+        if isinstance(records, MappedPack):
+            spec = self.spec
+            # 예전 팩은 키 색인에 id/code 대체 키가 섞여 있을 수 있으므로 정확한 필드 값으로 만든 색인만 씁니다.
+            exact_index = records.meta.get("keyIndex") == "exact"
+            if exact_index and len(records.key_fields) == 1 and records.key_fields[0] in spec.exact.values():
+                self._key_field = records.key_fields[0]
+            self._projection = frozenset(
+                list(spec.flags.values()) + list(spec.exact.values()) + list(spec.contains.values()) + list(spec.minimum.values())
+            ) - {self._key_field}
+            self._records = records
+            self._columns = RecordTable.from_records(
+                {k: v for k, v in record.items() if k in self._projection} for record in records
+            )
+        else:
+            self._records = records if isinstance(records, RecordTable) else RecordTable.from_records(records)
+            self._columns = self._records
+        self._size = len(self._records)
+        self._all = (1 << self._size) - 1
+        self._flag_bits: Dict[str, int] = {}
+        self._exact_bits: Dict[str, Dict[str, Union[int, array]]] = {}
+        self._sorted: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+        self._build()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def record(self, row: int) -> Dict[str, Any]:
+        return self._records.row(row)
+
+    def _field(self, row: int, name: str) -> Any:
+        if self._projection is None or name in self._projection:
+            return self._columns.get(row, name)
+        return self._records.get(row, name)
+
+    def _build(self) -> None:
+        for field in set(self.spec.flags.values()):
+            self._flag_bits[field] = _bits_from(
+                (i for i in range(self._size) if _truthy(self._field(i, field))), self._size
+            )
+        for field in set(self.spec.exact.values()) - {self._key_field}:
+            groups: Dict[str, List[int]] = {}
+            for i in range(self._size):
+                value = self._field(i, field)
+                if value is not None:
+                    groups.setdefault(str(value).lower(), []).append(i)
+            # 행이 적은 값(고유 코드 등)은 비트맵 대신 행 번호 배열로 두고 조회할 때 비트맵으로 만듭니다.
+            self._exact_bits[field] = {
+                k: array("I", v) if len(v) * 32 < self._size else _bits_from(v, self._size) for k, v in groups.items()
+            }
+
+    def _sorted_rows(self, field: str) -> List[int]:
+        rows = self._sorted.get(field)
+        if rows is None:
+            with self._lock:
+                rows = self._sorted.get(field)
+                if rows is None:
+                    rows = sorted(range(self._size), key=lambda i: _sort_value(self._field(i, field)))
+                    self._sorted[field] = rows
+        return rows
+
+    def _filter(self, params: Dict[str, Any]) -> Tuple[int, List[Tuple[str, str]]]:
+        mask = self._all
+        for name, field in self.spec.flags.items():
+            if params.get(name) is True:
+                mask &= self._flag_bits[field]
+            if name not in self.spec.on_only and params.get(name + "Off") is True:
+                mask &= ~self._flag_bits[field]
+        for name, field in self.spec.exact.items():
+            value = params.get(name)
+            if value is not None and value != "":
+                if field == self._key_field and isinstance(self._records, MappedPack):
+                    mask &= _bits_from(self._records.find_all(str(value)), self._size)
+                    continue
+                bits = self._exact_bits[field].get(str(value).lower(), 0)
+                mask &= bits if isinstance(bits, int) else _bits_from(bits, self._size)
+        scans = [
+            (field, str(params[name]).lower())
+            for name, field in self.spec.contains.items()
+            if params.get(name) is not None and params.get(name) != ""
+        ]
+        return mask & self._all, scans
+
+    def _row_matches(self, row: int, scans: List[Tuple[str, str]], minimums: List[Tuple[str, float]]) -> bool:
+        for field, needle in scans:
+            value = self._field(row, field)
+            if value is None or needle not in str(value).lower():
+                return False
+        for field, threshold in minimums:
+            value = self._field(row, field)
+            if not isinstance(value, (int, float)) or value < threshold:
+                return False
+        return True
+
+    def query(self, **params: Any) -> Dict[str, Any]:
+        """기존 도구와 같은 파라미터(레거시 q/page/size 포함)로 필터/정렬/페이지를 처리합니다."""
+        if params.get("q") is not None and params.get(self.spec.q_param) is None:
+            params[self.spec.q_param] = params["q"]
+        page = int(params.get("Page") or params.get("page") or 1)
+        page_size = int(params.get("PageSize") or params.get("size") or DEFAULT_PAGE_SIZE)
+        if page < 1 or page_size < 1:
+            raise DrugInfoError("Page/PageSize 는 1 이상이어야 합니다")
+        mask, scans = self._filter(params)
+        minimums = [
+            (field, float(params[name]))
+            for name, field in self.spec.minimum.items()
+            if params.get(name) is not None
+        ]
+        sort = _parse_sort(params.get("SortBy"))
+        bitmap = mask.to_bytes((self._size + 7) // 8 or 1, "little")
+
+        if sort is None:
+            candidates: Iterable[int] = iter_bits(mask, self._size)
+        else:
+            field, desc = sort
+            rows = self._sorted_rows(field)
+            candidates = (
+                i for i in (reversed(rows) if desc else rows) if (bitmap[i >> 3] >> (i & 7)) & 1
+            )
+
+        start = (page - 1) * page_size
+        items: List[Dict[str, Any]] = []
+        if not scans and not minimums:
+            # 비트맵만으로 건수가 정해지므로 요청한 페이지를 채우면 바로 멈춥니다.
+            total = bin(mask).count("1")
+            for n, row in enumerate(candidates):
+                if n >= start + page_size:
+                    break
+                if n >= start:
+                    items.append(self.record(row))
+        else:
+            total = 0
+            for row in candidates:
+                if not self._row_matches(row, scans, minimums):
+                    continue
+                if start <= total < start + page_size:
+                    items.append(self.record(row))
+                total += 1
+        return {"items": items, "totalCount": total, "page": page, "pageSize": page_size}
+
+
+def iter_ndjson(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def load_ndjson(path: str) -> List[Dict[str, Any]]:
+    return list(iter_ndjson(path))
+
+
+_ENGINES: Dict[str, Tuple[Tuple[int, int, int], QueryEngine]] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def get_engine(dataset: str) -> QueryEngine:
+    """EDB_MIRROR_DIR 의 <dataset>.pack (없으면 <dataset>.ndjson) 미러로 엔진을 만들고, 파일이 바뀌면 다시 읽습니다."""
+    mirror_dir = os.getenv("EDB_MIRROR_DIR")
+    if not mirror_dir:
+        raise DrugInfoError("EDB_MIRROR_DIR 환경변수가 필요합니다 (druginfo_cli export 결과 디렉토리)")
+    pack_path = os.path.join(mirror_dir, f"{dataset}.pack")
+    path = pack_path if os.path.exists(pack_path) else os.path.join(mirror_dir, f"{dataset}.ndjson")
+    try:
+        st = os.stat(path)
+    except OSError:
+        raise DrugInfoError(f"미러 파일이 없습니다: {path}")
+    # 팩은 교체 시 inode 가 바뀌고, NDJSON 은 제자리에서 고쳐 쓸 수 있으므로 mtime 도 봅니다.
+    version = (st.st_ino, st.st_mtime_ns, st.st_size)
+    with _ENGINES_LOCK:
+        cached = _ENGINES.get(dataset)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        if path == pack_path:
+            engine = QueryEngine(dataset, open_pack(path))
+        else:
+            # 한 줄씩 읽어 바로 열 저장으로 옮기므로 dict 목록 전체가 메모리에 올라가지 않습니다.
+            engine = QueryEngine(dataset, RecordTable.from_records(iter_ndjson(path)))
+        _ENGINES[dataset] = (version, engine)
+        return engine
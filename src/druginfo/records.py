@@ -0,0 +1,178 @@
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .pages import extract_items, items_path, replace_items
+
+
+# 열(column) 저장 형식
+_BOOL, _INT, _FLOAT, _OBJ = 0, 1, 2, 3
+_INT_MIN, _INT_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def _dedupe(value: Any, memo: Dict[str, str]) -> Any:
+    """같은 내용의 문자열을 하나의 객체로 합칩니다. (중첩 list/dict 의 키와 값 포함)"""
+    if isinstance(value, str):
+        return memo.setdefault(value, value)
+    if isinstance(value, list):
+        return [_dedupe(v, memo) for v in value]
+    if isinstance(value, dict):
+        return {memo.setdefault(k, k) if isinstance(k, str) else k: _dedupe(v, memo) for k, v in value.items()}
+    return value
+
+
+def _column_kind(values: List[Any], present: List[bool]) -> int:
+    kind: Optional[int] = None
+    for value, here in zip(values, present):
+        if not here:
+            continue
+        if isinstance(value, bool):
+            k = _BOOL
+        elif isinstance(value, int) and _INT_MIN <= value <= _INT_MAX:
+            k = _INT
+        elif isinstance(value, float):
+            k = _FLOAT
+        else:
+            return _OBJ
+        if kind is None:
+            kind = k
+        elif kind != k:
+            return _OBJ
+    return _OBJ if kind is None else kind
+
+
+class RecordTable:
+    """레코드 목록을 열 단위로 보관하는 읽기 전용 테이블.
+
+    필드 이름은 테이블에 한 번만 두고, 불리언/정수/실수 열은 bytearray/array 로, 나머지는 중복 제거된
+    값의 list 로 저장합니다. 레코드별 키 구성과 순서는 shape 로 기억하므로 row() 는 원래와 같은 dict 를 돌려줍니다.
+    """
+
+    __slots__ = ("_fields", "_index", "_kinds", "_columns", "_shapes", "_shape_masks", "_row_shapes", "_size")
+
+    def __init__(self) -> None:
+        self._fields: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._kinds: List[int] = []
+        self._columns: List[Any] = []
+        self._shapes: List[Tuple[int, ...]] = []
+        self._shape_masks: List[int] = []
+        self._row_shapes = array("I")
+        self._size = 0
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "RecordTable":
+        table = cls()
+        memo: Dict[str, str] = {}
+        shape_ids: Dict[Tuple[int, ...], int] = {}
+        values: List[List[Any]] = []
+        present: List[List[bool]] = []
+        for record in records:
+            shape = []
+            for key, value in record.items():
+                col = table._index.get(key)
+                if col is None:
+                    col = len(table._fields)
+                    table._index[key] = col
+                    table._fields.append(memo.setdefault(key, key))
+                    values.append([None] * table._size)
+                    present.append([False] * table._size)
+                values[col].append(_dedupe(value, memo))
+                present[col].append(True)
+                shape.append(col)
+            for col in range(len(table._fields)):
+                if len(values[col]) == table._size:
+                    values[col].append(None)
+                    present[col].append(False)
+            key_shape = tuple(shape)
+            sid = shape_ids.get(key_shape)
+            if sid is None:
+                sid = shape_ids[key_shape] = len(table._shapes)
+                table._shapes.append(key_shape)
+                mask = 0
+                for col in key_shape:
+                    mask |= 1 << col
+                table._shape_masks.append(mask)
+            table._row_shapes.append(sid)
+            table._size += 1
+        for col in range(len(table._fields)):
+            kind = _column_kind(values[col], present[col])
+            table._kinds.append(kind)
+            if kind == _BOOL:
+                table._columns.append(bytearray(1 if v else 0 for v in values[col]))
+            elif kind == _INT:
+                table._columns.append(array("q", (v if here else 0 for v, here in zip(values[col], present[col]))))
+            elif kind == _FLOAT:
+                table._columns.append(array("d", (v if here else 0.0 for v, here in zip(values[col], present[col]))))
+            else:
+                table._columns.append(values[col])
+        return table
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self._fields)
+
+    def _value(self, col: int, row: int) -> Any:
+        value = self._columns[col][row]
+        return bool(value) if self._kinds[col] == _BOOL else value
+
+    def get(self, row: int, field: str, default: Any = None) -> Any:
+        col = self._index.get(field)
+        if col is None or not (self._shape_masks[self._row_shapes[row]] >> col) & 1:
+            return default
+        return self._value(col, row)
+
+    def row(self, row: int) -> Dict[str, Any]:
+        """row 번째 레코드를 새 dict 로 만들어 반환합니다. (중첩 list/dict 는 테이블과 공유)"""
+        if row < 0:
+            row += self._size
+        if not 0 <= row < self._size:
+            raise IndexError(row)
+        fields = self._fields
+        return {fields[col]: self._value(col, row) for col in self._shapes[self._row_shapes[row]]}
+
+    def rows(self, start: int = 0, end: Optional[int] = None) -> List[Dict[str, Any]]:
+        start, end, _ = slice(start, end).indices(self._size)
+        return [self.row(i) for i in range(start, end)]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self._size):
+            yield self.row(i)
+
+
+class CompactResponse:
+    """목록 응답의 레코드 배열만 RecordTable 로 바꿔 보관합니다. materialize() 는 매번 새 응답을 만듭니다."""
+
+    __slots__ = ("envelope", "path", "table")
+
+    def __init__(self, envelope: Any, path: Tuple[str, ...], table: RecordTable) -> None:
+        self.envelope = envelope
+        self.path = path
+        self.table = table
+
+    @classmethod
+    def pack(cls, data: Any, min_records: int = 16) -> Any:
+        """레코드가 min_records 개 이상인 목록 응답이면 CompactResponse 로, 아니면 data 를 그대로 반환합니다."""
+        path = items_path(data)
+        if path is None:
+            return data
+        items = extract_items(data)
+        raw = data
+        for key in path:
+            raw = raw[key]
+        # dict 가 아닌 항목이 섞인 배열은 원래 모양을 보존할 수 없으므로 그대로 둡니다.
+        if len(items) < min_records or len(items) != len(raw):
+            return data
+        return cls(replace_items(data, path, []), path, RecordTable.from_records(items))
+
+    def materialize(self, start: int = 0, end: Optional[int] = None) -> Any:
+        return replace_items(self.envelope, self.path, self.table.rows(start, end))
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+
+def unpack(value: Any) -> Any:
+    return value.materialize() if isinstance(value, CompactResponse) else value
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from src.credentials import TokenPool, use_account
+from src.deadline import Deadline
+
+from .catalog import get_dataset, record_key
+from .client import DrugInfoError, UnauthorizedError
+from .export import iter_pages
+
+
+SNAPSHOT_VERSION = 1
+
+
+def record_hash(record: Dict[str, Any]) -> str:
+    """키 순서/공백과 무관한 레코드 내용 해시 (blake2b 128bit, hex)."""
+    canonical = json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def load_snapshot(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            snap = json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        raise DrugInfoError(f"스냅샷 파일을 읽을 수 없습니다: {path}")
+    if snap.get("version") != SNAPSHOT_VERSION:
+        raise DrugInfoError(f"지원하지 않는 스냅샷 버전입니다: {snap.get('version')}")
+    return snap
+
+
+def save_snapshot(path: str, snap: Dict[str, Any]) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(snap, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def build_snapshot(
+    dataset: str,
+    page_size: int = 500,
+    params: Optional[Dict[str, Any]] = None,
+    max_concurrency: int = 8,
+    retries: int = 3,
+    timeout: int = 15,
+    on_unauthorized: Optional[Callable[[Deadline], Any]] = None,
+    accounts: Optional[TokenPool] = None,
+) -> Dict[str, Any]:
+    """목록 페이지만으로 {key: contentHash} 스냅샷을 만듭니다. 레코드 본문은 보관하지 않습니다."""
+    ds = get_dataset(dataset)
+    hashes: Dict[str, str] = {}
+    for _page, items, _total in iter_pages(
+        dataset,
+        page_size=page_size,
+        params=params,
+        max_concurrency=max_concurrency,
+        retries=retries,
+        timeout=timeout,
+        on_unauthorized=on_unauthorized,
+        accounts=accounts,
+    ):
+        for item in items:
+            h = record_hash(item)
+            hashes[record_key(ds, item) or h] = h
+    return {
+        "version": SNAPSHOT_VERSION,
+        "dataset": dataset,
+        "params": dict(params or {}),
+        "createdAt": int(time.time()),
+        "records": hashes,
+    }
+
+
+def diff_snapshots(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """두 스냅샷을 비교해 added/changed/removed 변경 목록을 키 순으로 반환합니다."""
+    before: Dict[str, str] = (previous or {}).get("records") or {}
+    after: Dict[str, str] = current.get("records") or {}
+    changes: List[Dict[str, Any]] = []
+    for key in sorted(set(before) | set(after)):
+        old, new = before.get(key), after.get(key)
+        if old == new:
+            continue
+        if old is None:
+            changes.append({"op": "added", "key": key, "hash": new})
+        elif new is None:
+            changes.append({"op": "removed", "key": key, "previousHash": old})
+        else:
+            changes.append({"op": "changed", "key": key, "hash": new, "previousHash": old})
+    return changes
+
+
+def fetch_details(
+    dataset: str,
+    changes: List[Dict[str, Any]],
+    max_concurrency: int = 8,
+    timeout: int = 15,
+    on_unauthorized: Optional[Callable[[Deadline], Any]] = None,
+    accounts: Optional[TokenPool] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """added/changed 레코드만 상세 조회해 {key: {"detail": ...} 또는 {"error": ...}} 를 반환합니다.
+
+    키 필드가 없어 contentHash 를 키로 쓴 레코드는 상세 조회할 수 없으므로 건너뜁니다.
+    목록과 상세 조회 사이에 삭제된 레코드 등 키별 실패는 error 로 남기고 나머지는 계속 조회합니다.
+    상세 API 가 없는 데이터셋은 빈 결과를 반환합니다.
+    """
+    ds = get_dataset(dataset)
+    if ds.detail is None:
+        return {}
+    keys = [c["key"] for c in changes if c["op"] in ("added", "changed") and c["key"] != c.get("hash")]
+
+    def _one(key: str) -> Dict[str, Any]:
+        deadline = Deadline(timeout)
+        with use_account(accounts.next_account() if accounts is not None else None):
+            try:
+                try:
+                    return {"detail": ds.detail(code=key, deadline=deadline)}
+                except UnauthorizedError:
+                    if on_unauthorized is None:
+                        raise
+                    on_unauthorized(deadline)
+                    return {"detail": ds.detail(code=key, deadline=deadline)}
+            except UnauthorizedError:
+                raise
+            except Exception as e:
+                return {"error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=max(1, int(max_concurrency))) as pool:
+        return dict(zip(keys, pool.map(_one, keys)))
+
+
+def write_changelog(path: str, dataset: str, changes: List[Dict[str, Any]], generated_at: int) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for change in changes:
+            line = dict(change, dataset=dataset, at=generated_at)
+            f.write(json.dumps(line, ensure_ascii=False, separators=(",", ":")) + "\n")
+    os.replace(tmp, path)
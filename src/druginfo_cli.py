@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+try:
+    from src.auth import login_and_get_token
+    from src.credentials import CREDENTIALS, TokenPool, account_logins, current_account, current_token
+    from src.deadline import Deadline
+    from src.druginfo import DrugInfoError
+    from src.druginfo.catalog import CATALOG_DATASETS, get_dataset
+    from src.druginfo.export import EXPORT_FORMATS, checkpoint_page_size, export_dataset
+    from src.druginfo.pack import open_pack, write_catalog_pack
+    from src.druginfo.pager import AdaptivePager, tuned_page_size
+    from src.druginfo.query import iter_ndjson
+    from src.druginfo.snapshot import build_snapshot, diff_snapshots, fetch_details, load_snapshot, save_snapshot, write_changelog
+except ModuleNotFoundError:
+    import os as _os
+    import sys as _sys
+    _sys.path.append(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+    from src.auth import login_and_get_token
+    from src.credentials import CREDENTIALS, TokenPool, account_logins, current_account, current_token
+    from src.deadline import Deadline
+    from src.druginfo import DrugInfoError
+    from src.druginfo.catalog import CATALOG_DATASETS, get_dataset
+    from src.druginfo.export import EXPORT_FORMATS, checkpoint_page_size, export_dataset
+    from src.druginfo.pack import open_pack, write_catalog_pack
+    from src.druginfo.pager import AdaptivePager, tuned_page_size
+    from src.druginfo.query import iter_ndjson
+    from src.druginfo.snapshot import build_snapshot, diff_snapshots, fetch_details, load_snapshot, save_snapshot, write_changelog
+
+
+load_dotenv(".env", override=False)
+load_dotenv(".env.local", override=False)
+
+
+def _login(timeout: int, deadline: Optional[Deadline] = None, account: Optional[str] = None) -> Optional[str]:
+    account = account or current_account()
+    login = account_logins().get(account)
+    login_url = os.getenv("EDB_LOGIN_URL")
+    if login is None or not login_url:
+        return None
+    token = login_and_get_token(login_url, login[0], login[1], False, int(timeout), deadline=deadline)
+    CREDENTIALS.set(account, token)
+    return token
+
+
+def _token_pool(names: Optional[str], timeout: int) -> Optional[TokenPool]:
+    if not names:
+        return None
+    accounts = [n.strip() for n in names.split(",") if n.strip()]
+    logins = account_logins()
+    missing = [n for n in accounts if n not in logins]
+    if missing:
+        raise SystemExit(f"로그인 정보가 없는 계정: {', '.join(missing)} (EDB_ACCOUNTS 또는 EDB_USER_ID/EDB_PASSWORD 확인)")
+    for account in accounts:
+        _login(timeout, account=account)
+    return TokenPool(accounts)
+
+
+def _parse_params(pairs: List[str], dataset: str) -> Dict[str, Any]:
+    """--param key=value 를 엔드포인트 표의 인자 타입으로 바꿉니다. 표에 없는 키는 문자열 그대로 둡니다."""
+    known = get_dataset(dataset).params()
+    params: Dict[str, Any] = {}
+    for pair in pairs:
+        if "=" not in pair:
+            raise SystemExit(f"--param 은 key=value 형식이어야 합니다: {pair}")
+        key, value = pair.split("=", 1)
+        param = known.get(key)
+        if param is None or param.type is str:
+            params[key] = value
+        elif param.type is bool:
+            lowered = value.lower()
+            if lowered not in ("true", "false"):
+                raise SystemExit(f"--param {key} 는 true/false 여야 합니다: {value}")
+            params[key] = lowered == "true"
+        else:
+            try:
+                params[key] = param.type(value)
+            except ValueError:
+                raise SystemExit(f"--param {key} 는 {param.type.__name__} 여야 합니다: {value}")
+    return params
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="druginfo 카탈로그 일괄 작업")
+    parser.add_argument(
+        "--timeout",
+        type=int,
+        default=int(os.getenv("EDB_TIMEOUT", "15")),
+        help="Request timeout seconds (default: 15)",
+    )
+    parser.add_argument(
+        "--accounts",
+        default=os.getenv("EDB_CRAWL_ACCOUNTS"),
+        help="쉼표로 구분한 계정 이름. 여러 개면 export/diff 요청을 계정별로 돌아가며 보냄 (env: EDB_CRAWL_ACCOUNTS)",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export = sub.add_parser("export", help="카탈로그 전체를 NDJSON/parquet 으로 내보내기 (중단 시 이어받기)")
+    export.add_argument("--dataset", required=True, choices=sorted(CATALOG_DATASETS))
+    export.add_argument("--out", required=True, help="출력 경로 (ndjson: 파일, parquet: 디렉토리)")
+    export.add_argument("--format", default="ndjson", choices=EXPORT_FORMATS)
+    export.add_argument("--page-size", type=int, help="페이지 크기 (default: 체크포인트의 값, 없으면 tune 으로 조정된 값)")
+    export.add_argument("--concurrency", type=int, default=8, help="최대 동시 요청 수 (default: 8)")
+    export.add_argument("--checkpoint", help="체크포인트 파일 (default: <out>.checkpoint.json)")
+    export.add_argument("--retries", type=int, default=3, help="페이지별 재시도 횟수 (default: 3)")
+    export.add_argument("--param", action="append", default=[], help="추가 조회 조건 key=value (반복 가능)")
+
+    diff = sub.add_parser("diff", help="목록 페이지의 내용 해시로 이전 스냅샷과 비교하고 변경분만 상세 조회")
+    diff.add_argument("--dataset", required=True, choices=sorted(CATALOG_DATASETS))
+    diff.add_argument("--snapshot", required=True, help="스냅샷 파일 (없으면 전체를 added 로 간주, 성공 시 갱신)")
+    diff.add_argument("--changelog", required=True, help="변경 목록 NDJSON 출력 파일")
+    diff.add_argument("--details", help="added/changed 레코드 상세 NDJSON 출력 파일")
+    diff.add_argument("--page-size", type=int, help="페이지 크기 (default: tune 으로 조정된 값)")
+    diff.add_argument("--concurrency", type=int, default=8, help="최대 동시 요청 수 (default: 8)")
+    diff.add_argument("--retries", type=int, default=3, help="페이지별 재시도 횟수 (default: 3)")
+    diff.add_argument("--param", action="append", default=[], help="추가 조회 조건 key=value (반복 가능)")
+
+    tune = sub.add_parser("tune", help="목록을 순서대로 조회하며 페이지 크기를 자동 조정하고 결과를 저장")
+    tune.add_argument("--dataset", required=True, choices=sorted(CATALOG_DATASETS))
+    tune.add_argument("--latency-ceiling", type=float, default=5.0, help="페이지당 허용 지연 시간(초) (default: 5)")
+    tune.add_argument("--max-pages", type=int, default=0, help="조회할 최대 페이지 수 (0: 전체)")
+    tune.add_argument("--out", help="조회한 레코드를 기록할 NDJSON 파일 (선택)")
+    tune.add_argument("--param", action="append", default=[], help="추가 조회 조건 key=value (반복 가능)")
+
+    pack = sub.add_parser("pack", help="NDJSON 을 mmap 으로 읽는 읽기 전용 팩 파일로 변환 (원자적 교체)")
+    pack.add_argument("--dataset", required=True, choices=sorted(CATALOG_DATASETS), help="카탈로그 데이터셋")
+    pack.add_argument("--input", help="입력 NDJSON (default: $EDB_MIRROR_DIR/<dataset>.ndjson)")
+    pack.add_argument("--out", help="출력 팩 파일 (default: $EDB_MIRROR_DIR/<dataset>.pack)")
+    pack.add_argument("--key", action="append", default=[], help="키 색인 필드 (반복 가능, default: 데이터셋의 키 필드)")
+    return parser
+
+
+def _cmd_pack(args: argparse.Namespace) -> int:
+    mirror_dir = os.getenv("EDB_MIRROR_DIR") or "."
+    src = args.input or os.path.join(mirror_dir, f"{args.dataset}.ndjson")
+    out = args.out or os.path.join(mirror_dir, f"{args.dataset}.pack")
+    dataset = get_dataset(args.dataset)
+    if args.key:
+        dataset = dataset._replace(key_fields=tuple(args.key))
+    info = write_catalog_pack(out, iter_ndjson(src), dataset, meta={"source": os.path.basename(src)})
+    pack = open_pack(out)
+    info.update({"path": out, "bytes": os.path.getsize(out), "records": len(pack)})
+    print(json.dumps(info, ensure_ascii=False, indent=2))
+    return 0
+
+
+def _cmd_tune(args: argparse.Namespace) -> int:
+    pager = AdaptivePager(args.dataset, params=_parse_params(args.param, args.dataset), latency_ceiling=args.latency_ceiling)
+    records = 0
+    out = open(args.out, "w", encoding="utf-8") if args.out else None
+    try:
+        for items in pager.walk(
+            timeout=int(args.timeout),
+            max_pages=args.max_pages,
+            on_unauthorized=lambda d: _login(args.timeout, d),
+        ):
+            records += len(items)
+            if out is not None:
+                for item in items:
+                    out.write(json.dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n")
+            print(f"[{args.dataset}] records={records} pageSize={pager.page_size}", file=sys.stderr)
+    finally:
+        if out is not None:
+            out.close()
+    result = {"dataset": args.dataset, "records": records, "pageSize": pager.best_page_size(), "stats": pager.stats()}
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+def _cmd_export(args: argparse.Namespace) -> int:
+    def _progress(state: Dict[str, Any]) -> None:
+        total = state.get("totalPages") or "?"
+        print(
+            f"[{state['dataset']}] page {state['nextPage'] - 1}/{total} records={state['records']} concurrency={state['concurrency']}",
+            file=sys.stderr,
+        )
+
+    params = _parse_params(args.param, args.dataset)
+    state = export_dataset(
+        args.dataset,
+        args.out,
+        fmt=args.format,
+        page_size=args.page_size or checkpoint_page_size(args.out, args.checkpoint) or tuned_page_size(args.dataset, params=params),
+        max_concurrency=args.concurrency,
+        checkpoint_path=args.checkpoint,
+        params=params,
+        retries=args.retries,
+        timeout=int(args.timeout),
+        on_unauthorized=lambda d: _login(args.timeout, d),
+        progress=_progress,
+        accounts=args.pool,
+    )
+    print(json.dumps(state, ensure_ascii=False, indent=2))
+    return 0
+
+
+def _cmd_diff(args: argparse.Namespace) -> int:
+    params = _parse_params(args.param, args.dataset)
+    previous = load_snapshot(args.snapshot)
+    if previous is not None and (previous.get("dataset"), previous.get("params")) != (args.dataset, params):
+        print("스냅샷의 데이터셋/조회 조건이 현재 요청과 다릅니다.", file=sys.stderr)
+        return 2
+    current = build_snapshot(
+        args.dataset,
+        page_size=args.page_size or tuned_page_size(args.dataset, params=params),
+        params=params,
+        max_concurrency=args.concurrency,
+        retries=args.retries,
+        timeout=int(args.timeout),
+        on_unauthorized=lambda d: _login(args.timeout, d),
+        accounts=args.pool,
+    )
+    changes = diff_snapshots(previous, current)
+    if args.details:
+        details = fetch_details(
+            args.dataset,
+            changes,
+            max_concurrency=args.concurrency,
+            timeout=int(args.timeout),
+            on_unauthorized=lambda d: _login(args.timeout, d),
+            accounts=args.pool,
+        )
+        tmp = args.details + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for key, entry in details.items():
+                f.write(json.dumps(dict(key=key, **entry), ensure_ascii=False, separators=(",", ":")) + "\n")
+        os.replace(tmp, args.details)
+    write_changelog(args.changelog, args.dataset, changes, current["createdAt"])
+    save_snapshot(args.snapshot, current)
+    summary: Dict[str, Any] = {"dataset": args.dataset, "records": len(current["records"])}
+    for op in ("added", "changed", "removed"):
+        summary[op] = sum(1 for c in changes if c["op"] == op)
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 0
+
+
+def main() -> int:
+    parser = build_arg_parser()
+    args = parser.parse_args()
+    try:
+        if args.command == "pack":
+            return _cmd_pack(args)
+        args.pool = _token_pool(args.accounts, args.timeout)
+        if args.pool is None and not current_token():
+            _login(args.timeout)
+        if args.command == "export":
+            return _cmd_export(args)
+        if args.command == "diff":
+            return _cmd_diff(args)
+        if args.command == "tune":
+            return _cmd_tune(args)
+    except DrugInfoError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"Request error: {e}", file=sys.stderr)
+        return 1
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
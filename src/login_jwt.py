@@ -3,17 +3,22 @@ import argparse
 import json
 import os
 import sys
-from typing import Any, Dict, Optional
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, Optional, TextIO, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 try:
     from src.auth import extract_token
+    from src.druginfo.endpoints import ENDPOINTS
 except ModuleNotFoundError:
     import os as _os
     import sys as _sys
     _sys.path.append(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
     from src.auth import extract_token
+    from src.druginfo.endpoints import ENDPOINTS
 
 
 # 로그인 URL은 환경변수 EDB_LOGIN_URL 로만 설정합니다
@@ -108,6 +113,18 @@ def build_arg_parser() -> argparse.ArgumentParser:
         default=os.getenv("EDB_ACCEPT", "application/json"),
         help="Accept header for GET request (default: application/json)",
     )
+    # Batch GET options
+    parser.add_argument(
+        "--batch",
+        dest="batch_file",
+        help="Read GET targets (URL or JSON {endpoint, params}) line by line from this file ('-' for stdin) and print NDJSON results",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.getenv("EDB_CONCURRENCY", "8")),
+        help="Max concurrent GET requests in batch mode (default: 8)",
+    )
     return parser
 
 
@@ -124,10 +141,197 @@ def perform_get(url: str, token: str, accept: str, timeout: int) -> Dict[str, An
         return {"text": resp.text}
 
 
+def _base_url(login_url: Optional[str]) -> str:
+    base = (os.getenv("EDB_BASE_URL") or "").rstrip("/")
+    if not base and login_url and "://" in login_url:
+        scheme, rest = login_url.split("://", 1)
+        base = f"{scheme}://{rest.split('/', 1)[0]}"
+    return base
+
+
+def _query_param(value: Any) -> Any:
+    return ("true" if value else "false") if isinstance(value, bool) else value
+
+
+def parse_batch_line(line: str, base_url: str) -> Tuple[str, Dict[str, Any]]:
+    """배치 입력 한 줄을 (url, params) 로 변환합니다.
+
+    - `https://...` 형태의 URL
+    - `{"endpoint": "list_product", "params": {"Page": 1}}` (druginfo 엔드포인트 이름 또는 `/v1/...` 경로)
+    - `{"url": "https://...", "params": {...}}`
+
+    엔드포인트 이름이면 params 의 키를 엔드포인트 표의 인자(이름, 도구 인자 이름, 쿼리 이름)로 풀어
+    클라이언트 함수 호출과 같은 요청을 만듭니다. 표에 없는 키는 그대로 보냅니다.
+    """
+    text = line.strip()
+    if not text.startswith("{"):
+        return text, {}
+    spec = json.loads(text)
+    raw_params = spec.get("params") or {}
+    if not isinstance(raw_params, dict):
+        raise ValueError("params 는 객체(JSON object)여야 합니다")
+    if spec.get("url"):
+        return str(spec["url"]), {k: _query_param(v) for k, v in raw_params.items() if v is not None}
+    name = str(spec.get("endpoint") or "")
+    endpoint = ENDPOINTS.get(name)
+    if endpoint is not None:
+        values: Dict[str, Any] = {}
+        extra: Dict[str, Any] = {}
+        for k, v in raw_params.items():
+            param = endpoint.lookup(k)
+            if param is not None:
+                values[param.name] = v
+            elif v is not None:
+                extra[k] = _query_param(v)
+        try:
+            path, params = endpoint.request(values)
+        except ValueError as e:
+            raise ValueError(f"{name}: {e}")
+        for k, v in extra.items():
+            params.setdefault(k, v)
+    else:
+        path = name
+        if not path.startswith("/"):
+            raise ValueError(f"알 수 없는 endpoint: {name}")
+        params = {k: _query_param(v) for k, v in raw_params.items() if v is not None}
+        for key in ("code", "id"):
+            if "{" + key + "}" in path:
+                if key not in params:
+                    raise ValueError(f"{name} 에는 params.{key} 가 필요합니다")
+                path = path.replace("{" + key + "}", str(params.pop(key)))
+    if not base_url:
+        raise ValueError("endpoint 사용 시 EDB_BASE_URL(또는 EDB_LOGIN_URL)이 필요합니다")
+    return base_url + path, params
+
+
+def _iter_batch_lines(stream: TextIO) -> Iterator[Tuple[int, str]]:
+    index = 0
+    for line in stream:
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        yield index, line
+        index += 1
+
+
+def run_batch(
+    stream: TextIO,
+    token: str,
+    accept: str,
+    timeout: int,
+    concurrency: int,
+    base_url: str,
+    relogin: Optional[Any] = None,
+    out: TextIO = sys.stdout,
+) -> int:
+    """입력을 동시에 GET 하고 완료 순서대로 {index, ...} NDJSON 을 출력합니다. 실패 건수를 반환합니다."""
+    concurrency = max(1, int(concurrency))
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    auth = {"token": token}
+    auth_lock = threading.Lock()
+
+    def _fetch(index: int, line: str) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"index": index}
+        try:
+            url, params = parse_batch_line(line, base_url)
+            result["url"] = url
+            for attempt in range(2):
+                used = auth["token"]
+                headers = {"accept": accept, "Authorization": f"Bearer {used}"}
+                resp = session.get(url, headers=headers, params=params or None, timeout=timeout)
+                if resp.status_code == 401 and attempt == 0 and relogin is not None:
+                    with auth_lock:
+                        if auth["token"] == used:
+                            auth["token"] = relogin()
+                    continue
+                break
+            result["status"] = resp.status_code
+            try:
+                result["json"] = resp.json()
+            except ValueError:
+                result["text"] = resp.text
+            if not resp.ok:
+                result["error"] = f"HTTP {resp.status_code}"
+        except (ValueError, requests.RequestException) as e:
+            result["error"] = str(e)
+        return result
+
+    failures = 0
+    lines = _iter_batch_lines(stream)
+    in_flight: Dict[Future, int] = {}
+    exhausted = False
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        while True:
+            while not exhausted and len(in_flight) < concurrency * 2:
+                try:
+                    index, line = next(lines)
+                except StopIteration:
+                    exhausted = True
+                    break
+                in_flight[pool.submit(_fetch, index, line)] = index
+            if not in_flight:
+                break
+            done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for fut in done:
+                in_flight.pop(fut)
+                result = fut.result()
+                if "error" in result:
+                    failures += 1
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+    session.close()
+    return failures
+
+
 def main() -> int:
     parser = build_arg_parser()
     args = parser.parse_args()
 
+    # Batch GET mode: login once, then fetch all targets concurrently over one pooled session
+    if args.batch_file:
+        def _login() -> str:
+            login_data = fetch_jwt(
+                login_url=args.url,
+                user_id=args.userId,
+                password=args.password,
+                is_force_login=bool(args.force),
+                timeout=int(args.timeout),
+            )
+            tok = extract_token(login_data)
+            if not tok:
+                raise requests.RequestException("로그인 응답에서 토큰을 찾지 못했습니다.")
+            return tok
+
+        token = args.token
+        relogin = None
+        if not token:
+            if not args.userId or not args.password:
+                print("--token 을 제공하거나, --userId 와 --password 로 로그인 후 호출할 수 있습니다.", file=sys.stderr)
+                return 2
+            try:
+                token = _login()
+            except requests.RequestException as req_err:
+                print(f"Request error: {req_err}", file=sys.stderr)
+                return 1
+            relogin = _login
+        stream = sys.stdin if args.batch_file == "-" else open(args.batch_file, "r", encoding="utf-8")
+        try:
+            failures = run_batch(
+                stream,
+                token,
+                args.accept,
+                int(args.timeout),
+                args.concurrency,
+                _base_url(args.url),
+                relogin=relogin,
+            )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        return 1 if failures else 0
+
     # If GET mode is requested, prepare a token then perform GET
     if args.get_url:
         token = args.token
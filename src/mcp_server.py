@@ -1,26 +1,96 @@
+import argparse
 import os
-from dotenv import load_dotenv
-from mcp.server.fastmcp import FastMCP
+import sys
+from typing import TYPE_CHECKING, Any
 
-from src.mcp_tools import (
-    register_auth_tools,
-    register_druginfo_tools,
-)
+if TYPE_CHECKING:
+    from mcp.server.fastmcp import FastMCP
 
 
-# Load env once
-load_dotenv(".env", override=False)
-load_dotenv(".env.local", override=False)
+def _load_env() -> None:
+    # .env 파일이 있을 때만 python-dotenv 를 불러옵니다.
+    paths = [p for p in (".env", ".env.local") if os.path.exists(p)]
+    if not paths:
+        return
+    from dotenv import load_dotenv
 
+    for path in paths:
+        load_dotenv(path, override=False)
 
-def create_server() -> FastMCP:
-    mcp = FastMCP("pharminfo-mcp")
+
+# Load env once (도구 모듈의 설정 싱글턴보다 먼저)
+_load_env()
+
+
+def create_server(**settings: Any) -> "FastMCP":
+    # mcp 와 도구 모듈은 서버를 만들 때 불러옵니다. (--help 등은 가볍게)
+    from mcp.server.fastmcp import FastMCP
+
+    from src.mcp_tools import register_auth_tools, register_druginfo_tools, register_query_tools
+
+    mcp = FastMCP("pharminfo-mcp", **settings)
     register_auth_tools(mcp)
     register_druginfo_tools(mcp)
+    register_query_tools(mcp)
     return mcp
 
 
-if __name__ == "__main__":
-    create_server().run()
+def create_http_app() -> Any:
+    """멀티 워커용 Streamable HTTP ASGI 앱. 워커 간 세션 공유가 없도록 stateless 로 동작합니다."""
+    host = os.getenv("EDB_MCP_HOST", "127.0.0.1")
+    mcp = create_server(host=host, stateless_http=True, json_response=True)
+    return mcp.streamable_http_app()
+
 
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="pharminfo MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=("stdio", "sse", "streamable-http"),
+        default=os.getenv("EDB_MCP_TRANSPORT", "stdio"),
+        help="MCP transport (env: EDB_MCP_TRANSPORT, default: stdio)",
+    )
+    parser.add_argument("--host", default=os.getenv("EDB_MCP_HOST", "127.0.0.1"), help="HTTP bind host (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=int(os.getenv("EDB_MCP_PORT", "8000")), help="HTTP port (default: 8000)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("EDB_MCP_WORKERS", "1")),
+        help="Worker processes for streamable-http (default: 1)",
+    )
+    return parser
 
+
+def main() -> int:
+    args = build_arg_parser().parse_args()
+    if args.transport == "stdio":
+        create_server().run()
+        return 0
+    if args.transport == "sse":
+        if args.workers > 1:
+            print("sse 전송은 세션이 워커에 묶이므로 --workers 1 만 지원합니다. streamable-http 를 사용하세요.", file=sys.stderr)
+            return 2
+        create_server(host=args.host, port=args.port).run(transport="sse")
+        return 0
+
+    import uvicorn
+
+    os.environ["EDB_MCP_HOST"] = args.host
+    if args.workers > 1 and not os.getenv("EDB_SHARED_STORE"):
+        # 워커들이 토큰과 응답 캐시를 함께 쓰도록 공유 저장소를 지정합니다. (자식 프로세스가 상속)
+        from src.settings import cache_path
+
+        os.environ["EDB_SHARED_STORE"] = cache_path("shared.sqlite3")
+    uvicorn.run(
+        "src.mcp_server:create_http_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=max(1, args.workers),
+        log_level=os.getenv("EDB_MCP_LOG_LEVEL", "warning"),
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
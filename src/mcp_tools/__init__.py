@@ -1,9 +1,11 @@
 from .auth_tools import register_auth_tools
 from .druginfo_tools import register_druginfo_tools
+from .query_tools import register_query_tools
 
 __all__ = [
     "register_auth_tools",
     "register_druginfo_tools",
+    "register_query_tools",
 ]
 
 
@@ -1,57 +1,125 @@
 import os
-from typing import Optional
-
-from mcp.server.fastmcp import FastMCP
+import threading
+from typing import TYPE_CHECKING, Dict, Optional
 
 try:
     from src.auth import login_and_get_token
+    from src.credentials import CREDENTIALS, DEFAULT_ACCOUNT, account_logins, current_account
+    from src.deadline import Deadline
+    from src.shared_store import get_shared_store
+    from src.mcp_tools.offload import offloaded
 except ModuleNotFoundError:
     import sys as _sys, os as _os
     _sys.path.append(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
     from src.auth import login_and_get_token
+    from src.credentials import CREDENTIALS, DEFAULT_ACCOUNT, account_logins, current_account
+    from src.deadline import Deadline
+    from src.shared_store import get_shared_store
+    from src.mcp_tools.offload import offloaded
+
+
+if TYPE_CHECKING:
+    from mcp.server.fastmcp import FastMCP
+
+
+_SHARED_TOKEN_KEY = "auth:token:"
+_SHARED_TOKEN_TTL = 12 * 3600
+_LOGIN_LOCKS: Dict[str, threading.Lock] = {}
+_LOGIN_LOCKS_GUARD = threading.Lock()
+
+
+def _login_lock(account: str) -> threading.Lock:
+    with _LOGIN_LOCKS_GUARD:
+        return _LOGIN_LOCKS.setdefault(account, threading.Lock())
+
+
+def _adopt_token(tok: str, account: str = DEFAULT_ACCOUNT) -> str:
+    CREDENTIALS.set(account, tok)
+    return tok
+
 
+def _publish_token(tok: str, account: str = DEFAULT_ACCOUNT) -> None:
+    store = get_shared_store()
+    if store is not None:
+        store.set(_SHARED_TOKEN_KEY + account, tok, _SHARED_TOKEN_TTL)
 
-_AUTO_TOKEN: Optional[str] = None
 
+def _try_auto_login(
+    timeout: int = 15,
+    deadline: Optional[Deadline] = None,
+    refresh: bool = False,
+    account: Optional[str] = None,
+) -> Optional[str]:
+    """계정(기본: 현재 계정)의 저장된 토큰을 반환하거나 자동 로그인합니다.
 
-def _try_auto_login(timeout: int = 15) -> Optional[str]:
-    global _AUTO_TOKEN
-    if _AUTO_TOKEN:
-        return _AUTO_TOKEN
-    uid = os.getenv("EDB_USER_ID")
-    pwd = os.getenv("EDB_PASSWORD")
-    login_url = os.getenv("EDB_LOGIN_URL")
-    if not uid or not pwd or not login_url:
-        return None
-    try:
-        tok = login_and_get_token(login_url, uid, pwd, False, int(timeout))
-        _AUTO_TOKEN = tok
-        os.environ["EDB_TOKEN"] = tok
-        return tok
-    except Exception:
-        return None
+    refresh=True(401 발생) 이면 현재 토큰을 버리고, 다른 스레드/워커가 먼저 받아 둔 새 토큰이 있으면 그것을,
+    없으면 다시 로그인한 토큰을 사용합니다. 같은 계정의 로그인은 프로세스 안에서는 잠금으로,
+    워커 간에는 공유 임대 잠금으로 한 번만 수행합니다.
+    """
+    account = account or current_account()
+    stale = CREDENTIALS.get(account)
+    if stale and not refresh:
+        return stale
+    with _login_lock(account):
+        current = CREDENTIALS.get(account)
+        if current and current != stale:
+            return current
+        store = get_shared_store()
+        key = _SHARED_TOKEN_KEY + account
+        if store is not None:
+            shared = store.get(key)
+            if shared and shared != stale:
+                return _adopt_token(shared, account)
+        try:
+            login = account_logins().get(account)
+        except RuntimeError:
+            return None
+        login_url = os.getenv("EDB_LOGIN_URL")
+        if login is None or not login_url:
+            return None
+        d = deadline or Deadline(timeout)
+        lease = "login:" + account
+        try:
+            if store is not None and not store.acquire(lease, ttl=d.remaining() or 1):
+                # 다른 워커가 로그인 중이면 새 토큰이 올라올 때까지 남은 시간 안에서 기다립니다.
+                while not d.expired():
+                    shared = store.get(key)
+                    if shared and shared != stale:
+                        return _adopt_token(shared, account)
+                    d.sleep(min(0.2, d.remaining() / 2))
+                return None
+            try:
+                tok = login_and_get_token(login_url, login[0], login[1], False, int(timeout), deadline=d)
+                _publish_token(tok, account)
+            finally:
+                if store is not None:
+                    store.release(lease)
+            return _adopt_token(tok, account)
+        except Exception:
+            return None
 
 
-def register_auth_tools(mcp: FastMCP) -> None:
-    # 서버 시작 시 1회 자동 로그인 시도 (환경변수가 있는 경우)
-    _try_auto_login()
+def register_auth_tools(mcp: "FastMCP") -> None:
+    # 자동 로그인은 서버 시작 때가 아니라 토큰이 필요한 첫 도구 호출에서 합니다. (druginfo_tools._call)
     @mcp.tool()
+    @offloaded
     def login(
         userId: Optional[str] = None,
         password: Optional[str] = None,
         force: bool = False,
         loginUrl: Optional[str] = None,
         timeout: int = 15,
+        account: Optional[str] = None,
     ) -> str:
-        """로그인하여 JWT(또는 refreshToken)를 반환합니다."""
+        """로그인하여 JWT(또는 refreshToken)를 반환합니다. account 를 주면 그 계정 이름으로 토큰을 보관합니다."""
+        account = account or DEFAULT_ACCOUNT
         login_url = loginUrl or os.getenv("EDB_LOGIN_URL")
-        uid = userId or os.getenv("EDB_USER_ID")
-        pwd = password or os.getenv("EDB_PASSWORD")
+        configured = account_logins().get(account) or (None, None)
+        uid = userId or configured[0]
+        pwd = password or configured[1]
         if not uid or not pwd:
-            raise RuntimeError("userId/password 가 필요합니다. (또는 EDB_USER_ID/EDB_PASSWORD 설정)")
+            raise RuntimeError("userId/password 가 필요합니다. (또는 EDB_USER_ID/EDB_PASSWORD, EDB_ACCOUNTS 설정)")
         token = login_and_get_token(login_url, uid, pwd, bool(force), int(timeout))
-        # 최신 토큰을 캐시에 반영해 도구들이 재사용하도록 함
-        global _AUTO_TOKEN
-        _AUTO_TOKEN = token
-        os.environ["EDB_TOKEN"] = token
-        return token
\ No newline at end of file
+        # 최신 토큰을 계정별 저장소(및 공유 저장소)에 반영해 도구들이 재사용하도록 함
+        _publish_token(token, account)
+        return _adopt_token(token, account)
\ No newline at end of file
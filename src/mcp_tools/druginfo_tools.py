@@ -1,286 +1,98 @@
-from typing import Optional, Dict, Any
-
-from mcp.server.fastmcp import FastMCP
-
-from src.druginfo import (
-    list_main_ingredient,
-    get_main_ingredient_by_code,
-    list_product,
-    get_product_by_code,
-    UnauthorizedError,
-    DrugInfoError,
-    list_main_ingredient_drug_effect,
-    get_main_ingredient_drug_effect_by_id,
-    list_main_ingredient_drug_kind,
-    list_main_ingredient_guide_a4,
-    list_main_ingredient_guide_a5,
-    list_main_ingredient_picto,
-    get_main_ingredient_picto_by_code,
-    list_product_edicode,
-)
+import inspect
+from typing import TYPE_CHECKING, Optional, Dict, Any, Callable
+
+from src.druginfo import client, UnauthorizedError, DrugInfoError
+from src.druginfo.endpoints import ENDPOINTS, Endpoint
+from src.credentials import current_token, use_account
+from src.deadline import Deadline
+from src.druginfo.cache import RESPONSE_CACHE
 from src.mcp_tools.auth_tools import _try_auto_login
-
-
-def register_druginfo_tools(mcp: FastMCP) -> None:
-    @mcp.tool(name="druginfo_list_main_ingredient")
-    def druginfo_list_main_ingredient(
-        a4: Optional[bool] = None,
-        a4Off: Optional[bool] = None,
-        a5: Optional[bool] = None,
-        a5Off: Optional[bool] = None,
-        drugkind: Optional[bool] = None,
-        drugkindOff: Optional[bool] = None,
-        effect: Optional[bool] = None,
-        effectOff: Optional[bool] = None,
-        showMapped: Optional[bool] = None,
-        IngredientCode: Optional[str] = None,
-        ingredientNameKor: Optional[str] = None,
-        drugKind: Optional[str] = None,
-        PageSize: Optional[int] = None,
-        Page: Optional[int] = None,
-        SortBy: Optional[str] = None,
-        # legacy aliases
-        q: Optional[str] = None,
-        page: Optional[int] = None,
-        size: Optional[int] = None,
-        timeout: int = 15,
-    ) -> Dict[str, Any]:
-        try:
-            return list_main_ingredient(
-                a4=a4,
-                a4Off=a4Off,
-                a5=a5,
-                a5Off=a5Off,
-                drugkind=drugkind,
-                drugkindOff=drugkindOff,
-                effect=effect,
-                effectOff=effectOff,
-                showMapped=showMapped,
-                IngredientCode=IngredientCode,
-                ingredientNameKor=ingredientNameKor,
-                drugKind=drugKind,
-                PageSize=PageSize,
-                Page=Page,
-                SortBy=SortBy,
-                q=q,
-                page=page,
-                size=size,
-                timeout=int(timeout),
-            )
-        except UnauthorizedError:
-            _try_auto_login(timeout)
-            return list_main_ingredient(
-                a4=a4,
-                a4Off=a4Off,
-                a5=a5,
-                a5Off=a5Off,
-                drugkind=drugkind,
-                drugkindOff=drugkindOff,
-                effect=effect,
-                effectOff=effectOff,
-                showMapped=showMapped,
-                IngredientCode=IngredientCode,
-                ingredientNameKor=ingredientNameKor,
-                drugKind=drugKind,
-                PageSize=PageSize,
-                Page=Page,
-                SortBy=SortBy,
-                q=q,
-                page=page,
-                size=size,
-                timeout=int(timeout),
-            )
-        except DrugInfoError as e:
-            raise RuntimeError(str(e))
-
-    @mcp.tool(name="druginfo_get_main_ingredient_by_code")
-    def druginfo_get_main_ingredient_by_code(code: str, timeout: int = 15) -> Dict[str, Any]:
-        try:
-            return get_main_ingredient_by_code(code=code, timeout=int(timeout))
-        except UnauthorizedError:
-            _try_auto_login(timeout)
-            return get_main_ingredient_by_code(code=code, timeout=int(timeout))
-        except DrugInfoError as e:
-            raise RuntimeError(str(e))
-
-    @mcp.tool(name="druginfo_list_product")
-    def druginfo_list_product(
-        crop: Optional[bool] = None,
-        cropOff: Optional[bool] = None,
-        base64: Optional[bool] = None,
-        base64Off: Optional[bool] = None,
-        watermark: Optional[bool] = None,
-        watermarkOff: Optional[bool] = None,
-        confirm: Optional[bool] = None,
-        confirmOff: Optional[bool] = None,
-        teoulLengthShort: Optional[bool] = None,
-        teoulLengthShortOff: Optional[bool] = None,
-        teoulLengthLong: Optional[bool] = None,
-        teoulLengthLongOff: Optional[bool] = None,
-        minCount: Optional[int] = None,
-        ProductCode: Optional[str] = None,
-        pillName: Optional[str] = None,
-        vendor: Optional[str] = None,
-        PageSize: Optional[int] = None,
-        Page: Optional[int] = None,
-        SortBy: Optional[str] = None,
-        # legacy aliases
-        q: Optional[str] = None,
-        page: Optional[int] = None,
-        size: Optional[int] = None,
-        timeout: int = 15,
-    ) -> Dict[str, Any]:
-        try:
-            return list_product(
-                crop=crop,
-                cropOff=cropOff,
-                base64=base64,
-                base64Off=base64Off,
-                watermark=watermark,
-                watermarkOff=watermarkOff,
-                confirm=confirm,
-                confirmOff=confirmOff,
-                teoulLengthShort=teoulLengthShort,
-                teoulLengthShortOff=teoulLengthShortOff,
-                teoulLengthLong=teoulLengthLong,
-                teoulLengthLongOff=teoulLengthLongOff,
-                minCount=minCount,
-                ProductCode=ProductCode,
-                pillName=pillName,
-                vendor=vendor,
-                PageSize=PageSize,
-                Page=Page,
-                SortBy=SortBy,
-                q=q,
-                page=page,
-                size=size,
-                timeout=int(timeout),
-            )
-        except UnauthorizedError:
-            _try_auto_login(timeout)
-            return list_product(
-                crop=crop,
-                cropOff=cropOff,
-                base64=base64,
-                base64Off=base64Off,
-                watermark=watermark,
-                watermarkOff=watermarkOff,
-                confirm=confirm,
-                confirmOff=confirmOff,
-                teoulLengthShort=teoulLengthShort,
-                teoulLengthShortOff=teoulLengthShortOff,
-                teoulLengthLong=teoulLengthLong,
-                teoulLengthLongOff=teoulLengthLongOff,
-                minCount=minCount,
-                ProductCode=ProductCode,
-                pillName=pillName,
-                vendor=vendor,
-                PageSize=PageSize,
-                Page=Page,
-                SortBy=SortBy,
-                q=q,
-                page=page,
-                size=size,
-                timeout=int(timeout),
-            )
-        except DrugInfoError as e:
-            raise RuntimeError(str(e))
-
-    @mcp.tool(name="druginfo_get_product_by_code")
-    def druginfo_get_product_by_code(code: str, timeout: int = 15) -> Dict[str, Any]:
-        try:
-            return get_product_by_code(code=code, timeout=int(timeout))
-        except UnauthorizedError:
-            _try_auto_login(timeout)
-            return get_product_by_code(code=code, timeout=int(timeout))
-        except DrugInfoError as e:
-            raise RuntimeError(str(e))
-
-    @mcp.tool(name="druginfo_list_main_ingredient_drug_effect")
-    def druginfo_list_main_ingredient_drug_effect(
-        edit: Optional[str] = None,
-        pageSize: Optional[int] = None,
-        page: Optional[int] = None,
-        sortBy: Optional[str] = None,
-        timeout: int = 15,
-    ) -> Dict[str, Any]:
-        try:
-            return list_main_ingredient_drug_effect(edit=edit, pageSize=pageSize, page=page, sortBy=sortBy, timeout=int(timeout))
-        except UnauthorizedError:
-            _try_auto_login(timeout)
-            return list_main_ingredient_drug_effect(edit=edit, pageSize=pageSize, page=page, sortBy=sortBy, timeout=int(timeout))
-        except DrugInfoError as e:
-            raise RuntimeError(str(e))
-
-    @mcp.tool(name="druginfo_get_main_ingredient_drug_effect_by_id")
-    def druginfo_get_main_ingredient_drug_effect_by_id(effectId: int, timeout: int = 15) -> Dict[str, Any]:
-        try:
-            return get_main_ingredient_drug_effect_by_id(effect_id=int(effectId), timeout=int(timeout))
-        except UnauthorizedError:
-            _try_auto_login(timeout)
-            return get_main_ingredient_drug_effect_by_id(effect_id=int(effectId), timeout=int(timeout))
-        except DrugInfoError as e:
-            raise RuntimeError(str(e))
-
-    @mcp.tool(name="druginfo_list_main_ingredient_drug_kind")
-    def druginfo_list_main_ingredient_drug_kind(edit: Optional[str] = None, pageSize: Optional[int] = None, page: Optional[int] = None, sortBy: Optional[str] = None, timeout: int = 15) -> Dict[str, Any]:
-        try:
-            return list_main_ingredient_drug_kind(edit=edit, pageSize=pageSize, page=page, sortBy=sortBy, timeout=int(timeout))
-        except UnauthorizedError:
-            _try_auto_login(timeout)
-            return list_main_ingredient_drug_kind(edit=edit, pageSize=pageSize, page=page, sortBy=sortBy, timeout=int(timeout))
-        except DrugInfoError as e:
-            raise RuntimeError(str(e))
-
-    @mcp.tool(name="druginfo_list_main_ingredient_guide_a4")
-    def druginfo_list_main_ingredient_guide_a4(edit: Optional[str] = None, pageSize: Optional[int] = None, page: Optional[int] = None, sortBy: Optional[str] = None, timeout: int = 15) -> Dict[str, Any]:
-        try:
-            return list_main_ingredient_guide_a4(edit=edit, pageSize=pageSize, page=page, sortBy=sortBy, timeout=int(timeout))
-        except UnauthorizedError:
-            _try_auto_login(timeout)
-            return list_main_ingredient_guide_a4(edit=edit, pageSize=pageSize, page=page, sortBy=sortBy, timeout=int(timeout))
-        except DrugInfoError as e:
-            raise RuntimeError(str(e))
-
-    @mcp.tool(name="druginfo_list_main_ingredient_guide_a5")
-    def druginfo_list_main_ingredient_guide_a5(edit: Optional[str] = None, pageSize: Optional[int] = None, page: Optional[int] = None, sortBy: Optional[str] = None, timeout: int = 15) -> Dict[str, Any]:
-        try:
-            return list_main_ingredient_guide_a5(edit=edit, pageSize=pageSize, page=page, sortBy=sortBy, timeout=int(timeout))
-        except UnauthorizedError:
-            _try_auto_login(timeout)
-            return list_main_ingredient_guide_a5(edit=edit, pageSize=pageSize, page=page, sortBy=sortBy, timeout=int(timeout))
-        except DrugInfoError as e:
-            raise RuntimeError(str(e))
-
-    @mcp.tool(name="druginfo_list_main_ingredient_picto")
-    def druginfo_list_main_ingredient_picto(IsDeleted: Optional[str] = None, Title: Optional[str] = None, PageSize: Optional[int] = None, Page: Optional[int] = None, SortBy: Optional[str] = None, timeout: int = 15) -> Dict[str, Any]:
-        try:
-            return list_main_ingredient_picto(IsDeleted=IsDeleted, Title=Title, PageSize=PageSize, Page=Page, SortBy=SortBy, timeout=int(timeout))
-        except UnauthorizedError:
-            _try_auto_login(timeout)
-            return list_main_ingredient_picto(IsDeleted=IsDeleted, Title=Title, PageSize=PageSize, Page=Page, SortBy=SortBy, timeout=int(timeout))
-        except DrugInfoError as e:
-            raise RuntimeError(str(e))
-
-    @mcp.tool(name="druginfo_get_main_ingredient_picto_by_code")
-    def druginfo_get_main_ingredient_picto_by_code(code: str, timeout: int = 15) -> Dict[str, Any]:
-        try:
-            return get_main_ingredient_picto_by_code(code=code, timeout=int(timeout))
-        except UnauthorizedError:
-            _try_auto_login(timeout)
-            return get_main_ingredient_picto_by_code(code=code, timeout=int(timeout))
-        except DrugInfoError as e:
-            raise RuntimeError(str(e))
-
-    @mcp.tool(name="druginfo_list_product_edicode")
-    def druginfo_list_product_edicode(ProductCode: Optional[str] = None, EdiCode: Optional[str] = None, PageSize: Optional[int] = None, Page: Optional[int] = None, SortBy: Optional[str] = None, timeout: int = 15) -> Dict[str, Any]:
+from src.mcp_tools.offload import offloaded
+from src.mcp_tools.prefetch import PREFETCHER
+from src.mcp_tools.profiling import PROFILER
+from src.mcp_tools.windows import WINDOWS
+
+if TYPE_CHECKING:
+    from mcp.server.fastmcp import FastMCP
+
+
+def _call(fn: Callable[..., Dict[str, Any]], timeout: int, account: Optional[str] = None, **kwargs: Any) -> Dict[str, Any]:
+    # 401 재로그인과 재시도까지 포함해 호출 전체가 timeout 하나의 마감 시각을 공유합니다.
+    deadline = Deadline(int(timeout))
+    with use_account(account):
+        if current_token() is None:
+            _try_auto_login(deadline=deadline)
+        PREFETCHER.mark_used(fn, kwargs)
         try:
-            return list_product_edicode(ProductCode=ProductCode, EdiCode=EdiCode, PageSize=PageSize, Page=Page, SortBy=SortBy, timeout=int(timeout))
-        except UnauthorizedError:
-            _try_auto_login(timeout)
-            return list_product_edicode(ProductCode=ProductCode, EdiCode=EdiCode, PageSize=PageSize, Page=Page, SortBy=SortBy, timeout=int(timeout))
+            try:
+                result = RESPONSE_CACHE.call(fn, deadline=deadline, **kwargs)
+            except UnauthorizedError:
+                _try_auto_login(deadline=deadline, refresh=True)
+                result = RESPONSE_CACHE.call(fn, deadline=deadline, **kwargs)
         except DrugInfoError as e:
             raise RuntimeError(str(e))
+        PREFETCHER.observe(fn, kwargs, result)
+        return result
+
+
+def _list_call(
+    fn: Callable[..., Dict[str, Any]], timeout: int, cursor: Optional[str], account: Optional[str] = None, **kwargs: Any
+) -> Dict[str, Any]:
+    # cursor 가 있으면 서버에 보관된 이전 결과 창에서 이어서 응답하고, 없으면 조회 후 응답 크기 상한을 적용합니다.
+    if cursor:
+        return WINDOWS.resume(cursor)
+    return WINDOWS.cap(_call(fn, timeout, account, **kwargs))
+
+
+def _keyword(name: str, annotation: Any, default: Any) -> inspect.Parameter:
+    return inspect.Parameter(name, inspect.Parameter.POSITIONAL_OR_KEYWORD, default=default, annotation=annotation)
+
+
+def _endpoint_tool(endpoint: Endpoint) -> Callable[..., Dict[str, Any]]:
+    """엔드포인트 표의 항목으로 MCP 도구 함수를 만듭니다. 도구 스키마는 __signature__ 에서 만들어집니다."""
+    fn = getattr(client, endpoint.name)
+    names = {p.tool_name: p.name for p in endpoint.params}
+    extra = [_keyword("timeout", int, 15)]
+    if endpoint.listing:
+        extra.append(_keyword("cursor", Optional[str], None))
+    extra.append(_keyword("account", Optional[str], None))
+
+    def tool(**kwargs: Any) -> Dict[str, Any]:
+        timeout = kwargs.pop("timeout", 15)
+        cursor = kwargs.pop("cursor", None)
+        account = kwargs.pop("account", None)
+        args = {names[k]: v for k, v in kwargs.items()}
+        if endpoint.listing:
+            return _list_call(fn, timeout, cursor, account, **args)
+        return _call(fn, timeout, account=account, **args)
+
+    tool.__name__ = tool.__qualname__ = endpoint.tool_name
+    tool.__signature__ = inspect.Signature(  # type: ignore[attr-defined]
+        endpoint.parameters(tool=True) + extra, return_annotation=Dict[str, Any]
+    )
+    return tool
+
+
+def register_druginfo_tools(mcp: "FastMCP") -> None:
+    for endpoint in ENDPOINTS.values():
+        mcp.tool(name=endpoint.tool_name)(offloaded(PROFILER.profiled(_endpoint_tool(endpoint))))
+
+    @mcp.tool(name="druginfo_profile_report")
+    def druginfo_profile_report(tool: Optional[str] = None, limit: int = 20, rate: Optional[float] = None) -> Dict[str, Any]:
+        """표본 프로파일(cProfile/tracemalloc)을 합산한 hotspot 을 반환합니다. rate 를 주면 표본 비율(0~1)을 바꿉니다."""
+        if rate is not None:
+            PROFILER.rate = min(1.0, max(0.0, float(rate)))
+        return PROFILER.report(tool=tool, limit=limit)
+
+    @mcp.tool(name="druginfo_prefetch_stats")
+    def druginfo_prefetch_stats(limit: int = 10) -> Dict[str, Any]:
+        """예측 선조회 지표(전이별 issued/completed/used/dropped, precision)와 학습된 호출 전이를 반환합니다."""
+        return PREFETCHER.stats(limit=limit)
+
+    @mcp.tool(name="druginfo_cache_stats")
+    def druginfo_cache_stats() -> Dict[str, Any]:
+        """응답 캐시 지표(backend, hit/miss, 상태별 fresh/stale/revalidated/miss 횟수, 선조회 상태별 횟수, 재조회 중인 키 수)를 반환합니다."""
+        return RESPONSE_CACHE.stats()
 
     # --- Non-GET tool wrappers removed (POST-only tools no longer exposed) ---
 
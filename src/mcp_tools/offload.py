@@ -0,0 +1,22 @@
+import functools
+from typing import Any, Awaitable, Callable, TypeVar
+
+
+T = TypeVar("T")
+
+
+def offloaded(fn: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+    """동기 도구를 스레드 풀에서 실행하는 async 도구로 감쌉니다.
+
+    FastMCP 는 동기 도구를 이벤트 루프에서 바로 호출하므로, 그대로 두면 업스트림 응답을 기다리는 동안
+    같은 워커의 다른 요청을 처리하지 못합니다. 시그니처(__wrapped__, __signature__)는 그대로 유지됩니다.
+    """
+
+    @functools.wraps(fn)
+    async def tool(*args: Any, **kwargs: Any) -> T:
+        # anyio 는 mcp 가 함께 설치하며, 도구가 실제로 호출될 때 불러옵니다.
+        import anyio
+
+        return await anyio.to_thread.run_sync(functools.partial(fn, *args, **kwargs))
+
+    return tool
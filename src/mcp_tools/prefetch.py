@@ -0,0 +1,313 @@
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from src.credentials import current_account
+from src.deadline import Deadline
+from src.druginfo import get_main_ingredient_by_code, get_product_by_code
+from src.druginfo.cache import RESPONSE_CACHE, ResponseCache, cache_key
+from src.druginfo.pages import extract_items
+from src.settings import env_float, env_int
+
+
+def _codes(data: Any, fields: Tuple[str, ...], limit: int) -> List[str]:
+    """dict 최상위(또는 한 단계 아래 목록)에서 코드 값을 순서대로, 중복 없이 최대 limit 개 찾습니다."""
+    found: List[str] = []
+
+    def _add(value: Any) -> None:
+        if isinstance(value, (str, int)) and not isinstance(value, bool) and str(value) and str(value) not in found:
+            found.append(str(value))
+
+    if not isinstance(data, dict):
+        return found
+    for key, value in data.items():
+        if len(found) >= limit:
+            break
+        if key in fields:
+            for v in value if isinstance(value, list) else [value]:
+                _add(v)
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, dict):
+                    for field in fields:
+                        _add(item.get(field))
+    return found[:limit]
+
+
+def _top_items(field: str) -> Callable[[Dict[str, Any], Dict[str, Any], int], List[Dict[str, Any]]]:
+    def derive(args: Dict[str, Any], result: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+        codes: List[str] = []
+        for item in extract_items(result):
+            code = item.get(field)
+            if code and str(code) not in codes:
+                codes.append(str(code))
+            if len(codes) >= limit:
+                break
+        return [{"code": c} for c in codes]
+
+    return derive
+
+
+def _ingredient_of_product(args: Dict[str, Any], result: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+    fields = ("ingredientCode", "mainIngredientCode", "ingredientCodes", "mainIngredientCodes")
+    return [{"code": c} for c in _codes(result, fields, limit)]
+
+
+class Transition(NamedTuple):
+    target: Callable[..., Dict[str, Any]]
+    derive: Callable[[Dict[str, Any], Dict[str, Any], int], List[Dict[str, Any]]]
+
+
+# 이전 호출(함수 이름) -> 다음 호출 후보와, 이전 호출의 인자/결과에서 다음 호출 인자를 만드는 방법
+TRANSITIONS: Dict[str, Dict[str, Transition]] = {
+    "list_product": {"get_product_by_code": Transition(get_product_by_code, _top_items("productCode"))},
+    "list_product_edicode": {"get_product_by_code": Transition(get_product_by_code, _top_items("productCode"))},
+    "list_main_ingredient": {
+        "get_main_ingredient_by_code": Transition(get_main_ingredient_by_code, _top_items("ingredientCode"))
+    },
+    "get_product_by_code": {"get_main_ingredient_by_code": Transition(get_main_ingredient_by_code, _ingredient_of_product)},
+}
+
+
+class Prefetcher:
+    """도구 호출 순서에서 '이 호출 다음에 무엇이 오는가'를 학습하고, 확률이 높은 다음 호출을 미리 캐시에 올립니다.
+
+    - 전이 횟수는 계정별 직전 호출(window 초 이내) 기준으로 셉니다. EDB_ACCESS_LOG 가 있으면 기록을 남기고
+      시작 시 읽어 학습 상태를 복원합니다.
+    - 투기적 조회는 동시 실행 수(max_inflight)와 분당 건수(per_minute)로 제한하고, 넘치면 버립니다.
+    - 미리 올린 키가 실제 호출에서 쓰이면 used 로 세어 precision(used / completed)을 계산합니다.
+      결과 순위별 precision 도 따로 세어, 거의 쓰이지 않는 순위(예: 목록의 3번째 결과)는 선조회하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        cache: Optional[ResponseCache] = None,
+        log_path: Optional[str] = None,
+        top: int = 3,
+        min_probability: float = 0.3,
+        min_observations: int = 5,
+        window: float = 120.0,
+        max_inflight: int = 4,
+        per_minute: int = 120,
+        timeout: int = 10,
+    ) -> None:
+        self.enabled = bool(enabled)
+        self.cache = cache or RESPONSE_CACHE
+        self.log_path = log_path
+        self.top = max(1, int(top))
+        self.min_probability = float(min_probability)
+        self.min_observations = max(1, int(min_observations))
+        self.window = float(window)
+        self.max_inflight = max(1, int(max_inflight))
+        self.per_minute = max(1, int(per_minute))
+        self.timeout = int(timeout)
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._last: Dict[str, Tuple[str, float]] = {}
+        self._pending: "OrderedDict[str, Tuple[str, int, float]]" = OrderedDict()
+        self._ranks: Dict[str, List[List[int]]] = {}
+        self._explore = 0
+        self._issued_at: Deque[float] = deque()
+        self._inflight = 0
+        self._metrics: Dict[str, Dict[str, int]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._log_lock = threading.Lock()
+        if self.log_path:
+            self._replay(self.log_path)
+
+    @classmethod
+    def from_env(cls) -> "Prefetcher":
+        return cls(
+            enabled=(os.getenv("EDB_PREFETCH") or "").strip().lower() in ("1", "true", "yes", "on"),
+            log_path=os.getenv("EDB_ACCESS_LOG") or None,
+            top=env_int("EDB_PREFETCH_TOP", 3),
+            min_probability=env_float("EDB_PREFETCH_MIN_PROB", 0.3),
+            max_inflight=env_int("EDB_PREFETCH_MAX_INFLIGHT", 4),
+            per_minute=env_int("EDB_PREFETCH_PER_MINUTE", 120),
+        )
+
+    # --- 학습 ---
+
+    def _learn(self, account: str, name: str, at: float) -> None:
+        prev = self._last.get(account)
+        if prev is not None and at - prev[1] <= self.window:
+            row = self._counts.setdefault(prev[0], {})
+            row[name] = row.get(name, 0) + 1
+        self._last[account] = (name, at)
+
+    def _replay(self, path: str) -> None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self._learn(str(entry.get("account") or ""), str(entry["tool"]), float(entry["at"]))
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except OSError:
+            return
+        self._last.clear()
+
+    def _append_log(self, account: str, name: str, args: Dict[str, Any], at: float) -> None:
+        if not self.log_path:
+            return
+        line = json.dumps({"at": round(at, 3), "account": account, "tool": name, "args": args}, ensure_ascii=False, default=str)
+        try:
+            with self._log_lock, open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError:
+            pass
+
+    def probabilities(self, name: str) -> Dict[str, float]:
+        row = self._counts.get(name) or {}
+        total = sum(row.values())
+        if total < self.min_observations:
+            return {}
+        return {target: count / total for target, count in row.items()}
+
+    # --- 실제 호출 연동 ---
+
+    def observe(self, fn: Callable[..., Any], kwargs: Dict[str, Any], result: Any) -> None:
+        """실제 도구 호출이 끝난 뒤 호출됩니다. 학습하고, 조건이 맞으면 다음 호출을 미리 조회합니다."""
+        name = fn.__name__
+        account = current_account()
+        at = time.time()
+        args = {k: v for k, v in kwargs.items() if v is not None}
+        with self._lock:
+            self._learn(account, name, at)
+            predicted = [
+                (target, p) for target, p in self.probabilities(name).items() if p >= self.min_probability
+            ]
+        self._append_log(account, name, args, at)
+        if not self.enabled or not self.cache.enabled or not isinstance(result, dict):
+            return
+        for target, _p in predicted:
+            transition = TRANSITIONS.get(name, {}).get(target)
+            if transition is None:
+                continue
+            for rank, target_args in enumerate(transition.derive(args, result, self.top)):
+                self._schedule(f"{name}->{target}", rank, transition.target, target_args)
+
+    def mark_used(self, fn: Callable[..., Any], kwargs: Dict[str, Any]) -> None:
+        """실제 호출 직전에 호출됩니다. 미리 올린 키였다면 used 로 셉니다."""
+        if not self._pending:
+            return
+        key = cache_key(fn, kwargs)
+        with self._lock:
+            entry = self._pending.pop(key, None)
+            if entry is not None:
+                self._metric(entry[0], "used")
+                self._rank_row(entry[0], entry[1])[1] += 1
+
+    # --- 투기적 조회 ---
+
+    def _metric(self, transition: str, name: str, n: int = 1) -> None:
+        row = self._metrics.setdefault(
+            transition,
+            {"issued": 0, "completed": 0, "used": 0, "failed": 0, "skipped": 0, "dropped": 0, "pruned": 0, "expired": 0},
+        )
+        row[name] += n
+
+    def _rank_row(self, transition: str, rank: int) -> List[int]:
+        rows = self._ranks.setdefault(transition, [])
+        while len(rows) <= rank:
+            rows.append([0, 0])
+        return rows[rank]
+
+    def _rank_pays_off(self, transition: str, rank: int) -> bool:
+        """이 순위의 선조회가 실제로 쓰인 비율이 min_probability 미만이면 건너뜁니다. (10번에 1번은 다시 시도)"""
+        completed, used = self._rank_row(transition, rank)
+        if completed < self.min_observations or used / completed >= self.min_probability:
+            return True
+        self._explore += 1
+        return self._explore % 10 == 0
+
+    def _expire(self, now: float) -> None:
+        while self._pending:
+            key, (transition, _rank, expires_at) = next(iter(self._pending.items()))
+            if expires_at > now and len(self._pending) <= 4096:
+                break
+            self._pending.popitem(last=False)
+            self._metric(transition, "expired")
+
+    def _schedule(self, transition: str, rank: int, fn: Callable[..., Dict[str, Any]], kwargs: Dict[str, Any]) -> None:
+        key = cache_key(fn, kwargs)
+        # 공유 저장소 조회(디스크 I/O)는 잠금 밖에서 합니다.
+        cached = self.cache.contains(key)
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            if cached or key in self._pending:
+                self._metric(transition, "skipped")
+                return
+            if not self._rank_pays_off(transition, rank):
+                self._metric(transition, "pruned")
+                return
+            while self._issued_at and now - self._issued_at[0] > 60.0:
+                self._issued_at.popleft()
+            if self._inflight >= self.max_inflight or len(self._issued_at) >= self.per_minute:
+                self._metric(transition, "dropped")
+                return
+            self._inflight += 1
+            self._issued_at.append(now)
+            self._metric(transition, "issued")
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_inflight, thread_name_prefix="edb-prefetch")
+            executor = self._executor
+        # 현재 계정 문맥을 그대로 가져가 같은 토큰으로 조회합니다.
+        ctx = contextvars.copy_context()
+        executor.submit(ctx.run, self._run, transition, rank, key, fn, kwargs)
+
+    def _run(self, transition: str, rank: int, key: str, fn: Callable[..., Dict[str, Any]], kwargs: Dict[str, Any]) -> None:
+        ok = False
+        try:
+            self.cache.call(fn, prefetch=True, deadline=Deadline(self.timeout), **kwargs)
+            ok = True
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._inflight -= 1
+                if ok:
+                    self._metric(transition, "completed")
+                    self._rank_row(transition, rank)[0] += 1
+                    self._pending[key] = (transition, rank, time.monotonic() + self.cache.ttl)
+                else:
+                    self._metric(transition, "failed")
+
+    def stats(self, limit: int = 10) -> Dict[str, Any]:
+        with self._lock:
+            self._expire(time.monotonic())
+            transitions = {}
+            for name, row in self._metrics.items():
+                completed = row["completed"]
+                transitions[name] = dict(
+                    row,
+                    precision=round(row["used"] / completed, 4) if completed else None,
+                    rankPrecision=[round(u / c, 4) if c else None for c, u in self._ranks.get(name, [])],
+                )
+            completed = sum(r["completed"] for r in self._metrics.values())
+            used = sum(r["used"] for r in self._metrics.values())
+            learned = {
+                source: sorted(
+                    ({"next": t, "count": c} for t, c in row.items()), key=lambda x: x["count"], reverse=True
+                )[: max(1, int(limit))]
+                for source, row in self._counts.items()
+            }
+            return {
+                "enabled": self.enabled,
+                "inflight": self._inflight,
+                "pending": len(self._pending),
+                "precision": round(used / completed, 4) if completed else None,
+                "transitions": transitions,
+                "learned": learned,
+            }
+
+
+PREFETCHER = Prefetcher.from_env()
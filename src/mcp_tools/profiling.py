@@ -0,0 +1,222 @@
+import functools
+import glob
+import json
+import os
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, TypeVar
+
+from src.settings import cache_path, env_float, env_int
+
+if TYPE_CHECKING:
+    import cProfile
+    import tracemalloc
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def default_profile_dir() -> str:
+    return cache_path("profiles")
+
+
+def _function_label(key: Any) -> str:
+    filename, line, name = key
+    if filename == "~":
+        return name
+    if os.path.isabs(filename):
+        rel = os.path.relpath(filename)
+        filename = filename if rel.startswith("..") else rel
+    return f"{filename}:{line}({name})"
+
+
+class ToolProfiler:
+    """도구 호출 일부(rate)를 표본으로 cProfile/tracemalloc 을 걸어 호출별 결과를 directory 에 기록합니다.
+
+    tracemalloc 은 프로세스 전역이므로 한 번에 한 호출만 측정하고, 그동안 들어온 다른 호출은 측정 없이 실행합니다.
+    directory 에는 최근 max_files 개의 기록(.json, 원본 .prof)만 남습니다.
+    """
+
+    def __init__(self, rate: float = 0.0, directory: Optional[str] = None, max_files: int = 200, top: int = 25) -> None:
+        self.rate = min(1.0, max(0.0, float(rate)))
+        self.directory = directory or default_profile_dir()
+        self.max_files = max(1, int(max_files))
+        self.top = max(1, int(top))
+        self._active = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ToolProfiler":
+        return cls(
+            rate=env_float("EDB_PROFILE_RATE", 0.0),
+            directory=os.getenv("EDB_PROFILE_DIR") or None,
+            max_files=env_int("EDB_PROFILE_MAX_FILES", 200),
+        )
+
+    def profiled(self, fn: F) -> F:
+        """도구 함수를 감쌉니다. 시그니처(__wrapped__)는 그대로 유지되어 도구 스키마가 바뀌지 않습니다."""
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if self.rate <= 0 or random.random() >= self.rate or not self._active.acquire(blocking=False):
+                return fn(*args, **kwargs)
+            try:
+                return self._run(fn, args, kwargs)
+            finally:
+                self._active.release()
+
+        return wrapper  # type: ignore[return-value]
+
+    def _run(self, fn: Callable[..., Any], args: Any, kwargs: Dict[str, Any]) -> Any:
+        # 표본으로 뽑힌 첫 호출에서 불러옵니다. (기본값 rate=0 이면 서버 시작 시 불러오지 않음)
+        import cProfile
+        import tracemalloc
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+            before = None
+        else:
+            before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base_memory = tracemalloc.get_traced_memory()[0]
+        profile = cProfile.Profile()
+        error: Optional[str] = None
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            return fn(*args, **kwargs)
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            profile.disable()
+            seconds = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1] - base_memory
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+            )
+            if started_tracing:
+                tracemalloc.stop()
+            try:
+                self._write(fn.__name__, kwargs, seconds, peak, error, profile, snapshot, before)
+            except OSError:
+                pass
+
+    def _write(
+        self,
+        tool: str,
+        kwargs: Dict[str, Any],
+        seconds: float,
+        peak: int,
+        error: Optional[str],
+        profile: "cProfile.Profile",
+        snapshot: "tracemalloc.Snapshot",
+        before: "Optional[tracemalloc.Snapshot]",
+    ) -> None:
+        import pstats
+
+        stats = pstats.Stats(profile)
+        rows = stats.stats  # type: ignore[attr-defined]
+        by_time = sorted(rows.items(), key=lambda kv: kv[1][2], reverse=True)[: self.top]
+        by_cum = sorted(rows.items(), key=lambda kv: kv[1][3], reverse=True)[: self.top]
+        hotspots = {
+            _function_label(key): {"calls": value[1], "tottime": round(value[2], 6), "cumtime": round(value[3], 6)}
+            for key, value in by_time + by_cum
+        }
+        if before is not None:
+            diffs = snapshot.compare_to(before, "lineno")
+            allocations = [
+                {"where": str(d.traceback[0]), "sizeBytes": d.size_diff, "count": d.count_diff}
+                for d in diffs[: self.top]
+                if d.size_diff > 0
+            ]
+        else:
+            allocations = [
+                {"where": str(s.traceback[0]), "sizeBytes": s.size, "count": s.count}
+                for s in snapshot.statistics("lineno")[: self.top]
+            ]
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"{time.time_ns()}-{tool}"
+        stats.dump_stats(os.path.join(self.directory, name + ".prof"))
+        record = {
+            "tool": tool,
+            "at": int(time.time()),
+            "args": {k: v for k, v in kwargs.items() if v is not None},
+            "seconds": round(seconds, 6),
+            "peakBytes": peak,
+            "error": error,
+            "hotspots": hotspots,
+            "allocations": allocations,
+        }
+        tmp = os.path.join(self.directory, name + ".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False, default=str)
+        os.replace(tmp, os.path.join(self.directory, name + ".json"))
+        self._rotate()
+
+    def _rotate(self) -> None:
+        files = sorted(glob.glob(os.path.join(self.directory, "*.json")))
+        for path in files[: max(0, len(files) - self.max_files)]:
+            for p in (path, path[: -len(".json")] + ".prof"):
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+
+    def _load(self, tool: Optional[str]) -> List[Dict[str, Any]]:
+        records: List[Dict[str, Any]] = []
+        for path in sorted(glob.glob(os.path.join(self.directory, "*.json"))):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    record = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if tool is None or record.get("tool") == tool:
+                records.append(record)
+        return records
+
+    def report(self, tool: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
+        """기록된 표본을 합산해 도구별 요약, 함수별 hotspot, 할당 위치 상위 목록을 반환합니다."""
+        records = self._load(tool)
+        tools: Dict[str, Dict[str, Any]] = {}
+        hotspots: Dict[str, Dict[str, Any]] = {}
+        allocations: Dict[str, Dict[str, Any]] = {}
+        for record in records:
+            summary = tools.setdefault(record["tool"], {"samples": 0, "errors": 0, "seconds": [], "maxPeakBytes": 0})
+            summary["samples"] += 1
+            summary["errors"] += 1 if record.get("error") else 0
+            summary["seconds"].append(record.get("seconds", 0.0))
+            summary["maxPeakBytes"] = max(summary["maxPeakBytes"], record.get("peakBytes", 0))
+            for label, value in (record.get("hotspots") or {}).items():
+                agg = hotspots.setdefault(label, {"function": label, "samples": 0, "calls": 0, "tottime": 0.0, "cumtime": 0.0})
+                agg["samples"] += 1
+                agg["calls"] += value.get("calls", 0)
+                agg["tottime"] += value.get("tottime", 0.0)
+                agg["cumtime"] += value.get("cumtime", 0.0)
+            for alloc in record.get("allocations") or []:
+                agg = allocations.setdefault(alloc["where"], {"where": alloc["where"], "samples": 0, "sizeBytes": 0, "count": 0})
+                agg["samples"] += 1
+                agg["sizeBytes"] += alloc.get("sizeBytes", 0)
+                agg["count"] += alloc.get("count", 0)
+        for summary in tools.values():
+            seconds = sorted(summary.pop("seconds"))
+            summary["avgSeconds"] = round(sum(seconds) / len(seconds), 6)
+            summary["p95Seconds"] = round(seconds[max(0, int(len(seconds) * 0.95) - 1)], 6)
+            summary["maxSeconds"] = round(seconds[-1], 6)
+        for agg in hotspots.values():
+            agg["tottime"] = round(agg["tottime"], 6)
+            agg["cumtime"] = round(agg["cumtime"], 6)
+        limit = max(1, int(limit))
+        return {
+            "rate": self.rate,
+            "directory": self.directory,
+            "samples": len(records),
+            "tools": tools,
+            "hotspots": sorted(hotspots.values(), key=lambda a: a["tottime"], reverse=True)[:limit],
+            "cumulative": sorted(hotspots.values(), key=lambda a: a["cumtime"], reverse=True)[:limit],
+            "allocations": sorted(allocations.values(), key=lambda a: a["sizeBytes"], reverse=True)[:limit],
+        }
+
+
+PROFILER = ToolProfiler.from_env()
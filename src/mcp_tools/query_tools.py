@@ -0,0 +1,44 @@
+import inspect
+from typing import TYPE_CHECKING, Optional, Dict, Any, Callable
+
+from src.druginfo import DrugInfoError
+from src.druginfo.endpoints import ENDPOINTS
+from src.druginfo.query import get_engine
+from src.mcp_tools.offload import offloaded
+from src.mcp_tools.windows import WINDOWS
+
+if TYPE_CHECKING:
+    from mcp.server.fastmcp import FastMCP
+
+
+# 로컬 조회 도구 이름 -> (미러 데이터셋, 같은 조건을 쓰는 목록 엔드포인트)
+QUERY_TOOLS = {
+    "druginfo_query_main_ingredient": ("main_ingredient", "list_main_ingredient"),
+    "druginfo_query_product": ("product", "list_product"),
+}
+
+
+def _query_tool(name: str, dataset: str, endpoint_name: str) -> Callable[..., Dict[str, Any]]:
+    endpoint = ENDPOINTS[endpoint_name]
+
+    def tool(cursor: Optional[str] = None, **params: Any) -> Dict[str, Any]:
+        if cursor:
+            return WINDOWS.resume(cursor)
+        try:
+            result = get_engine(dataset).query(**params)
+        except DrugInfoError as e:
+            raise RuntimeError(str(e))
+        return WINDOWS.cap(result)
+
+    tool.__name__ = tool.__qualname__ = name
+    tool.__doc__ = f"{endpoint.tool_name} 와 같은 조건을 로컬 미러(EDB_MIRROR_DIR)에서 조회합니다."
+    cursor = inspect.Parameter("cursor", inspect.Parameter.POSITIONAL_OR_KEYWORD, default=None, annotation=Optional[str])
+    tool.__signature__ = inspect.Signature(  # type: ignore[attr-defined]
+        endpoint.parameters(tool=True) + [cursor], return_annotation=Dict[str, Any]
+    )
+    return tool
+
+
+def register_query_tools(mcp: "FastMCP") -> None:
+    for name, (dataset, endpoint_name) in QUERY_TOOLS.items():
+        mcp.tool(name=name)(offloaded(_query_tool(name, dataset, endpoint_name)))
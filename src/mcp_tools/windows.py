@@ -0,0 +1,158 @@
+import base64
+import json
+import secrets
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+from src.druginfo.pages import extract_items, items_path, replace_items
+from src.druginfo.records import RecordTable
+from src.settings import env_int
+from src.shared_store import get_shared_store
+
+
+class ResultWindowStore:
+    """응답 크기 상한을 넘는 목록 결과를 잠시 보관하고, 이어받기 커서로 나눠 돌려줍니다.
+
+    후속 호출은 업스트림을 다시 조회하지 않고 메모리의 창(window)에서 응답합니다.
+    공유 저장소(EDB_SHARED_STORE)가 있으면 창을 거기에도 두어, 다른 워커가 받은 cursor 호출도 이어서 응답합니다.
+    """
+
+    def __init__(
+        self,
+        max_records: int = 100,
+        max_bytes: int = 256 * 1024,
+        ttl: float = 300.0,
+        max_windows: int = 64,
+    ) -> None:
+        self.max_records = max(1, int(max_records))
+        self.max_bytes = max(1, int(max_bytes))
+        self.ttl = float(ttl)
+        self.max_windows = max(1, int(max_windows))
+        self._windows: "OrderedDict[str, Tuple[float, Any, Tuple[str, ...], Union[RecordTable, List[Any]], Sequence[int]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ResultWindowStore":
+        return cls(
+            max_records=env_int("EDB_MAX_RESPONSE_RECORDS", 100),
+            max_bytes=env_int("EDB_MAX_RESPONSE_BYTES", 256 * 1024),
+            ttl=env_int("EDB_WINDOW_TTL", 300),
+            max_windows=env_int("EDB_MAX_WINDOWS", 64),
+        )
+
+    @staticmethod
+    def _encode(window_id: str, offset: int) -> str:
+        raw = f"{window_id}:{offset}".encode("ascii")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _decode(cursor: str) -> Tuple[str, int]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            window_id, offset = base64.urlsafe_b64decode(padded.encode("ascii")).decode("ascii").rsplit(":", 1)
+            return window_id, int(offset)
+        except Exception:
+            raise RuntimeError("잘못된 cursor 입니다")
+
+    def _purge(self, now: float) -> None:
+        for wid in [w for w, entry in self._windows.items() if entry[0] <= now]:
+            self._windows.pop(wid, None)
+        while len(self._windows) > self.max_windows:
+            self._windows.popitem(last=False)
+
+    def _slice(self, sizes: Sequence[int], offset: int) -> int:
+        end = offset
+        used = 0
+        while end < len(sizes) and end - offset < self.max_records:
+            if end > offset and used + sizes[end] > self.max_bytes:
+                break
+            used += sizes[end]
+            end += 1
+        return end
+
+    def _respond(self, window_id: str, data: Any, path: Tuple[str, ...], items: Union[RecordTable, List[Any]], sizes: Sequence[int], offset: int, expires_at: float) -> Any:
+        end = self._slice(sizes, offset)
+        page = replace_items(data, path, items[offset:end] if isinstance(items, list) else items.rows(offset, end))
+        meta = {
+            "offset": offset,
+            "returned": end - offset,
+            "total": len(items),
+            "cursor": self._encode(window_id, end) if end < len(items) else None,
+            "expiresIn": max(0, int(expires_at - time.monotonic())),
+        }
+        if isinstance(page, dict):
+            page = dict(page, window=meta)
+        else:
+            page = {"items": page, "window": meta}
+        return page
+
+    def cap(self, data: Any) -> Any:
+        """상한 이내면 그대로, 넘으면 첫 구간과 cursor 를 반환합니다."""
+        path = items_path(data)
+        if path is None:
+            return data
+        raw = data
+        for key in path:
+            raw = raw[key]
+        if len(raw) <= self.max_records and len(json.dumps(data, ensure_ascii=False).encode("utf-8")) <= self.max_bytes:
+            return data
+        sizes = array("I", (len(json.dumps(item, ensure_ascii=False).encode("utf-8")) + 1 for item in raw))
+        # 보관 중에는 레코드 배열을 뺀 응답 틀과 열 저장 테이블만 유지합니다.
+        # dict 가 아닌 항목이 섞인 배열은 열 저장으로 원래 모양을 보존할 수 없으므로 배열 그대로 둡니다.
+        dicts = extract_items(data)
+        items: Union[RecordTable, List[Any]] = RecordTable.from_records(dicts) if len(dicts) == len(raw) else list(raw)
+        data = replace_items(data, path, [])
+        window_id = secrets.token_urlsafe(12)
+        now = time.monotonic()
+        expires_at = now + self.ttl
+        with self._lock:
+            self._purge(now)
+            self._windows[window_id] = (expires_at, data, path, items, sizes)
+            self._purge(now)
+        store = get_shared_store()
+        if store is not None:
+            # 워커가 여럿이면 후속 cursor 호출이 다른 워커로 갈 수 있으므로 공유 저장소에도 둡니다.
+            entry = {"data": data, "path": list(path), "items": list(raw), "expiresAt": time.time() + self.ttl}
+            store.set("window:" + window_id, json.dumps(entry, ensure_ascii=False, default=str), self.ttl)
+        return self._respond(window_id, data, path, items, sizes, 0, expires_at)
+
+    def _load_shared(self, window_id: str) -> Optional[Tuple[float, Any, Tuple[str, ...], Union[RecordTable, List[Any]], Sequence[int]]]:
+        store = get_shared_store()
+        raw = store.get("window:" + window_id) if store is not None else None
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        values = entry["items"]
+        sizes = array("I", (len(json.dumps(item, ensure_ascii=False).encode("utf-8")) + 1 for item in values))
+        items: Union[RecordTable, List[Any]] = (
+            RecordTable.from_records(values) if all(isinstance(v, dict) for v in values) else values
+        )
+        now = time.monotonic()
+        loaded = (now + max(0.0, entry["expiresAt"] - time.time()), entry["data"], tuple(entry["path"]), items, sizes)
+        with self._lock:
+            self._windows[window_id] = loaded
+            self._purge(now)
+        return loaded
+
+    def resume(self, cursor: str) -> Any:
+        window_id, offset = self._decode(cursor)
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            entry = self._windows.get(window_id)
+            if entry is not None:
+                self._windows.move_to_end(window_id)
+        if entry is None:
+            entry = self._load_shared(window_id)
+        if entry is None:
+            raise RuntimeError("cursor 가 만료되었습니다. 처음 조건으로 다시 조회하세요")
+        expires_at, data, path, items, sizes = entry
+        if offset < 0 or offset > len(items):
+            raise RuntimeError("잘못된 cursor 입니다")
+        return self._respond(window_id, data, path, items, sizes, offset, expires_at)
+
+
+WINDOWS = ResultWindowStore.from_env()
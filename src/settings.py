@@ -0,0 +1,19 @@
+import os
+
+
+def env_float(name: str, default: float) -> float:
+    """환경변수를 실수로 읽습니다. 없거나 잘못된 값이면 default."""
+    try:
+        return float(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+def env_int(name: str, default: int) -> int:
+    return int(env_float(name, default))
+
+
+def cache_path(*parts: str) -> str:
+    """pharminfo-mcp 캐시 디렉토리($XDG_CACHE_HOME, 없으면 ~/.cache) 아래 경로."""
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "pharminfo-mcp", *parts)
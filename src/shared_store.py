@@ -0,0 +1,94 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+class SharedStore:
+    """여러 워커 프로세스가 함께 쓰는 SQLite(WAL) 기반 키-값 저장소. 값은 문자열이며 만료 시각을 가집니다."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        # 로그인 토큰도 여기에 두므로 새로 만드는 디렉토리는 0700, 파일은 0600 으로 소유자만 읽게 합니다.
+        os.makedirs(os.path.dirname(os.path.abspath(path)), mode=0o700, exist_ok=True)
+        os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+        # 이전에 기본 umask 로 만든 파일도 좁힙니다. (WAL/SHM 파일은 SQLite 가 DB 파일 권한으로 만듭니다)
+        for name in (path, path + "-wal", path + "-shm"):
+            if os.path.exists(name):
+                os.chmod(name, 0o600)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS lease (name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # 자동 커밋 모드. 쓰기 경합 시 busy_timeout 동안 기다립니다.
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._conn().execute(
+            "SELECT value FROM kv WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        self._conn().execute(
+            "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, time.time() + float(ttl)),
+        )
+
+    def purge(self, older_than: float = 0.0) -> int:
+        cur = self._conn().execute("DELETE FROM kv WHERE expires_at <= ?", (time.time() - float(older_than),))
+        return cur.rowcount
+
+    def acquire(self, name: str, ttl: float = 30.0) -> bool:
+        """프로세스 간 임대(lease) 잠금. 만료된 임대는 다른 워커가 가져갈 수 있습니다."""
+        owner = f"{os.getpid()}:{threading.get_ident()}"
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT owner, expires_at FROM lease WHERE name = ?", (name,)).fetchone()
+            if row is not None and row[0] != owner and row[1] > now:
+                conn.execute("COMMIT")
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO lease (name, owner, expires_at) VALUES (?, ?, ?)",
+                (name, owner, now + float(ttl)),
+            )
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def release(self, name: str) -> None:
+        owner = f"{os.getpid()}:{threading.get_ident()}"
+        self._conn().execute("DELETE FROM lease WHERE name = ? AND owner = ?", (name, owner))
+
+
+_STORE: Optional[SharedStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_shared_store() -> Optional[SharedStore]:
+    """EDB_SHARED_STORE 가 설정된 경우 공유 저장소를 반환합니다. (미설정 시 None)"""
+    global _STORE
+    path = os.getenv("EDB_SHARED_STORE")
+    if not path:
+        return None
+    if _STORE is None or _STORE.path != path:
+        with _STORE_LOCK:
+            if _STORE is None or _STORE.path != path:
+                _STORE = SharedStore(path)
+    return _STORE
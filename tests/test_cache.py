@@ -0,0 +1,151 @@
+import threading
+
+import pytest
+
+from src.druginfo import cache as cache_module
+from src.druginfo.cache import ResponseCache
+from src.druginfo.client import DrugInfoError, UnauthorizedError
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class _Upstream:
+    """호출 횟수를 세고, gate 가 열릴 때까지 응답을 미루거나 error 를 내는 가짜 list_product."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.error = None
+        self.gate = threading.Event()
+        self.gate.set()
+        self._lock = threading.Lock()
+
+    def __call__(self, **kwargs):
+        with self._lock:
+            self.calls += 1
+            version = self.calls
+        self.gate.wait(5)
+        if self.error is not None:
+            raise self.error
+        return {"items": [{"productCode": kwargs.get("ProductCode"), "version": version}]}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    monkeypatch.delenv("EDB_SHARED_STORE", raising=False)
+    clock = _Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def upstream():
+    upstream = _Upstream()
+    upstream.__name__ = "list_product"
+    return upstream
+
+
+def _version(result):
+    return result["items"][0]["version"]
+
+
+def test_prefetch_calls_do_not_count_as_hits_or_misses(clock, upstream):
+    cache = ResponseCache(ttl=60)
+
+    cache.call(upstream, prefetch=True, ProductCode="P1")
+    assert cache.call(upstream, ProductCode="P1")["_cache"]["status"] == "fresh"
+    cache.call(upstream, ProductCode="P2")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["prefetch"] == {"miss": 1}
+
+
+def test_stale_response_triggers_one_background_refresh(clock, upstream):
+    cache = ResponseCache(ttl=10, stale_ttl=100, stale_if_error=1000)
+    assert cache.call(upstream, ProductCode="P1")["_cache"]["status"] == "miss"
+
+    clock.now += 50
+    upstream.gate.clear()
+    results = [cache.call(upstream, ProductCode="P1") for _ in range(3)]
+    assert [r["_cache"]["status"] for r in results] == ["stale"] * 3
+    assert all(r["_cache"]["revalidating"] and _version(r) == 1 for r in results)
+
+    upstream.gate.set()
+    cache._executor.shutdown(wait=True)
+    assert upstream.calls == 2
+    fresh = cache.call(upstream, ProductCode="P1")
+    assert (fresh["_cache"]["status"], _version(fresh)) == ("fresh", 2)
+    assert cache.stats()["status"]["refreshed"] == 1
+
+
+def test_stale_if_error_after_stale_ttl(clock, upstream):
+    cache = ResponseCache(ttl=10, stale_ttl=20, stale_if_error=100)
+    cache.call(upstream, ProductCode="P1")
+
+    clock.now += 50
+    upstream.error = DrugInfoError("upstream down")
+    result = cache.call(upstream, ProductCode="P1")
+    assert result["_cache"]["status"] == "stale"
+    assert result["_cache"]["error"] == "upstream down"
+    assert _version(result) == 1
+    assert cache.stats()["status"]["stale_if_error"] == 1
+
+    # 보관 기한(stale_if_error)이 지나면 저장된 응답으로 대신하지 않습니다.
+    clock.now += 100
+    with pytest.raises(DrugInfoError):
+        cache.call(upstream, ProductCode="P1")
+
+
+def test_revalidated_after_stale_ttl(clock, upstream):
+    cache = ResponseCache(ttl=10, stale_ttl=20, stale_if_error=100)
+    cache.call(upstream, ProductCode="P1")
+
+    clock.now += 50
+    result = cache.call(upstream, ProductCode="P1")
+    assert (result["_cache"]["status"], _version(result)) == ("revalidated", 2)
+
+
+def test_unauthorized_is_never_served_stale(clock, upstream):
+    cache = ResponseCache(ttl=10, stale_ttl=20, stale_if_error=100)
+    cache.call(upstream, ProductCode="P1")
+
+    clock.now += 50
+    upstream.error = UnauthorizedError("401")
+    with pytest.raises(UnauthorizedError):
+        cache.call(upstream, ProductCode="P1")
+    assert "stale_if_error" not in cache.stats()["status"]
+
+
+def test_concurrent_callers_share_one_upstream_request(clock, upstream):
+    cache = ResponseCache(ttl=60)
+    upstream.gate.clear()
+    results = []
+
+    def _call():
+        results.append(cache.call(upstream, ProductCode="P1"))
+
+    threads = [threading.Thread(target=_call) for _ in range(8)]
+    for t in threads:
+        t.start()
+    # 첫 호출이 업스트림에서 기다리는 동안 나머지가 같은 조회에 합류합니다.
+    for _ in range(200):
+        if upstream.calls:
+            break
+        threading.Event().wait(0.005)
+    threading.Event().wait(0.05)
+    upstream.gate.set()
+    for t in threads:
+        t.join(5)
+
+    assert upstream.calls == 1
+    assert len(results) == 8
+    assert {_version(r) for r in results} == {1}
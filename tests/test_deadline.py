@@ -0,0 +1,112 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.deadline import Deadline, DeadlineExceededError
+
+
+def test_sleep_refuses_backoff_longer_than_remaining():
+    deadline = Deadline(0.3)
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededError, match="재시도"):
+        deadline.sleep(0.5, "page 1")
+    # 기다리지 않고 바로 실패합니다.
+    assert time.monotonic() - started < 0.1
+
+    deadline.sleep(0.05)
+    assert 0.0 < deadline.remaining() < 0.3
+
+
+def test_check_after_expiry():
+    deadline = Deadline(0.05)
+    time.sleep(0.06)
+    assert deadline.expired()
+    with pytest.raises(DeadlineExceededError, match="login"):
+        deadline.check("login")
+
+
+def test_page_retries_stop_at_the_page_deadline(monkeypatch):
+    from src.druginfo.catalog import CATALOG_DATASETS, CatalogDataset
+    from src.druginfo.export import iter_pages
+
+    calls = []
+
+    def fetch(PageSize, Page, deadline=None, **params):
+        calls.append(time.monotonic())
+        raise ConnectionError("upstream down")
+
+    fetch.__name__ = "list_product"
+    monkeypatch.setitem(CATALOG_DATASETS, "fake", CatalogDataset("fake", fetch, ("id",)))
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        next(iter_pages("fake", page_size=10, max_concurrency=1, retries=5, timeout=1))
+    # 시도마다 0.5초 대기 뒤 1초 대기는 남은 시간을 넘으므로 거절됩니다. (실패한 페이지는 한 번 더 시도)
+    assert len(calls) == 4
+    assert time.monotonic() - started < 1.5
+
+
+class _SlowUpstream(BaseHTTPRequestHandler):
+    """요청마다 delay 초 뒤에 응답하고, 조회는 항상 401 을 돌려주는 가짜 업스트림."""
+
+    protocol_version = "HTTP/1.1"
+    delay = 0.4
+    requests_seen: list = []
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body):
+        time.sleep(self.delay)
+        raw = json.dumps(body).encode("utf-8")
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+        except OSError:
+            pass
+
+    def do_POST(self):
+        self.requests_seen.append("POST")
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self._send(200, {"data": {"accessToken": "token-%d" % len(self.requests_seen)}})
+
+    def do_GET(self):
+        self.requests_seen.append("GET")
+        self._send(401, {"message": "unauthorized"})
+
+
+@pytest.fixture
+def slow_upstream(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowUpstream)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = "http://127.0.0.1:%d" % server.server_address[1]
+    monkeypatch.setenv("EDB_BASE_URL", base)
+    monkeypatch.setenv("EDB_LOGIN_URL", base + "/v1/auth/login")
+    monkeypatch.setenv("EDB_ACCOUNTS", json.dumps({"deadline-test": {"userId": "user", "password": "secret"}}))
+    monkeypatch.delenv("EDB_SHARED_STORE", raising=False)
+    _SlowUpstream.requests_seen = []
+    yield _SlowUpstream.requests_seen
+    server.shutdown()
+
+
+def test_login_and_401_retry_share_one_deadline(slow_upstream):
+    pytest.importorskip("requests")
+    from src.druginfo import client
+    from src.mcp_tools.druginfo_tools import _call
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        _call(client.get_product_by_code, 1, account="deadline-test", code="P1")
+    elapsed = time.monotonic() - started
+
+    # 로그인 -> 조회(401) -> 재로그인이 1초 하나를 나눠 쓰고, 남은 시간이 없으면 재조회 없이 실패합니다.
+    assert slow_upstream[:3] == ["POST", "GET", "POST"]
+    assert slow_upstream.count("GET") == 1
+    assert elapsed < 1.3
@@ -0,0 +1,33 @@
+import pytest
+
+from src.druginfo.endpoints import ENDPOINTS
+
+
+def test_request_maps_names_to_query_keys():
+    path, query = ENDPOINTS["list_main_ingredient_drug_effect"].request({"pageSize": 5, "sortBy": "name"})
+    assert path == "/v1/druginfo/main-ingredient/drug-effect"
+    assert query == {"PageSize": 5, "SortBy": "name"}
+
+
+def test_request_uses_legacy_aliases_only_as_fallback():
+    endpoint = ENDPOINTS["list_product"]
+    assert endpoint.request({"q": "tylenol", "page": 2, "size": "10", "crop": True})[1] == {
+        "crop": "true", "pillName": "tylenol", "Page": 2, "PageSize": 10,
+    }
+    assert endpoint.request({"q": "a", "pillName": "b", "PageSize": 5, "size": 10})[1] == {
+        "pillName": "b", "PageSize": 5,
+    }
+
+
+def test_request_fills_path_params():
+    endpoint = ENDPOINTS["get_main_ingredient_drug_effect_by_id"]
+    assert endpoint.request({"effect_id": "7"}) == ("/v1/druginfo/main-ingredient/drug-effect/7", {})
+    with pytest.raises(ValueError, match="effect_id"):
+        endpoint.request({})
+
+
+def test_lookup_accepts_name_tool_name_and_query_key():
+    endpoint = ENDPOINTS["get_main_ingredient_drug_effect_by_id"]
+    assert endpoint.lookup("effect_id") is endpoint.lookup("effectId") is endpoint.lookup("id")
+    assert ENDPOINTS["list_product"].lookup("Page").name == "Page"
+    assert ENDPOINTS["list_product"].lookup("unknown") is None
@@ -0,0 +1,32 @@
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("dotenv")
+
+from src.login_jwt import parse_batch_line  # noqa: E402
+
+BASE = "https://api.example.com"
+
+
+def test_endpoint_spec_matches_client_call():
+    url, params = parse_batch_line('{"endpoint": "list_main_ingredient_drug_effect", "params": {"pageSize": 5}}', BASE)
+    assert url == BASE + "/v1/druginfo/main-ingredient/drug-effect"
+    assert params == {"PageSize": 5}
+
+
+def test_endpoint_spec_translates_legacy_aliases():
+    _url, params = parse_batch_line('{"endpoint": "list_product", "params": {"q": "x", "page": 2, "crop": true}}', BASE)
+    assert params == {"crop": "true", "pillName": "x", "Page": 2}
+
+
+@pytest.mark.parametrize("key", ["effect_id", "effectId", "id"])
+def test_endpoint_spec_path_param_names(key):
+    url, params = parse_batch_line('{"endpoint": "get_main_ingredient_drug_effect_by_id", "params": {"%s": 3}}' % key, BASE)
+    assert (url, params) == (BASE + "/v1/druginfo/main-ingredient/drug-effect/3", {})
+
+
+def test_unknown_params_pass_through_and_missing_path_param_fails():
+    _url, params = parse_batch_line('{"endpoint": "list_product", "params": {"extra": false}}', BASE)
+    assert params == {"extra": "false"}
+    with pytest.raises(ValueError, match="code"):
+        parse_batch_line('{"endpoint": "get_product_by_code", "params": {}}', BASE)
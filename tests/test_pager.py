@@ -0,0 +1,73 @@
+from src.druginfo import pager as pager_module
+from src.druginfo.catalog import CATALOG_DATASETS, CatalogDataset
+from src.druginfo.pager import DEFAULT_PAGE_SIZE, AdaptivePager, _load_state, state_key, tuned_page_size
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+def _fake_dataset(monkeypatch, total: int, cap: int, seconds_per_record: float, report_total: bool = True) -> _Clock:
+    clock = _Clock()
+
+    def fetch(PageSize, Page, deadline=None, **params):
+        size = min(PageSize, cap)
+        start = (Page - 1) * size
+        clock.now += size * seconds_per_record
+        data = {"items": [{"id": i} for i in range(start, min(start + size, total))]}
+        if report_total:
+            data["totalCount"] = total
+        return data
+
+    fetch.__name__ = "list_product"
+    monkeypatch.setitem(CATALOG_DATASETS, "fake", CatalogDataset("fake", fetch, ("id",)))
+    monkeypatch.setattr(pager_module, "time", clock)
+    return clock
+
+
+def test_walk_with_clamped_ladder_keeps_offsets_aligned(monkeypatch, tmp_path):
+    # 업스트림 상한 1000, 1000건 페이지가 지연 상한(5초)을 넘는 경우: 2000 에서 800 으로 줄이면 어긋납니다.
+    _fake_dataset(monkeypatch, total=5000, cap=1000, seconds_per_record=0.01)
+    pager = AdaptivePager("fake", latency_ceiling=5.0, state_path=str(tmp_path / "pager.json"))
+    pager._index = pager.ladder.index(1600)
+
+    ids = [item["id"] for items in pager.walk() for item in items]
+
+    assert ids == list(range(5000))
+    assert 1000 in pager.ladder
+
+
+def test_walk_without_total_stops_on_short_page(monkeypatch, tmp_path):
+    _fake_dataset(monkeypatch, total=730, cap=1000, seconds_per_record=0.001, report_total=False)
+    pager = AdaptivePager("fake", state_path=str(tmp_path / "pager.json"))
+
+    ids = [item["id"] for items in pager.walk() for item in items]
+
+    assert ids == list(range(730))
+
+
+def test_short_result_does_not_save_clamped_size(monkeypatch, tmp_path):
+    state = str(tmp_path / "pager.json")
+    _fake_dataset(monkeypatch, total=7, cap=1000, seconds_per_record=0.001, report_total=False)
+    pager = AdaptivePager("fake", params={"vendor": "x"}, state_path=state)
+
+    assert sum(len(items) for items in pager.walk()) == 7
+    assert tuned_page_size("fake", state_path=state) == DEFAULT_PAGE_SIZE
+    assert tuned_page_size("fake", state_path=state, params={"vendor": "x"}) == DEFAULT_PAGE_SIZE
+
+
+def test_tuned_size_is_saved_per_params(monkeypatch, tmp_path):
+    state = str(tmp_path / "pager.json")
+    _fake_dataset(monkeypatch, total=5000, cap=5000, seconds_per_record=0.0001)
+    pager = AdaptivePager("fake", params={"vendor": "x"}, state_path=state)
+    list(pager.walk())
+
+    assert tuned_page_size("fake", state_path=state, params={"vendor": "x"}) == pager.best_page_size()
+    assert state_key("fake") not in _load_state(state)
@@ -0,0 +1,22 @@
+import pytest
+
+from src.druginfo import DrugInfoError
+from src.druginfo.export import iter_pages
+from src.druginfo.pages import extract_total
+
+
+def test_extract_total_prefers_explicit_total_keys():
+    assert extract_total({"items": [{}], "count": 1, "totalCount": "42"}) == 42
+    assert extract_total({"data": {"items": [], "total": 7}}) == 7
+
+
+def test_extract_total_ignores_page_length_count():
+    # count 가 현재 페이지의 건수이면 전체 건수로 보지 않습니다.
+    assert extract_total({"items": [{}, {}], "count": 2}) is None
+    assert extract_total({"items": [{}, {}], "count": 250}) == 250
+
+
+@pytest.mark.parametrize("key", ["Page", "PageSize", "page", "size"])
+def test_iter_pages_rejects_paging_params(key):
+    with pytest.raises(DrugInfoError, match=key):
+        next(iter_pages("product", params={key: 3}))
@@ -0,0 +1,97 @@
+import json
+
+from src.druginfo import query
+from src.druginfo.catalog import exact_key, get_dataset, record_key
+from src.druginfo.pack import open_pack, write_catalog_pack, write_pack
+from src.druginfo.query import QueryEngine
+
+
+RECORDS = [
+    {"productCode": "P7", "pillName": "alpha", "crop": True},
+    {"id": "P7", "pillName": "no key"},
+    {"ProductCode": "p7", "pillName": "other case"},
+    {"productCode": "P8", "pillName": "beta", "crop": False},
+    {"pillName": "keyless"},
+]
+
+
+def _pack(tmp_path, key, meta):
+    path = str(tmp_path / "product.pack")
+    write_pack(path, RECORDS, "product", key=key, meta=dict(meta, keyFields=["productCode"]))
+    return open_pack(path)
+
+
+def _codes(result):
+    return [(r.get("pillName"), result["totalCount"]) for r in result["items"]]
+
+
+def test_pack_key_lookup_matches_list_engine(tmp_path):
+    path = str(tmp_path / "product.pack")
+    write_catalog_pack(path, RECORDS, get_dataset("product"))
+    pack = open_pack(path)
+    expected = QueryEngine("product", RECORDS)
+    engine = QueryEngine("product", pack)
+
+    for code in ("P7", "p7", "P8", "missing"):
+        assert _codes(engine.query(ProductCode=code)) == _codes(expected.query(ProductCode=code))
+    assert engine.query(ProductCode="P7")["totalCount"] == 1
+    assert _codes(engine.query(ProductCode="P7", crop=True)) == [("alpha", 1)]
+
+
+def test_legacy_pack_key_index_is_not_trusted(tmp_path):
+    dataset = get_dataset("product")
+    pack = _pack(tmp_path, lambda r: record_key(dataset, r), {})
+    expected = QueryEngine("product", RECORDS)
+    engine = QueryEngine("product", pack)
+
+    assert _codes(engine.query(ProductCode="P7")) == _codes(expected.query(ProductCode="P7"))
+
+
+def test_exact_key_has_no_fallback():
+    dataset = get_dataset("product_edicode")
+    assert exact_key(dataset, {"productCode": "P1", "ediCode": "064400010"}) == "P1|064400010"
+    assert exact_key(dataset, {"productCode": "P1", "id": "X"}) is None
+    assert exact_key(dataset, {"ProductCode": "P1", "ediCode": "E"}) is None
+
+
+def _mirror_records(count):
+    records = []
+    for i in range(count):
+        record = {
+            "productCode": f"P{i % 37:03d}",
+            "pillName": f"pill {i}",
+            "vendor": ["acme", "globex", "initech"][i % 3],
+            "crop": i % 2 == 0,
+            "confirm": i % 5 == 0,
+            "count": i % 11,
+        }
+        if i % 13 == 0:
+            del record["productCode"]
+            record["id"] = f"P{i % 37:03d}"
+        records.append(record)
+    return records
+
+
+def test_mirror_pack_and_ndjson_engines_agree(tmp_path, monkeypatch):
+    records = _mirror_records(300)
+    ndjson_dir, pack_dir = tmp_path / "ndjson", tmp_path / "pack"
+    ndjson_dir.mkdir()
+    pack_dir.mkdir()
+    (ndjson_dir / "product.ndjson").write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+    write_catalog_pack(str(pack_dir / "product.pack"), records, get_dataset("product"))
+
+    engines = {}
+    for mirror in (ndjson_dir, pack_dir):
+        monkeypatch.setattr(query, "_ENGINES", {})
+        monkeypatch.setenv("EDB_MIRROR_DIR", str(mirror))
+        engines[mirror] = query.get_engine("product")
+
+    for params in (
+        {"ProductCode": "P005"},
+        {"ProductCode": "p005", "crop": True},
+        {"ProductCode": "P000", "SortBy": "-pillName"},
+        {"vendor": "glob", "confirmOff": True, "PageSize": 7, "Page": 3},
+        {"minCount": 5, "SortBy": "count desc", "PageSize": 50},
+        {"q": "pill 1", "crop": True},
+    ):
+        assert engines[pack_dir].query(**params) == engines[ndjson_dir].query(**params), params
@@ -0,0 +1,30 @@
+import os
+import stat
+
+from src.shared_store import SharedStore
+
+
+def _mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_store_files_are_private(tmp_path):
+    path = str(tmp_path / "cache" / "shared.sqlite3")
+    store = SharedStore(path)
+    store.set("auth:token:default", "jwt", 60)
+
+    assert _mode(os.path.dirname(path)) == 0o700
+    for name in (path, path + "-wal", path + "-shm"):
+        if os.path.exists(name):
+            assert _mode(name) == 0o600, name
+    assert store.get("auth:token:default") == "jwt"
+
+
+def test_existing_store_file_is_narrowed(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    SharedStore(path)
+    os.chmod(path, 0o644)
+
+    SharedStore(path)
+
+    assert _mode(path) == 0o600
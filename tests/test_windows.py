@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from src.mcp_tools import windows as windows_module
+from src.mcp_tools.windows import ResultWindowStore
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    monkeypatch.delenv("EDB_SHARED_STORE", raising=False)
+    clock = _Clock()
+    monkeypatch.setattr(windows_module, "time", clock)
+    return clock
+
+
+def _walk(store, first):
+    pages = [first]
+    while pages[-1]["window"]["cursor"] is not None:
+        pages.append(store.resume(pages[-1]["window"]["cursor"]))
+    return pages
+
+
+def test_small_response_is_returned_as_is(clock):
+    store = ResultWindowStore(max_records=10, max_bytes=10_000)
+    data = {"items": [{"id": i} for i in range(3)], "totalCount": 3}
+    assert store.cap(data) is data
+
+
+def test_record_cap_round_trips_to_last_window(clock):
+    store = ResultWindowStore(max_records=4, max_bytes=10_000)
+    data = {"data": {"items": [{"id": i} for i in range(10)]}, "totalCount": 10}
+
+    pages = _walk(store, store.cap(data))
+
+    assert [len(p["data"]["items"]) for p in pages] == [4, 4, 2]
+    assert [r["id"] for p in pages for r in p["data"]["items"]] == list(range(10))
+    assert [p["window"]["offset"] for p in pages] == [0, 4, 8]
+    assert all(p["totalCount"] == 10 and p["window"]["total"] == 10 for p in pages)
+    assert pages[-1]["window"]["cursor"] is None
+
+
+def test_byte_cap_returns_oversized_record_alone(clock):
+    small = {"id": "s", "text": "x" * 10}
+    huge = {"id": "h", "text": "x" * 500}
+    record_bytes = len(json.dumps(small).encode("utf-8")) + 1
+    store = ResultWindowStore(max_records=100, max_bytes=record_bytes * 2)
+    data = {"items": [small, small, small, huge, small]}
+
+    pages = _walk(store, store.cap(data))
+
+    assert [[r["id"] for r in p["items"]] for p in pages] == [["s", "s"], ["s"], ["h"], ["s"]]
+
+
+def test_non_dict_items_keep_their_shape(clock):
+    store = ResultWindowStore(max_records=2, max_bytes=10_000)
+    raw = [{"id": 1}, "text", 3, None, {"id": 2}]
+
+    pages = _walk(store, store.cap({"items": raw}))
+
+    assert [item for p in pages for item in p["items"]] == raw
+
+
+def test_list_response_is_wrapped_with_window(clock):
+    store = ResultWindowStore(max_records=2, max_bytes=10_000)
+    first = store.cap([{"id": i} for i in range(3)])
+    assert first["items"] == [{"id": 0}, {"id": 1}]
+    assert store.resume(first["window"]["cursor"])["items"] == [{"id": 2}]
+
+
+def test_expired_cursor(clock):
+    store = ResultWindowStore(max_records=1, max_bytes=10_000, ttl=30)
+    cursor = store.cap({"items": [{"id": 1}, {"id": 2}]})["window"]["cursor"]
+
+    clock.now += 31
+    with pytest.raises(RuntimeError, match="만료"):
+        store.resume(cursor)
+
+
+@pytest.mark.parametrize("cursor", ["%%%", "bm8tY29sb24", ResultWindowStore._encode("w", 1).upper()])
+def test_malformed_cursor(clock, cursor):
+    store = ResultWindowStore(max_records=1, max_bytes=10_000)
+    with pytest.raises(RuntimeError):
+        store.resume(cursor)
+
+
+def test_cursor_offset_out_of_range(clock):
+    store = ResultWindowStore(max_records=1, max_bytes=10_000)
+    cursor = store.cap({"items": [{"id": 1}, {"id": 2}]})["window"]["cursor"]
+    window_id, _ = ResultWindowStore._decode(cursor)
+    with pytest.raises(RuntimeError, match="잘못된"):
+        store.resume(ResultWindowStore._encode(window_id, 99))